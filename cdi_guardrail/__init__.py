@@ -1,9 +1,56 @@
 # cdi_guardrail/__init__.py
 
-from .wrapper import CDIGuard
-from .policy import CDIPolicy
-from .calibrator import CDICalibrator
-from .monitor import CDIMonitor
-from .drift import ks_drift, population_stability_index
-from .cdi_logging import CDILogger
-from .prometheus_adapter import PrometheusCDILogger
+# Public names are resolved lazily (PEP 562) so that consumers of the
+# NumPy-only parts (monitor, drift, statistics, policy) do not pay for
+# importing torch, scipy or prometheus_client.
+
+import importlib
+
+_LAZY_ATTRS = {
+    "CDIGuard": ".wrapper",
+    "CDIPolicy": ".policy",
+    "TieredCDIScorer": ".scheduler",
+    "CachedCDIGuard": ".result_cache",
+    "sequence_cdi": ".sequence",
+    "CDICalibrator": ".calibrator",
+    "simulate_policies": ".simulator",
+    "select_thresholds": ".simulator",
+    "CDIMonitor": ".monitor",
+    "SegmentedCDIMonitor": ".monitor",
+    "TimeWindowCDIMonitor": ".monitor",
+    "SharedCDIMonitor": ".shared_monitor",
+    "CUSUM": ".changepoint",
+    "PageHinkley": ".changepoint",
+    "CDISketch": ".sketch",
+    "ks_drift": ".drift",
+    "ks_drift_batch": ".drift",
+    "population_stability_index": ".drift",
+    "population_stability_index_batch": ".drift",
+    "ReferenceProfile": ".reference",
+    "ReferenceStats": ".statistics",
+    "RunningStats": ".statistics",
+    "PoissonBootstrap": ".statistics",
+    "CDILogger": ".cdi_logging",
+    "PrometheusCDILogger": ".prometheus_adapter",
+    "AuditRunner": ".audit",
+    "NoiseBank": ".noise_bank",
+    "save_snapshot": ".snapshot",
+    "load_snapshot": ".snapshot",
+    "SnapshotWriter": ".snapshot",
+}
+
+__all__ = list(_LAZY_ATTRS)
+
+
+def __getattr__(name):
+    module = _LAZY_ATTRS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
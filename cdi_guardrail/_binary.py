@@ -0,0 +1,90 @@
+# cdi_guardrail/_binary.py
+
+import json
+import os
+import struct
+
+import numpy as np
+
+
+MAGIC = b"CDIBIN01"
+ALIGN = 64
+
+
+def _aligned(n: int) -> int:
+    return (n + ALIGN - 1) // ALIGN * ALIGN
+
+
+def write_arrays(path: str, meta: dict, arrays: dict):
+    """
+    Write a JSON ``meta`` dict and named NumPy arrays to one file.
+
+    Layout: magic, uint64 header length, JSON header, then each
+    array's raw bytes at a 64-byte aligned offset so it can be
+    memory-mapped in place. The file is written to a temporary
+    path and atomically renamed.
+    """
+    arrays = {k: np.ascontiguousarray(v) for k, v in arrays.items()}
+
+    index = {}
+    offset = 0
+    for name, arr in arrays.items():
+        index[name] = {
+            "dtype": arr.dtype.str,
+            "shape": list(arr.shape),
+            "offset": offset,
+        }
+        offset = _aligned(offset + arr.nbytes)
+
+    header = json.dumps({"meta": meta, "arrays": index}).encode("utf-8")
+    data_start = _aligned(len(MAGIC) + 8 + len(header))
+
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<Q", len(header)))
+        f.write(header)
+        for name, arr in arrays.items():
+            f.seek(data_start + index[name]["offset"])
+            f.write(arr.tobytes())
+        f.truncate(data_start + offset)
+
+    os.replace(tmp, path)
+
+
+def read_arrays(path: str, mmap: bool = True):
+    """
+    Read a file written by write_arrays.
+
+    Returns
+    -------
+    (dict, dict[str, np.ndarray])
+        ``meta`` and the arrays; with ``mmap=True`` arrays are
+        read-only memory maps of the file.
+    """
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"Not a CDI binary file: {path}")
+        (header_len,) = struct.unpack("<Q", f.read(8))
+        header = json.loads(f.read(header_len).decode("utf-8"))
+
+    data_start = _aligned(len(MAGIC) + 8 + header_len)
+
+    arrays = {}
+    for name, spec in header["arrays"].items():
+        dtype = np.dtype(spec["dtype"])
+        shape = tuple(spec["shape"])
+        offset = data_start + spec["offset"]
+
+        if int(np.prod(shape)) == 0:
+            arrays[name] = np.empty(shape, dtype=dtype)
+        elif mmap:
+            arrays[name] = np.memmap(
+                path, dtype=dtype, mode="r", offset=offset, shape=shape
+            )
+        else:
+            arrays[name] = np.fromfile(
+                path, dtype=dtype, count=int(np.prod(shape)), offset=offset
+            ).reshape(shape)
+
+    return header["meta"], arrays
@@ -0,0 +1,367 @@
+# cdi_guardrail/audit.py
+
+import json
+import multiprocessing
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+import torch
+
+from .noise_bank import NoiseBank
+from .wrapper import CDIGuard
+
+
+# Per-process state, populated by _init_worker
+_WORKER = {}
+
+
+def _init_worker(
+    model_factory,
+    dataset_factory,
+    torch_threads,
+    guard_kwargs,
+    noise_bank_kwargs=None,
+):
+    if torch_threads is not None:
+        torch.set_num_threads(torch_threads)
+
+    model = model_factory()
+    # workers without a factory receive their samples with each shard
+    _WORKER["dataset"] = dataset_factory() if dataset_factory else None
+    _WORKER["guard"] = CDIGuard(model, **(guard_kwargs or {}))
+    _WORKER["noise_bank"] = (
+        NoiseBank(**noise_bank_kwargs) if noise_bank_kwargs else None
+    )
+
+
+def _shard_path(output_dir, shard_id):
+    return os.path.join(output_dir, f"shard_{shard_id:06d}.npz")
+
+
+def _audit_shard(
+    shard_id,
+    start,
+    stop,
+    samples,
+    output_dir,
+    components,
+    detailed_kwargs,
+):
+    if samples is None:
+        dataset = _WORKER["dataset"]
+        samples = (dataset[i] for i in range(start, stop))
+    guard = _WORKER["guard"]
+    noise_bank = _WORKER["noise_bank"]
+
+    n = stop - start
+    indices = np.arange(start, stop, dtype=np.int64)
+    labels = np.empty(n, dtype=np.int64)
+    predictions = np.empty(n, dtype=np.int64)
+    scalars = np.empty(n, dtype=np.float64)
+    vectors = {c: np.full(n, np.nan) for c in components}
+
+    for j, (x, y) in enumerate(samples):
+        x = torch.as_tensor(x).unsqueeze(0)
+        y = torch.as_tensor(y).reshape(1)
+
+        out = guard.forward_detailed(
+            x,
+            y,
+            components=components,
+            noise_bank=noise_bank,
+            **detailed_kwargs,
+        )
+
+        labels[j] = int(y.item())
+        predictions[j] = int(out["prediction"].item())
+        scalars[j] = float(out["boundary_scalar"])
+        for name, value in out["boundary_vector"].items():
+            vectors[name][j] = float(value)
+
+    # Write-then-rename: a shard file either exists complete or not at all
+    path = _shard_path(output_dir, shard_id)
+    tmp = path + ".tmp.npz"
+    np.savez(
+        tmp,
+        index=indices,
+        label=labels,
+        prediction=predictions,
+        boundary_scalar=scalars,
+        **{f"boundary_{k}": v for k, v in vectors.items()},
+    )
+    os.replace(tmp, path)
+
+    return shard_id, n
+
+
+def _describe(values):
+    values = values[~np.isnan(values)]
+    if values.size == 0:
+        return {"count": 0}
+
+    return {
+        "count": int(values.size),
+        "mean": float(values.mean()),
+        "std": float(values.std()),
+        "p50": float(np.percentile(values, 50)),
+        "p95": float(np.percentile(values, 95)),
+        "p99": float(np.percentile(values, 99)),
+    }
+
+
+class AuditRunner:
+    """
+    Offline Level-2 audit driver over a whole dataset.
+
+    The dataset is split into fixed-size shards that are processed
+    by a process pool. Each worker builds its own model through
+    ``model_factory`` and runs ``CDIGuard.forward_detailed`` per
+    sample (batch size 1), streaming one ``.npz`` file per shard
+    into ``output_dir``. Completed shards are skipped on re-run,
+    so an interrupted audit resumes where it stopped.
+
+    Parameters
+    ----------
+    model_factory : callable
+        Picklable zero-argument callable returning the model.
+    dataset : Sequence | callable
+        Indexable dataset yielding ``(x, y)`` per sample, or a
+        picklable zero-argument callable returning one (e.g. opening
+        a memory-mapped file). A factory is opened by each worker
+        itself; a Sequence stays in the calling process, and each
+        shard task carries only that shard's samples.
+    output_dir : str
+        Directory for shard files, manifest and report.
+    num_workers : int
+        Worker processes (0 = run in the calling process).
+    torch_threads : int
+        Intra-op thread count per worker.
+    shard_size : int
+        Samples per shard (checkpoint granularity).
+    components : list[str] | None
+        Boundary components to compute (default: calibration, stability).
+    guard_kwargs : dict | None
+        Extra CDIGuard constructor arguments.
+    detailed_kwargs : dict | None
+        Extra forward_detailed arguments.
+    noise_seed : int | None
+        If set, every worker perturbs with a NoiseBank seeded with it,
+        making the audit bit-reproducible; the seed is recorded in the
+        manifest and report.
+    """
+
+    def __init__(
+        self,
+        model_factory,
+        dataset,
+        output_dir: str,
+        *,
+        num_workers: int = 1,
+        torch_threads: int = 1,
+        shard_size: int = 1024,
+        components: list[str] | None = None,
+        guard_kwargs: dict | None = None,
+        detailed_kwargs: dict | None = None,
+        mp_context: str = "spawn",
+        noise_seed: int | None = None,
+    ):
+        assert num_workers >= 0
+        assert shard_size >= 1
+
+        self.model_factory = model_factory
+        self.dataset = dataset
+        self.output_dir = output_dir
+        self.num_workers = num_workers
+        self.torch_threads = torch_threads
+        self.shard_size = shard_size
+        self.components = list(components or ("calibration", "stability"))
+        self.guard_kwargs = guard_kwargs or {}
+        self.detailed_kwargs = detailed_kwargs or {}
+        self.mp_context = mp_context
+        self.noise_seed = noise_seed
+        self._opened = None
+
+    def _data(self):
+        """
+        The dataset, opened once in this process if given as a factory.
+        """
+        if self._opened is None:
+            self._opened = self.dataset() if callable(self.dataset) else self.dataset
+        return self._opened
+
+    def _noise_bank_kwargs(self):
+        if self.noise_seed is None:
+            return None
+
+        return {
+            "n_samples": self.detailed_kwargs.get("stability_samples", 1),
+            "seed": self.noise_seed,
+        }
+
+    # -------- layout --------
+
+    def _manifest(self):
+        return {
+            "n_samples": len(self._data()),
+            "shard_size": self.shard_size,
+            "components": self.components,
+            "noise_seed": self.noise_seed,
+            "detailed_kwargs": {
+                k: v for k, v in self.detailed_kwargs.items()
+                if isinstance(v, (int, float, str, bool, type(None)))
+            },
+        }
+
+    def _check_manifest(self):
+        path = os.path.join(self.output_dir, "audit_manifest.json")
+        manifest = self._manifest()
+
+        if os.path.exists(path):
+            with open(path) as f:
+                existing = json.load(f)
+            if existing != manifest:
+                raise ValueError(
+                    "output_dir contains an audit with a different "
+                    "configuration; use a fresh directory"
+                )
+        else:
+            with open(path, "w") as f:
+                json.dump(manifest, f, indent=2)
+
+    def shards(self):
+        n = len(self._data())
+        return [
+            (shard_id, start, min(start + self.shard_size, n))
+            for shard_id, start in enumerate(range(0, n, self.shard_size))
+        ]
+
+    def pending_shards(self):
+        return [
+            s for s in self.shards()
+            if not os.path.exists(_shard_path(self.output_dir, s[0]))
+        ]
+
+    # -------- execution --------
+
+    def run(self):
+        """
+        Process all pending shards, then write and return the report.
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+        self._check_manifest()
+
+        pending = self.pending_shards()
+        factory = self.dataset if callable(self.dataset) else None
+        init_args = (
+            self.model_factory,
+            factory,
+            self.torch_threads,
+            self.guard_kwargs,
+            self._noise_bank_kwargs(),
+        )
+        task_args = (self.output_dir, self.components, self.detailed_kwargs)
+
+        if self.num_workers == 0:
+            _init_worker(
+                self.model_factory,
+                None,
+                None,
+                self.guard_kwargs,
+                self._noise_bank_kwargs(),
+            )
+            _WORKER["dataset"] = self._data()
+            for shard_id, start, stop in pending:
+                _audit_shard(shard_id, start, stop, None, *task_args)
+        elif pending:
+            data = self._data()
+
+            def submit(pool, shard_id, start, stop):
+                samples = None
+                if factory is None:
+                    samples = [data[i] for i in range(start, stop)]
+                return pool.submit(
+                    _audit_shard, shard_id, start, stop, samples, *task_args
+                )
+
+            with ProcessPoolExecutor(
+                max_workers=self.num_workers,
+                mp_context=multiprocessing.get_context(self.mp_context),
+                initializer=_init_worker,
+                initargs=init_args,
+            ) as pool:
+                # bounded in-flight shards: only those are materialized here
+                in_flight = set()
+                for shard in pending:
+                    if len(in_flight) >= 2 * self.num_workers:
+                        done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                        for f in done:
+                            f.result()
+                    in_flight.add(submit(pool, *shard))
+                for f in in_flight:
+                    f.result()
+
+        report = self.report()
+
+        with open(os.path.join(self.output_dir, "report.json"), "w") as f:
+            json.dump(report, f, indent=2)
+
+        return report
+
+    # -------- results --------
+
+    def load_results(self):
+        """
+        Concatenate all completed shards.
+
+        Returns
+        -------
+        dict[str, np.ndarray]
+        """
+        parts = []
+        for shard_id, _, _ in self.shards():
+            path = _shard_path(self.output_dir, shard_id)
+            if os.path.exists(path):
+                with np.load(path) as data:
+                    parts.append({k: data[k] for k in data.files})
+
+        if not parts:
+            return {}
+
+        return {
+            k: np.concatenate([p[k] for p in parts])
+            for k in parts[0]
+        }
+
+    def report(self):
+        """
+        Aggregate completed shards into an audit report.
+        """
+        results = self.load_results()
+        n_total = len(self._data())
+
+        if not results:
+            return {
+                "n_samples": n_total,
+                "n_audited": 0,
+                "noise_seed": self.noise_seed,
+            }
+
+        predictions, counts = np.unique(results["prediction"], return_counts=True)
+
+        return {
+            "n_samples": n_total,
+            "n_audited": int(results["index"].size),
+            "noise_seed": self.noise_seed,
+            "accuracy": float(
+                (results["prediction"] == results["label"]).mean()
+            ),
+            "prediction_counts": {
+                str(p): int(c) for p, c in zip(predictions, counts)
+            },
+            "boundary_scalar": _describe(results["boundary_scalar"]),
+            "boundary_vector": {
+                c: _describe(results[f"boundary_{c}"])
+                for c in self.components
+            },
+        }
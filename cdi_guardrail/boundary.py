@@ -1,20 +1,41 @@
 # cdi_guardrail/boundary.py
 
 import torch
-import torch.nn.functional as F
+
+def max_probability(logits):
+    """
+    Max softmax probability and its class, without the full softmax.
+
+    conf = exp(max_logit - logsumexp(logits)), in float32.
+
+    Returns
+    -------
+    (torch.Tensor [B], torch.Tensor [B])
+    """
+    logits = logits.float()
+    top, pred = logits.max(dim=1)
+    return torch.exp(top - torch.logsumexp(logits, dim=1)), pred
+
 
 def expected_calibration_error(
     logits,
     labels,
-    n_bins: int = 10
+    n_bins: int = 10,
+    probs=None,
 ):
     """
     Expected Calibration Error (ECE)
 
     Works per-batch; for per-sample CDI, batch size = 1.
+    Confidences are computed in float32 regardless of logit dtype.
+    Precomputed softmax ``probs`` may be passed to avoid recomputing them;
+    otherwise only the max-probability is formed (see max_probability),
+    never the full [B, C] softmax.
     """
-    probs = F.softmax(logits, dim=1)
-    conf, pred = probs.max(dim=1)
+    if probs is None:
+        conf, pred = max_probability(logits)
+    else:
+        conf, pred = probs.max(dim=1)
     correct = (pred == labels).float()
 
     bins = torch.linspace(0, 1, n_bins + 1, device=logits.device)
@@ -10,6 +10,8 @@ def prediction_stability_gap(
     eps: float = 1e-3,
     noise: str = "gaussian",
     n_samples: int = 1,
+    probs=None,
+    noise_bank=None,
 ):
     """
     Prediction Stability Gap (PSG)
@@ -32,6 +34,13 @@ def prediction_stability_gap(
         Perturbation type.
     n_samples : int
         Number of perturbation samples (>=1).
+    probs : torch.Tensor | None
+        Output probabilities for the clean ``x``. When given,
+        the clean forward pass is skipped.
+    noise_bank : NoiseBank | None
+        Seeded, reusable perturbations. When given, its noise type
+        replaces ``noise`` and the same directions are broadcast over
+        the batch, making the result reproducible.
 
     Returns
     -------
@@ -43,15 +52,23 @@ def prediction_stability_gap(
 
     model.eval()
 
+    bank = None
+    if noise_bank is not None:
+        assert noise_bank.n_samples >= n_samples
+        bank = noise_bank.get(x.shape[1:], dtype=x.dtype, device=x.device)
+
     with torch.no_grad():
         # Original prediction
-        logits = model(x)
-        p = F.softmax(logits, dim=-1)
+        if probs is None:
+            probs = F.softmax(model(x).float(), dim=-1)
+        p = probs
 
         gap = torch.zeros((), device=x.device)
 
-        for _ in range(n_samples):
-            if noise == "gaussian":
+        for i in range(n_samples):
+            if bank is not None:
+                delta = eps * bank[i]
+            elif noise == "gaussian":
                 delta = eps * torch.randn_like(x)
             elif noise == "uniform":
                 delta = eps * (2.0 * torch.rand_like(x) - 1.0)
@@ -61,7 +78,7 @@ def prediction_stability_gap(
             x_perturbed = x + delta
 
             logits_eps = model(x_perturbed)
-            p_eps = F.softmax(logits_eps, dim=-1)
+            p_eps = F.softmax(logits_eps.float(), dim=-1)
 
             # L2 distance per sample, mean over batch
             gap += torch.norm(p - p_eps, p=2, dim=1).mean()
@@ -69,3 +86,160 @@ def prediction_stability_gap(
         gap = gap / float(n_samples)
 
     return gap
+
+
+def _directions(x, noise, n_samples, noise_bank):
+    """
+    Perturbation directions [n_samples, *x.shape] at unit scale.
+    """
+    if noise_bank is not None:
+        assert noise_bank.n_samples >= n_samples
+        bank = noise_bank.get(x.shape[1:], dtype=x.dtype, device=x.device)
+        return bank[:n_samples, None].expand(n_samples, *x.shape)
+
+    size = (n_samples, *x.shape)
+    if noise == "gaussian":
+        return torch.randn(size, dtype=x.dtype, device=x.device)
+    elif noise == "uniform":
+        return 2.0 * torch.rand(size, dtype=x.dtype, device=x.device) - 1.0
+    else:
+        raise ValueError(f"Unknown noise type: {noise}")
+
+
+def linearized_stability_gap(
+    model,
+    x: torch.Tensor,
+    eps: float = 1e-3,
+    noise: str = "gaussian",
+    n_samples: int = 1,
+    noise_bank=None,
+):
+    """
+    First-order Prediction Stability Gap.
+
+    Replaces each perturbed forward of prediction_stability_gap by
+    the softmax Jacobian-vector product along the same direction:
+
+        ||p(x + eps * v) - p(x)||  ~=  eps * ||J_p(x) v||
+
+    All ``n_samples`` directions are evaluated in one batched
+    forward-mode pass (``torch.func.jvp``), so the estimate is
+    deterministic in the directions and free of finite-difference
+    cancellation. It agrees with the sampling estimate as eps -> 0.
+
+    Parameters
+    ----------
+    As in prediction_stability_gap.
+
+    Returns
+    -------
+    torch.Tensor (scalar)
+        eps times the mean L2 norm of J_p v over directions and batch.
+    """
+    assert n_samples >= 1
+
+    try:
+        from torch.func import jvp
+    except ImportError as e:
+        raise ImportError(
+            "linearized_stability_gap requires torch>=2.0 (torch.func)"
+        ) from e
+
+    model.eval()
+
+    v = _directions(x, noise, n_samples, noise_bank)
+    x_rep = x.unsqueeze(0).expand_as(v).reshape(-1, *x.shape[1:])
+    v = v.reshape_as(x_rep)
+
+    def probs_fn(inp):
+        return F.softmax(model(inp).float(), dim=-1)
+
+    with torch.no_grad():
+        _, jv = jvp(probs_fn, (x_rep,), (v,))
+
+    return eps * torch.linalg.vector_norm(jv, dim=1).mean()
+
+
+def worst_case_stability_gap(
+    model,
+    x: torch.Tensor,
+    eps: float = 1e-3,
+    steps: int = 3,
+    step_size: float | None = None,
+    probs=None,
+    noise_bank=None,
+):
+    """
+    Gradient-guided (PGD) Prediction Stability Gap.
+
+    Searches the L-infinity ball of radius ``eps`` for the
+    perturbation that moves the output distribution the most,
+    instead of averaging over random directions. Starting from a
+    random point in the ball (the gap's gradient vanishes at the
+    clean input), each step ascends the per-sample L2 gap along the
+    sign of its input gradient and projects back onto the ball.
+    ``steps=1`` is FGSM from a random start.
+
+    Cost is fixed: ``steps`` forward+backward passes plus one forward,
+    all batched over the audit batch. Each sample keeps the largest
+    gap found along its path, so the result is a lower bound on the
+    worst case within the ball, and at least as large as the gap
+    at the random start.
+
+    Parameters
+    ----------
+    model : torch.nn.Module
+        Model in eval mode.
+    x : torch.Tensor
+        Input batch [B, ...]
+    eps : float
+        Radius of the L-infinity ball.
+    steps : int
+        Gradient ascent steps (>= 1).
+    step_size : float | None
+        Per-step L-infinity move (default: 2.5 * eps / steps).
+    probs : torch.Tensor | None
+        Output probabilities for the clean ``x``.
+    noise_bank : NoiseBank | None
+        Seeded random start (its first direction, clipped to the
+        ball), making the result reproducible.
+
+    Returns
+    -------
+    torch.Tensor (scalar)
+        Mean over the batch of the largest L2 distance found between
+        original and perturbed output probability vectors.
+    """
+    assert steps >= 1
+    step_size = 2.5 * eps / steps if step_size is None else step_size
+
+    model.eval()
+
+    with torch.no_grad():
+        if probs is None:
+            probs = F.softmax(model(x).float(), dim=-1)
+
+        start = _directions(x, "uniform", 1, noise_bank)[0].clamp(-1.0, 1.0)
+        delta = eps * start
+
+    best = torch.zeros(x.shape[0], device=x.device)
+
+    with torch.enable_grad():
+        for _ in range(steps):
+            delta.requires_grad_(True)
+            p_eps = F.softmax(model(x + delta).float(), dim=-1)
+            gap = torch.norm(probs - p_eps, p=2, dim=1)
+
+            # samples are independent, so the gradient of the sum
+            # is each sample's own gradient
+            grad = torch.autograd.grad(gap.sum(), delta)[0]
+
+            with torch.no_grad():
+                best = torch.maximum(best, gap.detach())
+                delta = (delta + step_size * grad.sign()).clamp(-eps, eps)
+
+    with torch.no_grad():
+        p_eps = F.softmax(model(x + delta).float(), dim=-1)
+        best = torch.maximum(best, torch.norm(probs - p_eps, p=2, dim=1))
+
+    return best.mean()
@@ -1,9 +1,191 @@
 # cdi_guardrail/boundary_vector.py
 
 import torch
+import torch.nn.functional as F
 
 from .boundary import expected_calibration_error
-from .boundary_stability import prediction_stability_gap
+from .boundary_stability import (
+    linearized_stability_gap,
+    prediction_stability_gap,
+    worst_case_stability_gap,
+)
+
+
+class BoundaryContext:
+    """
+    Inputs shared by all boundary components of one evaluation.
+
+    Intermediate tensors (e.g. clean softmax probabilities) are
+    computed on first use and reused by every component that
+    asks for them.
+    """
+
+    def __init__(self, *, model, x, logits, labels, **options):
+        self.model = model
+        self.x = x
+        self.logits = logits
+        self.labels = labels
+        self.options = options
+        self._cache = {}
+
+    def shared(self, key: str, fn):
+        """
+        Return the cached intermediate ``key``, computing it with ``fn()``
+        on first access.
+        """
+        if key not in self._cache:
+            self._cache[key] = fn()
+        return self._cache[key]
+
+    def cached(self, key: str):
+        """
+        The intermediate ``key`` if some component already computed it.
+        """
+        return self._cache.get(key)
+
+    def probs(self):
+        return self.shared(
+            "probs",
+            lambda: F.softmax(self.logits.detach().float(), dim=-1),
+        )
+
+
+class BoundaryComponent:
+    """
+    A registered boundary violation signal.
+
+    Parameters
+    ----------
+    name : str
+        Key under which the component appears in the boundary vector.
+    fn : callable
+        ``fn(ctx: BoundaryContext) -> torch.Tensor`` (non-negative scalar).
+    cost : float
+        Estimated cost in forward-pass units. Cheaper components
+        are evaluated first.
+    requires_forward : bool
+        True if the component runs extra model forwards,
+        False if it only needs logits and labels.
+    """
+
+    def __init__(self, name, fn, *, cost: float, requires_forward: bool):
+        self.name = name
+        self.fn = fn
+        self.cost = float(cost)
+        self.requires_forward = requires_forward
+
+    def __call__(self, ctx: BoundaryContext):
+        return self.fn(ctx)
+
+
+BOUNDARY_COMPONENTS: dict[str, BoundaryComponent] = {}
+
+DEFAULT_COMPONENTS = ("calibration", "stability")
+
+
+def register_boundary_component(
+    name: str,
+    fn,
+    *,
+    cost: float,
+    requires_forward: bool = False,
+    overwrite: bool = False,
+):
+    """
+    Register a boundary component for compute_boundary_vector.
+    """
+    if name in BOUNDARY_COMPONENTS and not overwrite:
+        raise ValueError(f"Boundary component already registered: {name}")
+
+    component = BoundaryComponent(
+        name,
+        fn,
+        cost=cost,
+        requires_forward=requires_forward,
+    )
+    BOUNDARY_COMPONENTS[name] = component
+    return component
+
+
+def _calibration(ctx):
+    return expected_calibration_error(
+        ctx.logits.detach(),
+        ctx.labels.detach(),
+        probs=ctx.cached("probs"),
+    )
+
+
+def _stability(ctx):
+    return prediction_stability_gap(
+        model=ctx.model,
+        x=ctx.x,
+        eps=ctx.options.get("stability_eps", 1e-3),
+        n_samples=ctx.options.get("stability_samples", 1),
+        probs=ctx.probs(),
+        noise_bank=ctx.options.get("noise_bank"),
+    )
+
+
+def _stability_jvp(ctx):
+    return linearized_stability_gap(
+        model=ctx.model,
+        x=ctx.x,
+        eps=ctx.options.get("stability_eps", 1e-3),
+        n_samples=ctx.options.get("stability_samples", 1),
+        noise_bank=ctx.options.get("noise_bank"),
+    )
+
+
+def _stability_pgd(ctx):
+    return worst_case_stability_gap(
+        model=ctx.model,
+        x=ctx.x,
+        eps=ctx.options.get("stability_eps", 1e-3),
+        steps=ctx.options.get("pgd_steps", 3),
+        step_size=ctx.options.get("pgd_step_size"),
+        probs=ctx.probs(),
+        noise_bank=ctx.options.get("noise_bank"),
+    )
+
+
+register_boundary_component("calibration", _calibration, cost=0.0)
+register_boundary_component(
+    "stability",
+    _stability,
+    cost=1.0,
+    requires_forward=True,
+)
+# one fused forward + JVP (~1.5 forwards) for all directions
+register_boundary_component(
+    "stability_jvp",
+    _stability_jvp,
+    cost=1.5,
+    requires_forward=True,
+)
+# ~3 forward-equivalents per step at the default 3 steps, plus one forward
+register_boundary_component(
+    "stability_pgd",
+    _stability_pgd,
+    cost=10.0,
+    requires_forward=True,
+)
+
+
+def _resolve_components(components):
+    names = DEFAULT_COMPONENTS if components is None else tuple(components)
+
+    unknown = [n for n in names if n not in BOUNDARY_COMPONENTS]
+    if unknown:
+        raise ValueError(
+            f"Unknown boundary components: {unknown}; "
+            f"available: {sorted(BOUNDARY_COMPONENTS)}"
+        )
+
+    # Stable sort: requested order breaks cost ties
+    return sorted(
+        (BOUNDARY_COMPONENTS[n] for n in dict.fromkeys(names)),
+        key=lambda c: c.cost,
+    )
 
 
 def compute_boundary_vector(
@@ -14,6 +196,10 @@ def compute_boundary_vector(
     labels: torch.Tensor,
     stability_eps: float = 1e-3,
     stability_samples: int = 1,
+    components: list[str] | None = None,
+    threshold: float | None = None,
+    reduction: str = "l2",
+    **options,
 ):
     """
     Compute vector-valued boundary violations.
@@ -25,35 +211,50 @@ def compute_boundary_vector(
     ----------
     - calibration : Expected Calibration Error (ECE)
     - stability   : Prediction Stability Gap (PSG)
+    - stability_jvp : linearized PSG via forward-mode JVPs (opt-in)
+    - stability_pgd : gradient-guided worst-case PSG (opt-in)
+
+    Further components can be added with register_boundary_component.
+
+    Components are evaluated cheapest first. If ``threshold`` is given,
+    evaluation stops as soon as the reduced scalar of the components
+    computed so far reaches it; since components are non-negative,
+    the remaining ones could only increase it.
 
     Returns
     -------
     dict[str, torch.Tensor]
-        Keys: {"calibration", "stability"}
+        Keys: the computed subset of ``components``
+        (default {"calibration", "stability"})
         Values: non-negative scalar tensors
     """
-    boundaries = {}
-
-    # Calibration boundary
-    boundaries["calibration"] = expected_calibration_error(
-        logits.detach(),
-        labels.detach()
-    )
-
-    # Stability boundary
-    boundaries["stability"] = prediction_stability_gap(
+    ctx = BoundaryContext(
         model=model,
         x=x,
-        eps=stability_eps,
-        n_samples=stability_samples,
+        logits=logits,
+        labels=labels,
+        stability_eps=stability_eps,
+        stability_samples=stability_samples,
+        **options,
     )
 
+    boundaries = {}
+
+    for component in _resolve_components(components):
+        boundaries[component.name] = component(ctx)
+
+        if threshold is not None:
+            partial = reduce_boundary_vector(boundaries, reduction=reduction)
+            if partial.item() >= threshold:
+                break
+
     return boundaries
 
 
 def reduce_boundary_vector(
     boundary_dict: dict,
     reduction: str = "l2",
+    components: list[str] | None = None,
 ):
     """
     Reduce a boundary vector into a single scalar.
@@ -64,12 +265,20 @@ def reduce_boundary_vector(
         Output of compute_boundary_vector
     reduction : {"l2", "l1", "max"}
         Reduction method
+    components : list[str] | None
+        Subset of keys to reduce over (default: all keys)
 
     Returns
     -------
     torch.Tensor (scalar)
     """
-    values = torch.stack(list(boundary_dict.values()))
+    if components is not None:
+        boundary_dict = {k: boundary_dict[k] for k in components}
+
+    if not boundary_dict:
+        raise ValueError("Cannot reduce an empty boundary vector")
+
+    values = torch.stack([v.float() for v in boundary_dict.values()])
 
     if reduction == "l2":
         return torch.norm(values, p=2)
@@ -1,6 +1,5 @@
 # cdi_guardrail/calibrator.py
 
-import torch
 import numpy as np
 
 
@@ -47,3 +46,15 @@ class CDICalibrator:
             "warn_percentile": self.warn_percentile,
             "reject_percentile": self.reject_percentile,
         }
+
+    # -------- snapshot --------
+
+    def to_state(self):
+        return self.summary(), {}
+
+    @classmethod
+    def from_state(cls, meta, arrays):
+        calibrator = cls(meta["warn_percentile"], meta["reject_percentile"])
+        calibrator.warn_threshold = meta["warn_threshold"]
+        calibrator.reject_threshold = meta["reject_threshold"]
+        return calibrator
@@ -50,6 +50,19 @@ class CDILogger:
         }
         self.emit(record)
 
+    def log_segment_summary(self, summaries: dict):
+        """
+        Log per-segment CDI distribution stats
+        (output of SegmentedCDIMonitor.summary()).
+        """
+        record = {
+            "service": self.service_name,
+            "event": "cdi_segment_summary",
+            "timestamp": time.time(),
+            "segments": {str(k): v for k, v in summaries.items()},
+        }
+        self.emit(record)
+
     def log_drift(self, ks_result: dict, psi_value: float):
         """
         Log drift detection result.
@@ -65,6 +78,31 @@ class CDILogger:
         }
         self.emit(record)
 
+    def log_change_point(self, event: dict):
+        """
+        Log a sequential drift detection (PageHinkley / CUSUM event).
+        """
+        record = {
+            "service": self.service_name,
+            "event": "cdi_change_point",
+            "timestamp": time.time(),
+            **event,
+        }
+        self.emit(record)
+
+    def log_layer_pressure(self, layer_pressure: dict):
+        """
+        Log per-layer activation pressure
+        (CDIGuard.last_layer_pressure).
+        """
+        record = {
+            "service": self.service_name,
+            "event": "cdi_layer_pressure",
+            "timestamp": time.time(),
+            "layers": {str(k): float(v) for k, v in layer_pressure.items()},
+        }
+        self.emit(record)
+
     def emit(self, record: dict):
         """
         Default emitter: stdout.
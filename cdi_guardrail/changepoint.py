@@ -0,0 +1,217 @@
+# cdi_guardrail/changepoint.py
+
+import math
+
+
+class PageHinkley:
+    """
+    Page-Hinkley test for a shift in the mean of the CDI stream.
+
+    O(1) time and memory per update. Signals when the cumulative
+    deviation from the running mean (minus the tolerance ``delta``)
+    rises more than ``threshold`` above its historical minimum;
+    ``update`` then returns True and fills ``last_event``.
+
+    Parameters
+    ----------
+    delta : float
+        Magnitude of change tolerated without alarm.
+    threshold : float
+        Detection threshold (lambda).
+    min_samples : int
+        Updates before alarms are allowed.
+    direction : {"up", "down", "both"}
+        Which mean shift to detect.
+    """
+
+    name = "page_hinkley"
+
+    def __init__(
+        self,
+        delta: float = 0.02,
+        threshold: float = 1.0,
+        min_samples: int = 30,
+        direction: str = "up",
+    ):
+        if direction not in ("up", "down", "both"):
+            raise ValueError(f"Unknown direction: {direction}")
+
+        self.delta = delta
+        self.threshold = threshold
+        self.min_samples = min_samples
+        self.direction = direction
+        self.last_event = None
+        self.reset()
+
+    def reset(self):
+        self.n = 0
+        self.mean = 0.0
+        self.cum_up = 0.0
+        self.min_up = 0.0
+        self.cum_down = 0.0
+        self.max_down = 0.0
+
+    @property
+    def statistic(self):
+        up = self.cum_up - self.min_up
+        down = self.max_down - self.cum_down
+        if self.direction == "up":
+            return up
+        if self.direction == "down":
+            return down
+        return max(up, down)
+
+    def update(self, value: float) -> bool:
+        """
+        Consume one value. Returns True on change detection,
+        after which the detector restarts.
+        """
+        value = float(value)
+        self.n += 1
+        self.mean += (value - self.mean) / self.n
+
+        self.cum_up += value - self.mean - self.delta
+        self.min_up = min(self.min_up, self.cum_up)
+        self.cum_down += value - self.mean + self.delta
+        self.max_down = max(self.max_down, self.cum_down)
+
+        if self.n < self.min_samples:
+            return False
+
+        up = self.cum_up - self.min_up
+        down = self.max_down - self.cum_down
+        if self.direction == "up":
+            down = 0.0
+        elif self.direction == "down":
+            up = 0.0
+
+        if max(up, down) > self.threshold:
+            self.last_event = {
+                "detector": self.name,
+                "statistic": float(max(up, down)),
+                "threshold": float(self.threshold),
+                "n": self.n,
+                "direction": "up" if up >= down else "down",
+            }
+            self.reset()
+            return True
+
+        return False
+
+    # -------- snapshot --------
+
+    def to_state(self):
+        return dict(vars(self)), {}
+
+    @classmethod
+    def from_state(cls, meta, arrays):
+        detector = cls.__new__(cls)
+        detector.__dict__.update(meta)
+        return detector
+
+
+class CUSUM:
+    """
+    Two-sided tabular CUSUM on standardized CDI values.
+
+    The in-control mean and std are either given or estimated
+    online from the first ``warmup`` values. O(1) per update;
+    on detection ``update`` returns True and fills ``last_event``.
+
+    Parameters
+    ----------
+    k : float
+        Allowance (slack) in standard deviations.
+    h : float
+        Decision interval in standard deviations.
+    target_mean, target_std : float | None
+        In-control parameters; estimated during warmup if None.
+    warmup : int
+        Values used to estimate missing in-control parameters.
+    """
+
+    name = "cusum"
+
+    def __init__(
+        self,
+        k: float = 0.5,
+        h: float = 5.0,
+        target_mean: float | None = None,
+        target_std: float | None = None,
+        warmup: int = 100,
+    ):
+        assert warmup >= 2
+        self.k = k
+        self.h = h
+        self.target_mean = target_mean
+        self.target_std = target_std
+        self.warmup = warmup
+        self.last_event = None
+        self.reset()
+
+    def reset(self):
+        self.n = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self.s_hi = 0.0
+        self.s_lo = 0.0
+
+    def _baseline(self):
+        mean = self.target_mean if self.target_mean is not None else self._mean
+        if self.target_std is not None:
+            return mean, self.target_std
+        n_warm = min(self.n, self.warmup)
+        return mean, math.sqrt(self._m2 / max(n_warm - 1, 1))
+
+    @property
+    def statistic(self):
+        return max(self.s_hi, self.s_lo)
+
+    def update(self, value: float) -> bool:
+        """
+        Consume one value. Returns True on change detection,
+        after which the cumulative sums restart (the in-control
+        baseline is kept).
+        """
+        value = float(value)
+        self.n += 1
+
+        if self.n <= self.warmup:
+            d = value - self._mean
+            self._mean += d / self.n
+            self._m2 += d * (value - self._mean)
+            if self.target_mean is None or self.target_std is None:
+                return False
+
+        mean, std = self._baseline()
+        if std <= 0.0:
+            return False
+
+        z = (value - mean) / std
+        self.s_hi = max(0.0, self.s_hi + z - self.k)
+        self.s_lo = max(0.0, self.s_lo - z - self.k)
+
+        if self.s_hi > self.h or self.s_lo > self.h:
+            self.last_event = {
+                "detector": self.name,
+                "statistic": float(self.statistic),
+                "threshold": float(self.h),
+                "n": self.n,
+                "direction": "up" if self.s_hi > self.h else "down",
+            }
+            self.s_hi = 0.0
+            self.s_lo = 0.0
+            return True
+
+        return False
+
+    # -------- snapshot --------
+
+    def to_state(self):
+        return dict(vars(self)), {}
+
+    @classmethod
+    def from_state(cls, meta, arrays):
+        detector = cls.__new__(cls)
+        detector.__dict__.update(meta)
+        return detector
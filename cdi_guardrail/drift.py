@@ -1,13 +1,124 @@
 # cdi_guardrail/drift.py
 
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
 import numpy as np
-from scipy.stats import ks_2samp
+
+from .reference import ReferenceProfile, psi_edges
+from .sketch import CDISketch
+
+
+def _sketch_counts(values, like: CDISketch):
+    """
+    Bin counts of ``values`` on the binning of sketch ``like``.
+    """
+    if isinstance(values, CDISketch):
+        like._check_compatible(values)
+        return values.counts
+
+    if isinstance(values, ReferenceProfile):
+        values = values.sorted_values
+
+    return np.bincount(
+        like.bin_index(np.asarray(values).ravel()),
+        minlength=like.n_bins,
+    )
+
+
+def _ks_binned(ref_counts, cur_counts, alpha):
+    """
+    Two-sample KS on shared bins (asymptotic p-value).
+    """
+    n = ref_counts.sum()
+    m = cur_counts.sum()
+
+    stat = np.abs(
+        np.cumsum(ref_counts) / n - np.cumsum(cur_counts) / m
+    ).max()
+    p_value = _ks_asymp_p_value(stat, n, m)
+
+    return {
+        "statistic": float(stat),
+        "p_value": float(p_value),
+        "drift": bool(p_value < alpha),
+    }
+
+
+def _sorted(values):
+    if isinstance(values, ReferenceProfile):
+        return values.sorted_values
+    return np.sort(np.asarray(values, dtype=np.float64).ravel())
+
+
+def _ks_statistic(ref_sorted, cur_sorted):
+    """
+    Exact two-sample KS statistic from sorted samples.
+
+    Between consecutive current points the current ECDF is flat
+    and the reference ECDF is monotone, so the supremum is reached
+    at a current point or just below one.
+    """
+    n = ref_sorted.size
+    m = cur_sorted.size
+
+    ref_right = np.searchsorted(ref_sorted, cur_sorted, side="right") / n
+    ref_left = np.searchsorted(ref_sorted, cur_sorted, side="left") / n
+    cur_right = np.searchsorted(cur_sorted, cur_sorted, side="right") / m
+    cur_left = np.searchsorted(cur_sorted, cur_sorted, side="left") / m
+
+    return max(
+        np.abs(ref_right - cur_right).max(),
+        np.abs(ref_left - cur_left).max(),
+    )
+
+
+def _ks_asymp_p_value(stat, n, m):
+    """
+    Smirnov asymptotic p-value, as ks_2samp(method="asymp").
+    """
+    # scipy is imported on first KS use only (see package __init__)
+    from scipy.stats import kstwo
+
+    return np.clip(kstwo.sf(stat, np.round(n * m / (n + m))), 0.0, 1.0)
 
 
 def ks_drift(reference, current, alpha: float = 0.05):
     """
     Kolmogorov–Smirnov test on CDI distributions.
+
+    Either side may be a CDISketch; the test then runs on the
+    sketch's bins (resolution of one bin width) with an
+    asymptotic p-value.
+
+    ``reference`` may be a ReferenceProfile; its presorted scores
+    are reused and the p-value is asymptotic.
     """
+    sketch = next(
+        (s for s in (reference, current) if isinstance(s, CDISketch)),
+        None,
+    )
+    if sketch is not None:
+        return _ks_binned(
+            _sketch_counts(reference, sketch),
+            _sketch_counts(current, sketch),
+            alpha,
+        )
+
+    if isinstance(reference, ReferenceProfile):
+        ref_sorted = reference.sorted_values
+        cur_sorted = _sorted(current)
+        stat = _ks_statistic(ref_sorted, cur_sorted)
+        p_value = _ks_asymp_p_value(stat, ref_sorted.size, cur_sorted.size)
+
+        return {
+            "statistic": float(stat),
+            "p_value": float(p_value),
+            "drift": bool(p_value < alpha),
+        }
+
+    from scipy.stats import ks_2samp
+
     reference = np.asarray(reference)
     current = np.asarray(current)
 
@@ -20,29 +131,237 @@ def ks_drift(reference, current, alpha: float = 0.05):
     }
 
 
+def _as_windows(windows):
+    """
+    [W, N] float array; a list of ragged windows is NaN-padded.
+    """
+    if isinstance(windows, np.ndarray) and windows.ndim == 2:
+        return windows.astype(np.float64, copy=False)
+
+    rows = [np.asarray(w, dtype=np.float64).ravel() for w in windows]
+    out = np.full((len(rows), max((r.size for r in rows), default=0)), np.nan)
+    for i, r in enumerate(rows):
+        out[i, :r.size] = r
+    return out
+
+
+def _ks_statistics(ref_sorted, windows):
+    """
+    Exact KS statistic of every row of ``windows`` against one
+    sorted reference (see _ks_statistic), fully vectorized.
+    NaNs mark padding.
+    """
+    rows = np.sort(windows, axis=1)  # NaNs sort last
+    valid = ~np.isnan(rows)
+    m = valid.sum(axis=1)
+    if np.any(m == 0):
+        raise ValueError("Cannot compute KS on an empty window")
+
+    n = ref_sorted.size
+    ref_right = np.searchsorted(ref_sorted, rows, side="right") / n
+    ref_left = np.searchsorted(ref_sorted, rows, side="left") / n
+
+    # Within-row ECDF with ties: first / one-past-last index of each
+    # run of equal values, via running max / min over the sorted row
+    pos = np.arange(rows.shape[1])
+    is_start = np.ones_like(valid)
+    is_start[:, 1:] = rows[:, 1:] != rows[:, :-1]
+    is_end = np.ones_like(valid)
+    is_end[:, :-1] = rows[:, :-1] != rows[:, 1:]
+
+    first = np.maximum.accumulate(np.where(is_start, pos, 0), axis=1)
+    stop = np.minimum.accumulate(
+        np.where(is_end, pos + 1, rows.shape[1])[:, ::-1],
+        axis=1,
+    )[:, ::-1]
+
+    cur_left = first / m[:, None]
+    cur_right = stop / m[:, None]
+
+    gap = np.maximum(
+        np.abs(ref_right - cur_right),
+        np.abs(ref_left - cur_left),
+    )
+    return np.where(valid, gap, 0.0).max(axis=1), m
+
+
+def ks_drift_batch(
+    reference,
+    windows,
+    alpha: float = 0.05,
+    n_jobs: int | None = None,
+    mp_context: str | None = None,
+):
+    """
+    KS test of many current windows against one reference.
+
+    The reference is sorted once (or taken presorted from a
+    ReferenceProfile); each window's ECDF is evaluated against it
+    with ``searchsorted``. The statistic is exact, p-values are
+    Smirnov asymptotic (as ks_2samp(method="asymp")).
+
+    Parameters
+    ----------
+    reference : array-like or ReferenceProfile
+    windows : array-like [W, N] or list of 1D arrays
+        One window per row; NaN-padding or ragged lists are allowed.
+    alpha : float
+        Significance level for the ``drift`` flags.
+    n_jobs : int | None
+        If > 1, windows are split across a process pool.
+
+    Returns
+    -------
+    dict
+        {"statistic": np.ndarray [W], "p_value": np.ndarray [W],
+         "drift": np.ndarray[bool] [W]}
+    """
+    ref_sorted = _sorted(reference)
+    windows = _as_windows(windows)
+
+    if n_jobs is not None and n_jobs > 1 and windows.shape[0] > 1:
+        chunks = np.array_split(windows, min(n_jobs, windows.shape[0]))
+        ctx = multiprocessing.get_context(mp_context) if mp_context else None
+        with ProcessPoolExecutor(max_workers=n_jobs, mp_context=ctx) as pool:
+            parts = list(pool.map(
+                _ks_statistics,
+                [ref_sorted] * len(chunks),
+                chunks,
+            ))
+        stat = np.concatenate([p[0] for p in parts])
+        m = np.concatenate([p[1] for p in parts])
+    else:
+        stat, m = _ks_statistics(ref_sorted, windows)
+
+    p_value = _ks_asymp_p_value(stat, ref_sorted.size, m)
+
+    return {
+        "statistic": stat,
+        "p_value": p_value,
+        "drift": p_value < alpha,
+    }
+
+
+def _psi_from_counts(ref_hist, cur_hist, eps):
+    """
+    PSI from bin counts; ``cur_hist`` may be [W, n_bins] (one PSI per row).
+    """
+    ref_pct = ref_hist / np.maximum(ref_hist.sum(axis=-1, keepdims=True), eps)
+    cur_pct = cur_hist / np.maximum(cur_hist.sum(axis=-1, keepdims=True), eps)
+
+    return np.sum(
+        (cur_pct - ref_pct)
+        * np.log((cur_pct + eps) / (ref_pct + eps)),
+        axis=-1,
+    )
+
+
+def _bin_counts(values, edges):
+    """
+    np.histogram-compatible counts via searchsorted.
+
+    ``values`` may be [N] or [W, N]; the result is [n_bins] or
+    [W, n_bins], computed in a single bincount pass. Values outside
+    the edges and NaNs (e.g. ragged-window padding) are ignored.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    n_bins = edges.size - 1
+    rows = np.atleast_2d(values)
+
+    idx = np.searchsorted(edges, rows, side="right") - 1
+    # last bin is closed on the right
+    idx[rows == edges[-1]] = n_bins - 1
+    valid = (idx >= 0) & (idx < n_bins)
+
+    flat = (np.arange(rows.shape[0])[:, None] * n_bins + idx)[valid]
+    counts = np.bincount(flat, minlength=rows.shape[0] * n_bins)
+    counts = counts.reshape(rows.shape[0], n_bins)
+
+    return counts if values.ndim == 2 else counts[0]
+
+
+def _psi_edges(reference, n_bins, binning):
+    if isinstance(reference, ReferenceProfile):
+        return reference.edges_for(n_bins, binning or reference.binning)
+
+    if isinstance(reference, CDISketch):
+        if binning == "quantile":
+            raise ValueError("Quantile binning needs a raw or profiled reference")
+        return psi_edges(None, n_bins, "uniform")
+
+    return psi_edges(_sorted(reference), n_bins, binning or "uniform")
+
+
+def _psi_hist(values, edges, n_bins):
+    if isinstance(values, ReferenceProfile):
+        return values.histogram(edges)
+
+    if isinstance(values, CDISketch):
+        if (values.lo, values.hi) != (0.0, 1.0) or not np.array_equal(
+            edges, np.linspace(0, 1, n_bins + 1)
+        ):
+            raise ValueError("PSI on sketches requires uniform bins over [0, 1]")
+        return values.histogram(n_bins)
+
+    return _bin_counts(np.asarray(values).ravel(), edges)
+
+
 def population_stability_index(
     reference,
     current,
     n_bins: int = 10,
     eps: float = 1e-6,
+    binning: str | None = None,
 ):
     """
     Population Stability Index (PSI).
+
+    Either side may be a CDISketch over [0, 1] whose bin count
+    is a multiple of ``n_bins``, or a ReferenceProfile (its cached
+    histogram is reused when the bins match).
+
+    binning : {"uniform", "quantile"} | None
+        "uniform" uses equal-width bins on [0, 1]; "quantile" uses
+        reference-quantile edges, which keeps bins populated when
+        CDI clusters in a narrow band. None means the profile's own
+        binning for a ReferenceProfile, otherwise "uniform".
     """
-    reference = np.asarray(reference)
-    current = np.asarray(current)
+    edges = _psi_edges(reference, n_bins, binning)
 
-    bins = np.linspace(0, 1, n_bins + 1)
+    ref_hist = _psi_hist(reference, edges, n_bins)
+    cur_hist = _psi_hist(current, edges, n_bins)
 
-    ref_hist, _ = np.histogram(reference, bins=bins)
-    cur_hist, _ = np.histogram(current, bins=bins)
+    return float(_psi_from_counts(ref_hist, cur_hist, eps))
 
-    ref_pct = ref_hist / max(ref_hist.sum(), eps)
-    cur_pct = cur_hist / max(cur_hist.sum(), eps)
 
-    psi = np.sum(
-        (cur_pct - ref_pct)
-        * np.log((cur_pct + eps) / (ref_pct + eps))
-    )
+def population_stability_index_batch(
+    reference,
+    windows,
+    n_bins: int = 10,
+    eps: float = 1e-6,
+    binning: str | None = None,
+):
+    """
+    PSI of many current windows against one reference.
+
+    Parameters
+    ----------
+    reference : array-like or ReferenceProfile
+        Reference CDI scores; a profile's edges and histogram are reused.
+    windows : array-like [W, N]
+        One window per row. Ragged windows can be NaN-padded.
+    n_bins, eps, binning :
+        As in population_stability_index.
+
+    Returns
+    -------
+    np.ndarray [W]
+    """
+    windows = np.asarray(windows, dtype=np.float64)
+    if windows.ndim != 2:
+        raise ValueError("windows must be a 2D array [W, N]")
+
+    edges = _psi_edges(reference, n_bins, binning)
+    ref_hist = _psi_hist(reference, edges, n_bins)
 
-    return float(psi)
+    return _psi_from_counts(ref_hist, _bin_counts(windows, edges), eps)
@@ -1,33 +1,468 @@
 # cdi_guardrail/monitor.py
 
 import collections
+import math
+import time
+
 import numpy as np
 
+from .changepoint import CUSUM, PageHinkley
+from .drift import ks_drift, population_stability_index
+from .sketch import CDISketch
+from .statistics import PoissonBootstrap
+
+
+_DETECTORS = {cls.__name__: cls for cls in (PageHinkley, CUSUM)}
+
+
+def window_summary(arr: np.ndarray):
+    """
+    Summary statistics of a window of raw CDI values.
+    """
+    if arr.size == 0:
+        return {}
+
+    return {
+        "count": len(arr),
+        "mean": float(arr.mean()),
+        "std": float(arr.std()),
+        "p50": float(np.percentile(arr, 50)),
+        "p90": float(np.percentile(arr, 90)),
+        "p95": float(np.percentile(arr, 95)),
+        "p99": float(np.percentile(arr, 99)),
+    }
+
 
 class CDIMonitor:
     """
     Rolling monitor for CDI values.
+
+    Optional sequential ``detectors`` (e.g. PageHinkley, CUSUM)
+    consume every value in O(1); on detection the event is sent
+    to each of ``loggers`` via ``log_change_point``.
+
+    An optional PoissonBootstrap adds confidence bounds
+    (``mean_lower`` / ``mean_upper`` / ``p95_lower`` / ``p95_upper``)
+    to ``summary()``; give it ``window=window_size`` to follow the
+    rolling window.
     """
 
-    def __init__(self, window_size: int = 1000):
+    def __init__(
+        self,
+        window_size: int = 1000,
+        detectors: list | None = None,
+        loggers: list | None = None,
+        bootstrap: PoissonBootstrap | None = None,
+    ):
         self.window_size = window_size
         self.buffer = collections.deque(maxlen=window_size)
+        self.detectors = list(detectors or [])
+        self.loggers = list(loggers or [])
+        self.bootstrap = bootstrap
+        self.change_points = 0
+
+    def _detect(self, cdi_value: float):
+        for detector in self.detectors:
+            if detector.update(cdi_value):
+                self.change_points += 1
+                for logger in self.loggers:
+                    logger.log_change_point(detector.last_event)
 
     def update(self, cdi_value: float):
-        self.buffer.append(float(cdi_value))
+        cdi_value = float(cdi_value)
+        self.buffer.append(cdi_value)
+        self._detect(cdi_value)
+
+        if self.bootstrap is not None:
+            self.bootstrap.update(cdi_value)
+
+    def update_many(self, values):
+        """
+        Batch update; the bootstrap is updated in one vectorized step.
+        """
+        values = np.asarray(values, dtype=np.float64).ravel()
+        self.buffer.extend(values.tolist())
+
+        if self.detectors:
+            for v in values:
+                self._detect(v)
+
+        if self.bootstrap is not None:
+            self.bootstrap.update_many(values)
 
     def summary(self):
-        if len(self.buffer) == 0:
-            return {}
+        summary = window_summary(np.asarray(self.buffer))
+        if summary and self.bootstrap is not None:
+            summary.update(self.bootstrap.interval())
+        return summary
+
+    # -------- snapshot --------
+
+    def to_state(self):
+        """
+        Window contents and detector state; loggers are not persisted.
+        """
+        meta = {
+            "window_size": self.window_size,
+            "change_points": self.change_points,
+            "detectors": [
+                {"type": type(d).__name__, "state": d.to_state()[0]}
+                for d in self.detectors
+            ],
+        }
+        # list() snapshots the deque atomically w.r.t. concurrent appends
+        arrays = {"buffer": np.asarray(list(self.buffer), dtype=np.float64)}
+
+        meta["bootstrap"] = None
+        if self.bootstrap is not None:
+            meta["bootstrap"], boot_arrays = self.bootstrap.to_state()
+            arrays.update({f"bootstrap_{k}": v for k, v in boot_arrays.items()})
+
+        return meta, arrays
+
+    @classmethod
+    def from_state(cls, meta, arrays, loggers: list | None = None):
+        monitor = cls(
+            window_size=meta["window_size"],
+            detectors=[
+                _DETECTORS[d["type"]].from_state(d["state"], {})
+                for d in meta["detectors"]
+            ],
+            loggers=loggers,
+        )
+        if meta.get("bootstrap") is not None:
+            monitor.bootstrap = PoissonBootstrap.from_state(
+                meta["bootstrap"],
+                {
+                    k[len("bootstrap_"):]: v
+                    for k, v in arrays.items()
+                    if k.startswith("bootstrap_")
+                },
+            )
+        monitor.buffer.extend(arrays["buffer"].tolist())
+        monitor.change_points = meta["change_points"]
+        return monitor
+
+
+OVERFLOW_SEGMENT = "__other__"
+
+
+class SegmentedCDIMonitor:
+    """
+    CDI monitor keyed by segment (predicted class, customer, ...).
+
+    Each live segment keeps one CDISketch, so memory is bounded by
+    ``max_segments * n_bins`` regardless of traffic. Live segments are
+    chosen by Space-Saving: when a new segment arrives and the cap is
+    reached, the segment with the lowest traffic is folded into the
+    OVERFLOW_SEGMENT bucket and the newcomer inherits its traffic
+    count plus its own. ``traffic`` therefore overestimates by at most
+    the inherited count, and every segment with more than
+    ``N / max_segments`` of N observations is guaranteed a live slot,
+    however many one-off segments stream past. No observation is ever
+    dropped; a segment's sketch holds what it received while live.
+    """
+
+    def __init__(self, max_segments: int = 50, n_bins: int = 200):
+        assert max_segments >= 1
+        self.max_segments = max_segments
+        self.n_bins = n_bins
+
+        self.sketches = {}
+        self.traffic = {}
+        self.overflow = CDISketch(n_bins)
+
+    def _admit(self, segment, n: int):
+        if segment in self.sketches:
+            self.traffic[segment] += n
+            return
+
+        inherited = 0
+        if len(self.sketches) >= self.max_segments:
+            victim = min(self.traffic, key=self.traffic.get)
+            inherited = self.traffic.pop(victim)
+            self.overflow.merge(self.sketches.pop(victim))
+
+        self.sketches[segment] = CDISketch(self.n_bins)
+        self.traffic[segment] = inherited + n
+
+    def update(self, cdi_value: float, segment):
+        self._admit(segment, 1)
+        self.sketches[segment].update(cdi_value)
+
+    def update_many(self, values, segment_ids):
+        """
+        Vectorized update: ``values[i]`` belongs to ``segment_ids[i]``.
+        """
+        values = np.asarray(values, dtype=np.float64).ravel()
+        segment_ids = np.asarray(segment_ids).ravel()
+        if values.size == 0:
+            return
+
+        keys, inverse, sizes = np.unique(
+            segment_ids,
+            return_inverse=True,
+            return_counts=True,
+        )
+        keys = keys.tolist()
+
+        # Heaviest first, so they win admission within the batch
+        for k in np.argsort(-sizes, kind="stable"):
+            self._admit(keys[k], int(sizes[k]))
+
+        n_keys = len(keys)
+        bins = self.overflow.bin_index(values)
+        counts = np.bincount(
+            inverse * self.n_bins + bins,
+            minlength=n_keys * self.n_bins,
+        ).reshape(n_keys, self.n_bins)
+        totals = np.bincount(inverse, weights=values, minlength=n_keys)
+        totals_sq = np.bincount(inverse, weights=values * values, minlength=n_keys)
+
+        order = np.argsort(inverse, kind="stable")
+        starts = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+        mins = np.minimum.reduceat(values[order], starts)
+        maxs = np.maximum.reduceat(values[order], starts)
+
+        for k, key in enumerate(keys):
+            # Segments evicted within this batch land in overflow
+            sketch = self.sketches.get(key, self.overflow)
+            sketch._accumulate(
+                counts[k],
+                sizes[k],
+                float(totals[k]),
+                float(totals_sq[k]),
+                float(mins[k]),
+                float(maxs[k]),
+            )
 
-        arr = np.asarray(self.buffer)
+    def segments(self):
+        """
+        Live segment sketches, plus the overflow bucket if non-empty.
+        """
+        out = dict(self.sketches)
+        if self.overflow.count > 0:
+            out[OVERFLOW_SEGMENT] = self.overflow
+        return out
 
+    def summary(self):
+        return {
+            segment: sketch.summary()
+            for segment, sketch in self.segments().items()
+        }
+
+    def drift(self, reference, alpha: float = 0.05, n_bins: int = 10):
+        """
+        KS and PSI of every segment against one reference distribution.
+        """
+        return {
+            segment: {
+                "ks": ks_drift(reference, sketch, alpha=alpha),
+                "psi": population_stability_index(reference, sketch, n_bins=n_bins),
+            }
+            for segment, sketch in self.segments().items()
+        }
+
+    # -------- snapshot --------
+
+    def to_state(self):
+        keys = list(self.sketches)
+        sketches = [self.sketches[k] for k in keys] + [self.overflow]
+
+        meta = {
+            "max_segments": self.max_segments,
+            "n_bins": self.n_bins,
+            "segments": keys,
+            "traffic": [self.traffic[k] for k in keys],
+            "sketches": [s.to_state()[0] for s in sketches],
+        }
+        counts = np.stack([s.counts for s in sketches])
+        return meta, {"counts": counts}
+
+    @classmethod
+    def from_state(cls, meta, arrays):
+        monitor = cls(max_segments=meta["max_segments"], n_bins=meta["n_bins"])
+        sketches = [
+            CDISketch.from_state(m, {"counts": counts})
+            for m, counts in zip(meta["sketches"], arrays["counts"])
+        ]
+
+        monitor.overflow = sketches.pop()
+        for key, traffic, sketch in zip(meta["segments"], meta["traffic"], sketches):
+            monitor.sketches[key] = sketch
+            monitor.traffic[key] = traffic
+        return monitor
+
+
+class TimeWindowCDIMonitor:
+    """
+    Wall-clock CDI window built from panes.
+
+    Time is cut into panes of ``pane_s`` seconds, each holding one
+    CDISketch. The window is the last ``window_s`` seconds
+    (``mode="sliding"``) or the current aligned ``window_s`` block
+    (``mode="tumbling"``). Expired panes are dropped from the front
+    of a deque in O(1), and summaries merge the live panes, so cost
+    depends on the number of panes and bins, never on traffic.
+
+    Values carry the clock time of their update, or an explicit
+    ``timestamp``; the window ends at the latest time seen. Values
+    older than the window are counted in ``late`` and dropped.
+    """
+
+    def __init__(
+        self,
+        window_s: float = 300.0,
+        pane_s: float = 10.0,
+        mode: str = "sliding",
+        n_bins: int = 200,
+        clock=time.time,
+    ):
+        if mode not in ("sliding", "tumbling"):
+            raise ValueError(f"Unknown window mode: {mode}")
+
+        n_panes = round(window_s / pane_s)
+        if n_panes < 1 or not math.isclose(n_panes * pane_s, window_s):
+            raise ValueError("window_s must be a positive multiple of pane_s")
+
+        self.window_s = window_s
+        self.pane_s = pane_s
+        self.mode = mode
+        self.n_bins = n_bins
+        self.n_panes = n_panes
+        self.clock = clock
+
+        self.panes = collections.deque()  # (pane index, CDISketch), ascending
+        self.watermark = None
+        self.late = 0
+
+    def _pane_index(self, t: float) -> int:
+        return math.floor(t / self.pane_s)
+
+    def _first_live_pane(self) -> int:
+        last = self._pane_index(self.watermark)
+        if self.mode == "sliding":
+            return last - self.n_panes + 1
+        return (last // self.n_panes) * self.n_panes
+
+    def _advance(self, t: float):
+        if self.watermark is None or t > self.watermark:
+            self.watermark = t
+
+        first = self._first_live_pane()
+        while self.panes and self.panes[0][0] < first:
+            self.panes.popleft()
+
+    def _pane(self, t: float):
+        """
+        Sketch of the pane containing ``t``, or None if it has expired.
+        """
+        self._advance(t)
+        index = self._pane_index(t)
+        if index < self._first_live_pane():
+            return None
+
+        if not self.panes or self.panes[-1][0] < index:
+            self.panes.append((index, CDISketch(self.n_bins)))
+            return self.panes[-1][1]
+
+        # late but live: search from the newest pane
+        for pos in range(len(self.panes) - 1, -1, -1):
+            pane_index, sketch = self.panes[pos]
+            if pane_index == index:
+                return sketch
+            if pane_index < index:
+                break
+        else:
+            pos = -1
+
+        sketch = CDISketch(self.n_bins)
+        self.panes.insert(pos + 1, (index, sketch))
+        return sketch
+
+    def update(self, cdi_value: float, timestamp: float | None = None):
+        sketch = self._pane(self.clock() if timestamp is None else timestamp)
+        if sketch is None:
+            self.late += 1
+        else:
+            sketch.update(cdi_value)
+
+    def update_many(self, values, timestamp: float | None = None):
+        """
+        Batch of values sharing one timestamp.
+        """
+        values = np.asarray(values, dtype=np.float64).ravel()
+        sketch = self._pane(self.clock() if timestamp is None else timestamp)
+        if sketch is None:
+            self.late += values.size
+        else:
+            sketch.update_many(values)
+
+    def sketch(self, now: float | None = None) -> CDISketch:
+        """
+        Merged sketch of the live window, expired as of ``now``
+        (default: the clock).
+        """
+        self._advance(self.clock() if now is None else now)
+
+        merged = CDISketch(self.n_bins)
+        for _, pane in self.panes:
+            merged.merge(pane)
+        return merged
+
+    def summary(self, now: float | None = None):
+        return self.sketch(now).summary()
+
+    def drift(
+        self,
+        reference,
+        alpha: float = 0.05,
+        n_bins: int = 10,
+        now: float | None = None,
+    ):
+        """
+        KS and PSI of the live window against a reference distribution.
+        """
+        window = self.sketch(now)
         return {
-            "count": len(arr),
-            "mean": float(arr.mean()),
-            "std": float(arr.std()),
-            "p50": float(np.percentile(arr, 50)),
-            "p90": float(np.percentile(arr, 90)),
-            "p95": float(np.percentile(arr, 95)),
-            "p99": float(np.percentile(arr, 99)),
+            "ks": ks_drift(reference, window, alpha=alpha),
+            "psi": population_stability_index(reference, window, n_bins=n_bins),
         }
+
+    # -------- snapshot --------
+
+    def to_state(self):
+        panes = list(self.panes)
+        meta = {
+            "window_s": self.window_s,
+            "pane_s": self.pane_s,
+            "mode": self.mode,
+            "n_bins": self.n_bins,
+            "watermark": self.watermark,
+            "late": self.late,
+            "panes": [index for index, _ in panes],
+            "sketches": [sketch.to_state()[0] for _, sketch in panes],
+        }
+        counts = np.zeros((len(panes), self.n_bins), dtype=np.int64)
+        for row, (_, sketch) in enumerate(panes):
+            counts[row] = sketch.counts
+        return meta, {"counts": counts}
+
+    @classmethod
+    def from_state(cls, meta, arrays, clock=time.time):
+        monitor = cls(
+            window_s=meta["window_s"],
+            pane_s=meta["pane_s"],
+            mode=meta["mode"],
+            n_bins=meta["n_bins"],
+            clock=clock,
+        )
+        monitor.watermark = meta["watermark"]
+        monitor.late = meta["late"]
+        for index, sketch_meta, counts in zip(
+            meta["panes"], meta["sketches"], arrays["counts"]
+        ):
+            monitor.panes.append(
+                (index, CDISketch.from_state(sketch_meta, {"counts": counts}))
+            )
+        return monitor
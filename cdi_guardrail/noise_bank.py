@@ -0,0 +1,114 @@
+# cdi_guardrail/noise_bank.py
+
+import collections
+
+import torch
+
+
+class NoiseBank:
+    """
+    Seeded, reusable perturbation directions for stability probes.
+
+    For each per-sample input shape the bank generates ``n_samples``
+    unit-scale noise tensors once, from a generator seeded with
+    ``seed``, and serves them from a size-bounded LRU cache.
+    The same noise is broadcast over every sample of a batch, so a
+    sample's stability gap does not depend on which batch it was
+    audited in, and repeated audits are bit-reproducible.
+
+    Parameters
+    ----------
+    n_samples : int
+        Perturbations per shape (>= the ``n_samples`` used by probes).
+    seed : int
+        Generator seed; record it next to audit results.
+    noise : {"gaussian", "uniform"}
+        Standard normal, or uniform on [-1, 1].
+    max_bytes : int
+        Upper bound on cached noise memory; least recently used
+        shapes are evicted first.
+    """
+
+    def __init__(
+        self,
+        n_samples: int = 1,
+        seed: int = 0,
+        noise: str = "gaussian",
+        max_bytes: int = 256 * 1024 * 1024,
+    ):
+        assert n_samples >= 1
+        if noise not in ("gaussian", "uniform"):
+            raise ValueError(f"Unknown noise type: {noise}")
+
+        self.n_samples = n_samples
+        self.seed = seed
+        self.noise = noise
+        self.max_bytes = max_bytes
+
+        self._cache = collections.OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _generate(self, shape):
+        gen = torch.Generator().manual_seed(self.seed)
+        size = (self.n_samples, *shape)
+
+        if self.noise == "gaussian":
+            return torch.randn(size, generator=gen)
+        return 2.0 * torch.rand(size, generator=gen) - 1.0
+
+    def get(
+        self,
+        shape,
+        dtype: torch.dtype = torch.float32,
+        device=None,
+    ) -> torch.Tensor:
+        """
+        Noise for one sample of the given shape.
+
+        Returns
+        -------
+        torch.Tensor [n_samples, *shape]
+        """
+        device = torch.device(device or "cpu")
+        key = (tuple(shape), dtype, device)
+
+        bank = self._cache.get(key)
+        if bank is not None:
+            self.hits += 1
+            self._cache.move_to_end(key)
+            return bank
+
+        self.misses += 1
+        bank = self._generate(key[0]).to(device=device, dtype=dtype)
+        size = bank.numel() * bank.element_size()
+
+        if size > self.max_bytes:
+            return bank
+
+        while self._cache and self.nbytes + size > self.max_bytes:
+            _, old = self._cache.popitem(last=False)
+            self.nbytes -= old.numel() * old.element_size()
+            self.evictions += 1
+
+        self._cache[key] = bank
+        self.nbytes += size
+        return bank
+
+    def clear(self):
+        self._cache.clear()
+        self.nbytes = 0
+
+    def summary(self):
+        return {
+            "seed": self.seed,
+            "noise": self.noise,
+            "n_samples": self.n_samples,
+            "entries": len(self._cache),
+            "nbytes": self.nbytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
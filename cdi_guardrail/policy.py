@@ -21,3 +21,15 @@ class CDIPolicy:
             return "warn"
         else:
             return "accept"
+
+    # -------- snapshot --------
+
+    def to_state(self):
+        return {
+            "warn_threshold": self.warn_threshold,
+            "reject_threshold": self.reject_threshold,
+        }, {}
+
+    @classmethod
+    def from_state(cls, meta, arrays):
+        return cls(meta["warn_threshold"], meta["reject_threshold"])
@@ -3,44 +3,146 @@
 import torch
 import torch.nn.functional as F
 
+
+# ``dtype=`` on _foreach_norm is missing from older torch releases
+_FOREACH_NORM_DTYPE = True
+
+
+def _float32_norms(tensors):
+    """
+    L2 norm of each tensor, accumulated in float32.
+    """
+    global _FOREACH_NORM_DTYPE
+    if _FOREACH_NORM_DTYPE:
+        try:
+            return torch._foreach_norm(tensors, 2, dtype=torch.float32)
+        except TypeError:
+            _FOREACH_NORM_DTYPE = False
+    return torch._foreach_norm([t.float() for t in tensors], 2)
+
+
+def layer_pressure(activations, device=None):
+    """
+    Gradient norm of each hooked activation, in one fused
+    ``_foreach_norm`` over all layers (float32).
+
+    Returns
+    -------
+    torch.Tensor [L]
+        In ``activations`` order; 0 for layers without a gradient.
+    """
+    values = list(activations.values())
+    device = device or (values[0].device if values else None)
+    out = torch.zeros(len(values), device=device, dtype=torch.float32)
+
+    index = [i for i, v in enumerate(values) if v.grad is not None]
+    if index:
+        norms = _float32_norms([values[i].grad for i in index])
+        out[index] = torch.stack(norms).to(device)
+
+    return out
+
+
+def _param_pressure(model):
+    grads = [p.grad for p in model.parameters() if p.grad is not None]
+    norms = _float32_norms(grads)
+    return torch.linalg.vector_norm(torch.stack(norms))
+
+
 def activation_and_param_pressure(
     loss,
     activations,
-    model
+    model,
+    per_layer: bool = False,
 ):
     """
     Computes internal pressure as:
     - sum of activation gradient norms
     - parameter gradient norm
 
+    Norms are accumulated in float32 so that reduced-precision
+    (autocast / bf16 / fp16) gradients cannot overflow when squared.
+
     Parameters
     ----------
     loss : torch.Tensor (scalar)
     activations : dict[str, torch.Tensor]
         Forward-hooked activations with retain_grad()
     model : torch.nn.Module
+    per_layer : bool
+        Also return the per-layer activation pressures
+        (see layer_pressure) from the same backward.
 
     Returns
     -------
     torch.Tensor (scalar)
+        or (torch.Tensor (scalar), torch.Tensor [L]) with per_layer
     """
-    # Backward pass
+    # Backward pass (an earlier autograd.grad on the same graph may
+    # have filled the retained activation gradients)
     model.zero_grad()
+    for activation in activations.values():
+        activation.grad = None
     loss.backward(retain_graph=True)
 
     # Activation pressure
-    act_pressure = torch.zeros((), device=loss.device)
-    for v in activations.values():
-        if v.grad is not None:
-            act_pressure += v.grad.norm()
+    layers = layer_pressure(activations, device=loss.device)
+    act_pressure = layers.sum()
 
     # Parameter pressure
-    param_pressure = torch.sqrt(
-        sum(
-            (p.grad ** 2).sum()
-            for p in model.parameters()
-            if p.grad is not None
-        )
-    )
-
-    return act_pressure + param_pressure
+    param_pressure = _param_pressure(model)
+
+    pressure = act_pressure + param_pressure
+    return (pressure, layers) if per_layer else pressure
+
+
+def chunked_activation_and_param_pressure(
+    chunks,
+    model,
+    per_layer: bool = False,
+):
+    """
+    activation_and_param_pressure over a batch processed in chunks.
+
+    Each chunk's backward runs without ``retain_graph`` and frees its
+    graph before the next chunk is built, so peak memory is that of
+    one chunk. The result equals the whole-batch pressure provided
+    each chunk loss is its share of the batch loss (e.g. the chunk's
+    summed cross-entropy divided by the full batch size):
+
+    - parameter gradients accumulate across chunks into the batch
+      gradient;
+    - a batch activation gradient is the concatenation of the chunk
+      gradients, so its norm is the root of the summed squared
+      chunk norms.
+
+    Parameters
+    ----------
+    chunks : iterable of (torch.Tensor, dict[str, torch.Tensor])
+        (chunk loss, forward-hooked chunk activations with
+        retain_grad()); consumed lazily, one chunk at a time.
+    model : torch.nn.Module
+    per_layer : bool
+        Also return the per-layer activation pressures.
+
+    Returns
+    -------
+    torch.Tensor (scalar)
+        or (torch.Tensor (scalar), torch.Tensor [L]) with per_layer
+    """
+    model.zero_grad()
+
+    layer_sq = None
+    for loss, activations in chunks:
+        loss.backward()
+
+        sq = layer_pressure(activations, device=loss.device) ** 2
+        layer_sq = sq if layer_sq is None else layer_sq + sq
+
+    layers = torch.sqrt(layer_sq)
+    act_pressure = layers.sum()
+
+    param_pressure = _param_pressure(model)
+
+    pressure = act_pressure + param_pressure
+    return (pressure, layers) if per_layer else pressure
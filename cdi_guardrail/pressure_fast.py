@@ -6,7 +6,8 @@ import torch
 def representation_pressure(
     logits,
     features,
-    labels
+    labels,
+    retain_graph: bool = False,
 ):
     """
     Fast internal pressure proxy.
@@ -15,35 +16,45 @@ def representation_pressure(
     true-vs-second-best logit margin
     with respect to last-layer features.
 
+    The runner-up logit comes from ``torch.topk(k=2)`` and the true
+    logit from a gather, so no [B, C] copy of the logits is made;
+    memory beyond the logits scales with B, not B * C.
+    The margin and norm are taken in float32.
+
     Parameters
     ----------
     logits : torch.Tensor [B, C]
     features : torch.Tensor [B, D]
         Last hidden representation (retain_grad enabled)
     labels : torch.Tensor [B]
+    retain_graph : bool
+        Keep the forward graph, e.g. for a later full-mode backward.
 
     Returns
     -------
     torch.Tensor (scalar)
     """
-    batch_size = logits.size(0)
-
     # true class logit
-    true_logits = logits[torch.arange(batch_size), labels]
-
-    # second-best logit
-    masked = logits.clone()
-    masked[torch.arange(batch_size), labels] = -1e9
-    second_logits = masked.max(dim=1).values
+    true_logits = logits.gather(1, labels[:, None]).squeeze(1)
+
+    # best logit among the other classes: the top-1 unless it is
+    # the label itself, then the top-2
+    top2 = logits.topk(2, dim=1)
+    label_is_top = top2.indices[:, 0] == labels
+    second_logits = torch.where(
+        label_is_top,
+        top2.values[:, 1],
+        top2.values[:, 0],
+    )
 
     # margin loss (decision tension)
-    margin = true_logits - second_logits
+    margin = true_logits.float() - second_logits.float()
     loss = -margin.mean()
 
     grad = torch.autograd.grad(
         loss,
         features,
-        retain_graph=False
+        retain_graph=retain_graph,
     )[0]
 
-    return grad.norm()
+    return torch.linalg.vector_norm(grad, dtype=torch.float32)
@@ -49,6 +49,49 @@ class PrometheusCDILogger:
             namespace=namespace,
         )
 
+        # Bootstrap bounds (CDIMonitor with a PoissonBootstrap)
+        self.cdi_bounds = {
+            key: Gauge(
+                name=f"cdi_{key}",
+                documentation=f"Bootstrap {key.replace('_', ' ')} bound of rolling CDI",
+                namespace=namespace,
+            )
+            for key in ("mean_lower", "mean_upper", "p95_lower", "p95_upper")
+        }
+
+        # Segment metrics (label cardinality bounded by the
+        # SegmentedCDIMonitor segment cap)
+        self.segment_cdi_mean = Gauge(
+            name="segment_cdi_mean",
+            documentation="Mean CDI per segment",
+            namespace=namespace,
+            labelnames=["segment"],
+        )
+
+        self.segment_cdi_p95 = Gauge(
+            name="segment_cdi_p95",
+            documentation="p95 CDI per segment",
+            namespace=namespace,
+            labelnames=["segment"],
+        )
+
+        self.segment_count = Gauge(
+            name="segment_count",
+            documentation="CDI observations per segment",
+            namespace=namespace,
+            labelnames=["segment"],
+        )
+
+        self._segments = set()
+
+        # Per-layer pressure (one series per hooked layer)
+        self.layer_pressure = Gauge(
+            name="layer_pressure",
+            documentation="Activation gradient norm per hooked layer",
+            namespace=namespace,
+            labelnames=["layer"],
+        )
+
         # Drift metrics
         self.ks_statistic = Gauge(
             name="cdi_ks_statistic",
@@ -68,6 +111,20 @@ class PrometheusCDILogger:
             namespace=namespace,
         )
 
+        self.change_point_count = Counter(
+            name="change_point_total",
+            documentation="Sequential CDI change points by detector",
+            namespace=namespace,
+            labelnames=["detector", "direction"],
+        )
+
+        self.change_point_statistic = Gauge(
+            name="change_point_statistic",
+            documentation="Detector statistic at the last change point",
+            namespace=namespace,
+            labelnames=["detector"],
+        )
+
     # -------- adapters --------
 
     def log_prediction(self, cdi_value, decision, latency_ms=None):
@@ -84,7 +141,43 @@ class PrometheusCDILogger:
         self.cdi_mean.set(summary["mean"])
         self.cdi_p95.set(summary["p95"])
 
+        for key, gauge in self.cdi_bounds.items():
+            if key in summary:
+                gauge.set(summary[key])
+
+    def log_segment_summary(self, summaries: dict):
+        # only segments with a summary get series
+        exported = set()
+        for segment, summary in summaries.items():
+            if not summary:
+                continue
+            segment = str(segment)
+            self.segment_cdi_mean.labels(segment=segment).set(summary["mean"])
+            self.segment_cdi_p95.labels(segment=segment).set(summary["p95"])
+            self.segment_count.labels(segment=segment).set(summary["count"])
+            exported.add(segment)
+
+        # Drop series of segments that were folded into overflow
+        for segment in self._segments - exported:
+            for gauge in (self.segment_cdi_mean, self.segment_cdi_p95, self.segment_count):
+                gauge.remove(segment)
+
+        self._segments = exported
+
+    def log_layer_pressure(self, layer_pressure: dict):
+        for layer, value in layer_pressure.items():
+            self.layer_pressure.labels(layer=str(layer)).set(float(value))
+
     def log_drift(self, ks_result: dict, psi_value: float):
         self.ks_statistic.set(ks_result["statistic"])
         self.psi_value.set(float(psi_value))
         self.ks_drift_flag.set(1.0 if ks_result["drift"] else 0.0)
+
+    def log_change_point(self, event: dict):
+        self.change_point_count.labels(
+            detector=event["detector"],
+            direction=event["direction"],
+        ).inc()
+        self.change_point_statistic.labels(
+            detector=event["detector"],
+        ).set(event["statistic"])
@@ -0,0 +1,152 @@
+# cdi_guardrail/reference.py
+
+import numpy as np
+
+from ._binary import read_arrays, write_arrays
+
+
+def quantile_edges(sorted_values, n_bins: int):
+    """
+    PSI bin edges at reference quantiles.
+
+    Interior edges are the reference's 1/n_bins, ..., (n_bins-1)/n_bins
+    quantiles (duplicates from ties removed); the outer edges are
+    -inf / +inf so that no current value falls outside the bins.
+    """
+    inner = np.quantile(sorted_values, np.linspace(0, 1, n_bins + 1)[1:-1])
+    return np.concatenate(([-np.inf], np.unique(inner), [np.inf]))
+
+
+def psi_edges(sorted_values, n_bins: int, binning: str):
+    if binning == "uniform":
+        return np.linspace(0, 1, n_bins + 1)
+    elif binning == "quantile":
+        return quantile_edges(sorted_values, n_bins)
+    else:
+        raise ValueError(f"Unknown binning: {binning}")
+
+
+def histogram_sorted(sorted_values, edges):
+    """
+    np.histogram counts of an already sorted array in O(n_bins log n).
+    """
+    left = np.searchsorted(sorted_values, edges[:-1], side="left")
+    right = np.searchsorted(sorted_values, edges[1:], side="left")
+    # np.histogram closes the last bin on the right
+    right[-1] = np.searchsorted(sorted_values, edges[-1], side="right")
+    return right - left
+
+
+class ReferenceProfile:
+    """
+    Precomputed reference CDI distribution for drift and z-score checks.
+
+    Built once from calibration scores, it holds the sorted
+    scores, PSI bin edges ("uniform" on [0, 1] or "quantile" of the
+    reference) and histogram, and the moments, so
+    ks_drift, population_stability_index and statistics.zscore
+    do not re-convert and re-sort the reference on every call.
+    Profiles are saved in a compact binary file and loaded as
+    read-only memory maps.
+    """
+
+    def __init__(
+        self,
+        sorted_values,
+        edges,
+        hist,
+        mean: float,
+        std: float,
+        binning: str = "uniform",
+        n_bins: int | None = None,
+    ):
+        self.sorted_values = sorted_values
+        self.edges = edges
+        self.hist = hist
+        self.mean = float(mean)
+        self.std = float(std)
+        self.binning = binning
+        # Requested bin count (quantile ties may leave fewer bins)
+        self.n_bins = int(n_bins if n_bins is not None else hist.size)
+
+    @classmethod
+    def from_scores(cls, scores, n_bins: int = 10, binning: str = "uniform"):
+        """
+        Build a profile from reference CDI scores.
+        """
+        values = np.sort(np.asarray(scores, dtype=np.float64).ravel())
+        if values.size == 0:
+            raise ValueError("Cannot build a profile from empty scores")
+
+        edges = psi_edges(values, n_bins, binning)
+
+        return cls(
+            sorted_values=values,
+            edges=edges,
+            hist=histogram_sorted(values, edges),
+            mean=values.mean(),
+            std=values.std(),
+            binning=binning,
+            n_bins=n_bins,
+        )
+
+    @property
+    def count(self):
+        return int(self.sorted_values.size)
+
+    def edges_for(self, n_bins: int, binning: str):
+        """
+        PSI edges for the requested binning, reusing the cached ones.
+        """
+        if (n_bins, binning) == (self.n_bins, self.binning):
+            return self.edges
+        return psi_edges(self.sorted_values, n_bins, binning)
+
+    def histogram(self, edges):
+        """
+        Reference counts on arbitrary ``edges`` (cached edges reuse
+        the stored histogram).
+        """
+        if np.array_equal(edges, self.edges):
+            return self.hist
+        return histogram_sorted(self.sorted_values, edges)
+
+    # -------- persistence --------
+
+    def to_state(self):
+        meta = {
+            "kind": "reference_profile",
+            "mean": self.mean,
+            "std": self.std,
+            "binning": self.binning,
+            "n_bins": self.n_bins,
+        }
+        arrays = {
+            "sorted_values": self.sorted_values,
+            "edges": self.edges,
+            "hist": self.hist,
+        }
+        return meta, arrays
+
+    @classmethod
+    def from_state(cls, meta, arrays):
+        return cls(
+            sorted_values=arrays["sorted_values"],
+            edges=arrays["edges"],
+            hist=arrays["hist"],
+            mean=meta["mean"],
+            std=meta["std"],
+            binning=meta["binning"],
+            n_bins=meta["n_bins"],
+        )
+
+    def save(self, path: str):
+        write_arrays(path, *self.to_state())
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True):
+        meta, arrays = read_arrays(path, mmap=mmap)
+        if meta.get("kind") != "reference_profile":
+            raise ValueError(f"Not a reference profile: {path}")
+
+        return cls.from_state(meta, arrays)
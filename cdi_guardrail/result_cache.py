@@ -0,0 +1,136 @@
+# cdi_guardrail/result_cache.py
+
+import collections
+import hashlib
+import time
+
+import torch
+
+from .wrapper import CDIGuard
+
+
+class CachedCDIGuard:
+    """
+    LRU / TTL cache of ``forward_with_cdi`` results in front of a CDIGuard.
+
+    Entries are keyed by a BLAKE2b digest of the input and label
+    tensor bytes (plus dtype and shape). The whole cache is dropped
+    when the guard's version token changes:
+
+    - policy thresholds or pressure mode,
+    - model weights (any parameter or buffer replaced or modified
+      in place, tracked through tensor version counters),
+    - the user-supplied ``version`` (e.g. a model release tag).
+
+    Parameters
+    ----------
+    guard : CDIGuard
+    max_entries : int
+        Least recently used entries are evicted beyond this size.
+    ttl_s : float | None
+        Entries older than this are recomputed (None: no expiry).
+    version : hashable
+        Extra token folded into the version; change it to invalidate.
+    """
+
+    def __init__(
+        self,
+        guard: CDIGuard,
+        max_entries: int = 10_000,
+        ttl_s: float | None = None,
+        version=None,
+    ):
+        assert max_entries >= 1
+        assert ttl_s is None or ttl_s > 0
+
+        self.guard = guard
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+        self.version = version
+
+        self._cache = collections.OrderedDict()
+        self._token = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def input_key(x: torch.Tensor, y: torch.Tensor) -> bytes:
+        digest = hashlib.blake2b(digest_size=16)
+        for t in (x, y):
+            t = t.detach().contiguous().cpu()
+            digest.update(f"{t.dtype}{tuple(t.shape)}".encode())
+            # reinterpret as bytes so every dtype (incl. bf16) hashes
+            digest.update(t.view(-1).view(torch.uint8).numpy().tobytes())
+        return digest.digest()
+
+    def version_token(self):
+        """
+        Cheap fingerprint of everything a cached result depends on.
+        """
+        guard = self.guard
+        tensors = [*guard.model.parameters(), *guard.model.buffers()]
+
+        return (
+            self.version,
+            guard.policy.warn_threshold,
+            guard.policy.reject_threshold,
+            guard.fast,
+            guard.autocast_dtype,
+            tuple((t.data_ptr(), t._version) for t in tensors),
+        )
+
+    def _check_version(self):
+        token = self.version_token()
+        if token != self._token:
+            if self._token is not None and self._cache:
+                self.invalidations += 1
+            self._cache.clear()
+            self._token = token
+
+    def forward_with_cdi(self, x, y):
+        """
+        Same as CDIGuard.forward_with_cdi, served from cache when possible.
+        """
+        self._check_version()
+        key = self.input_key(x, y)
+        now = time.monotonic()
+
+        entry = self._cache.get(key)
+        if entry is not None:
+            stored_at, result = entry
+            if self.ttl_s is None or now - stored_at <= self.ttl_s:
+                self.hits += 1
+                self._cache.move_to_end(key)
+                return result
+
+            del self._cache[key]
+            self.expirations += 1
+
+        self.misses += 1
+        pred, cdi, decision = self.guard.forward_with_cdi(x, y)
+        result = (pred.detach(), cdi, decision)
+
+        self._cache[key] = (now, result)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+            self.evictions += 1
+
+        return result
+
+    def clear(self):
+        self._cache.clear()
+
+    def summary(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._cache),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
@@ -0,0 +1,185 @@
+# cdi_guardrail/scheduler.py
+
+import numpy as np
+
+from .policy import CDIPolicy
+from .scorer import compute_cdi
+from .wrapper import CDIGuard
+
+
+class TieredCDIScorer:
+    """
+    Fast-mode CDI on every request, full mode only where it matters.
+
+    Each request is scored with ``representation_pressure`` (fast
+    mode). It is escalated to full-mode pressure
+    (``activation_and_param_pressure``) when
+
+    - its fast CDI lies within ``margin`` of a warn / reject
+      threshold of ``fast_policy``, or
+    - it is drawn by the random audit sample (``audit_rate``).
+
+    Escalated requests are decided by ``guard.policy`` on the
+    full-mode CDI; all others by ``fast_policy`` on the fast CDI.
+    With ``detailed=True`` escalated requests also get a
+    ``forward_detailed`` boundary decomposition.
+
+    The model runs forward once: when a request can escalate (an
+    audit draw, or a non-zero ``margin``), the fast-mode gradient
+    keeps the graph and an escalation runs only the full-mode
+    backward on it, reusing the logits, captured activations and
+    boundary term. Requests that stay fast release the graph before
+    returning.
+    Memory-bounded guards (checkpointing / chunking) escalate with
+    their own chunked full-mode pass instead, since retaining the
+    whole-batch graph would defeat the memory bound.
+
+    The guard needs ``activation_layers`` whose last entry is the
+    representation used by fast mode.
+
+    Parameters
+    ----------
+    guard : CDIGuard
+    fast_policy : CDIPolicy | None
+        Thresholds on the fast-mode scale (default: guard.policy).
+    margin : float
+        Half-width of the escalation band around each threshold.
+    audit_rate : float
+        Probability of escalating a request regardless of its score.
+    detailed : bool
+        Run forward_detailed on escalated requests.
+    detailed_kwargs : dict | None
+        Extra arguments for forward_detailed.
+    seed : int | None
+        Seed for the audit sampler.
+    """
+
+    def __init__(
+        self,
+        guard: CDIGuard,
+        fast_policy: CDIPolicy | None = None,
+        margin: float = 0.05,
+        audit_rate: float = 0.01,
+        detailed: bool = False,
+        detailed_kwargs: dict | None = None,
+        seed: int | None = None,
+    ):
+        assert margin >= 0
+        assert 0 <= audit_rate <= 1
+        if not guard.hooks:
+            raise ValueError("Tiered scoring needs a guard with activation_layers")
+
+        self.guard = guard
+        self.fast_policy = fast_policy or guard.policy
+        self.margin = margin
+        self.audit_rate = audit_rate
+        self.detailed = detailed
+        self.detailed_kwargs = dict(detailed_kwargs or {})
+        self._rng = np.random.default_rng(seed)
+
+        self.requests = 0
+        self.escalations = {"near_threshold": 0, "audit": 0}
+
+    def near_threshold(self, cdi: float) -> bool:
+        return any(
+            abs(cdi - t) <= self.margin
+            for t in (
+                self.fast_policy.warn_threshold,
+                self.fast_policy.reject_threshold,
+            )
+        )
+
+    def _escalation_reason(self, fast_cdi, audit):
+        if self.near_threshold(fast_cdi):
+            return "near_threshold"
+        return "audit" if audit else None
+
+    def score(self, x, y):
+        """
+        Returns
+        -------
+        dict:
+            {
+              "prediction": torch.Tensor,
+              "cdi": float,              (CDI of the deciding tier)
+              "decision": str,
+              "tier": "fast" | "full",
+              "fast_cdi": float,
+              "escalation": None | "near_threshold" | "audit",
+              "detailed": dict           (only with detailed=True, escalated)
+            }
+        """
+        self.requests += 1
+        guard = self.guard
+
+        # drawn for every request, before scoring, so the audit sample
+        # is independent of scores
+        audit = self._rng.random() < self.audit_rate
+        # keep the graph only if this request can escalate
+        reuse_graph = not guard.memory_bounded and (audit or self.margin > 0)
+
+        logits = guard._forward(x)
+        pred = logits.argmax(dim=1)
+        boundary = guard._boundary(logits, y)
+        fast_pressure = guard._pressure(
+            logits,
+            y,
+            fast=True,
+            retain_graph=reuse_graph,
+        )
+        fast_cdi = compute_cdi(fast_pressure, boundary).item()
+
+        reason = self._escalation_reason(fast_cdi, audit)
+
+        if reason is None:
+            # release the graph held through the captured activations
+            guard.activations.clear()
+            return {
+                "prediction": pred,
+                "cdi": fast_cdi,
+                "decision": self.fast_policy.decide(fast_cdi),
+                "tier": "fast",
+                "fast_cdi": fast_cdi,
+                "escalation": None,
+            }
+
+        self.escalations[reason] += 1
+        if reuse_graph:
+            pressure = guard._pressure(logits, y, fast=False)
+            cdi, decision = guard._cdi_and_decision(logits, y, pressure, boundary)
+        else:
+            pred, cdi, decision = guard.forward_with_cdi(x, y, fast=False)
+
+        result = {
+            "prediction": pred,
+            "cdi": cdi,
+            "decision": decision,
+            "tier": "full",
+            "fast_cdi": fast_cdi,
+            "escalation": reason,
+        }
+
+        if self.detailed:
+            result["detailed"] = self.guard.forward_detailed(
+                x,
+                y,
+                **self.detailed_kwargs,
+            )
+
+        return result
+
+    def forward_with_cdi(self, x, y):
+        """
+        Drop-in for CDIGuard.forward_with_cdi.
+        """
+        result = self.score(x, y)
+        return result["prediction"], result["cdi"], result["decision"]
+
+    def summary(self):
+        escalated = sum(self.escalations.values())
+        return {
+            "requests": self.requests,
+            "escalated": escalated,
+            "escalation_rate": escalated / self.requests if self.requests else 0.0,
+            **{f"escalated_{k}": v for k, v in self.escalations.items()},
+        }
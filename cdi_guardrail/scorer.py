@@ -1,5 +1,8 @@
 # cdi_guardrail/scorer.py
 
+import torch
+
+
 def compute_cdi(
     internal_pressure,
     boundary_violation,
@@ -9,5 +12,13 @@ def compute_cdi(
     Consistency Deviation Index
 
     CDI = P_internal / (P_internal + Boundary)
+
+    Tensor inputs are promoted to float32 so that ``eps``
+    does not underflow for reduced-precision terms.
     """
+    if torch.is_tensor(internal_pressure):
+        internal_pressure = internal_pressure.float()
+    if torch.is_tensor(boundary_violation):
+        boundary_violation = boundary_violation.float()
+
     return internal_pressure / (internal_pressure + boundary_violation + eps)
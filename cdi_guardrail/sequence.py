@@ -0,0 +1,121 @@
+# cdi_guardrail/sequence.py
+
+import torch
+
+from .scorer import compute_cdi
+
+
+IGNORE_INDEX = -100
+
+
+def sequence_cdi(
+    features: torch.Tensor,
+    head,
+    labels: torch.Tensor,
+    mask: torch.Tensor | None = None,
+    chunk_size: int | None = None,
+    n_bins: int = 10,
+):
+    """
+    Fast-mode CDI for sequence outputs, per token and per sequence.
+
+    Each token is scored as a one-row batch of the fast path:
+    pressure is the norm of the gradient of its true-vs-runner-up
+    margin with respect to its own features, boundary is its
+    calibration gap |correct - confidence|. Each sequence is scored
+    as a batch of its valid tokens: pressure of the mean margin and
+    ECE over ``n_bins`` confidence bins.
+
+    Time is processed in chunks of ``chunk_size`` steps; each chunk
+    runs ``head`` once with its own small graph, so peak memory is
+    O(B * chunk_size * C) however long the sequences are. ``head``
+    must be position-wise (e.g. ``nn.Linear``), so a token's logits
+    depend only on its own features.
+
+    Parameters
+    ----------
+    features : torch.Tensor [B, T, D]
+        Input of the output head (gradients are not needed).
+    head : callable
+        [B, t, D] -> [B, t, C] logits.
+    labels : torch.Tensor [B, T]
+        Token labels; IGNORE_INDEX (-100) marks padding.
+    mask : torch.Tensor[bool] [B, T] | None
+        Valid tokens (default: labels != IGNORE_INDEX).
+    chunk_size : int | None
+        Time steps per chunk (default: all of T).
+    n_bins : int
+        Confidence bins for the per-sequence ECE.
+
+    Returns
+    -------
+    dict:
+        {
+          "prediction": torch.Tensor [B, T],
+          "token_cdi": torch.Tensor [B, T]   (NaN at padding),
+          "sequence_cdi": torch.Tensor [B]   (NaN for empty sequences),
+        }
+    """
+    B, T = labels.shape
+    if mask is None:
+        mask = labels != IGNORE_INDEX
+    mask = mask.to(torch.bool)
+    chunk_size = chunk_size or T
+
+    device = features.device
+    prediction = torch.zeros(B, T, dtype=torch.long, device=device)
+    token_pressure = torch.zeros(B, T, device=device)
+    token_boundary = torch.zeros(B, T, device=device)
+    # per-sequence sums of (correct - conf) in each confidence bin
+    bin_gap = torch.zeros(B, n_bins, device=device)
+
+    for start in range(0, T, chunk_size):
+        stop = min(start + chunk_size, T)
+        valid = mask[:, start:stop]
+        y = torch.where(valid, labels[:, start:stop], 0)
+
+        with torch.enable_grad():
+            h = features[:, start:stop].detach().requires_grad_(True)
+            logits = head(h).float()
+
+            true_logits = logits.gather(2, y[..., None]).squeeze(2)
+            top2 = logits.topk(2, dim=2)
+            second_logits = torch.where(
+                top2.indices[..., 0] == y,
+                top2.values[..., 1],
+                top2.values[..., 0],
+            )
+            margin = (true_logits - second_logits) * valid
+
+            grad = torch.autograd.grad(-margin.sum(), h)[0]
+
+        with torch.no_grad():
+            top, pred = logits.max(dim=2)
+            conf = torch.exp(top - torch.logsumexp(logits, dim=2))
+            gap = (pred == y).float() - conf
+
+            prediction[:, start:stop] = pred
+            token_pressure[:, start:stop] = torch.linalg.vector_norm(
+                grad, dim=2, dtype=torch.float32
+            )
+            token_boundary[:, start:stop] = gap.abs()
+
+            bins = (conf * n_bins).long().clamp_(0, n_bins - 1)
+            bin_gap.scatter_add_(1, bins, gap * valid)
+
+    n_valid = mask.sum(dim=1)
+    n = n_valid.clamp_min(1).float()
+
+    # mean-margin gradient: each token's gradient scaled by 1 / n
+    seq_pressure = torch.sqrt((token_pressure ** 2 * mask).sum(dim=1)) / n
+    seq_boundary = bin_gap.abs().sum(dim=1) / n
+
+    token_cdi = compute_cdi(token_pressure, token_boundary)
+    sequence = compute_cdi(seq_pressure, seq_boundary)
+
+    nan = torch.tensor(float("nan"), device=device)
+    return {
+        "prediction": prediction,
+        "token_cdi": torch.where(mask, token_cdi, nan),
+        "sequence_cdi": torch.where(n_valid > 0, sequence, nan),
+    }
@@ -0,0 +1,200 @@
+# cdi_guardrail/shared_monitor.py
+
+import sys
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .monitor import window_summary
+
+
+_HEADER = 2  # int64 words: n_slots, window_size
+
+
+def _attach(name: str):
+    """
+    Attach to an existing block. Only the creator unlinks it: on
+    Python >= 3.13 the attachment is untracked; before that, workers
+    started through multiprocessing share the creator's resource
+    tracker, which keeps the block alive until the creator exits.
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    return shared_memory.SharedMemory(name=name)
+
+
+class SharedCDIMonitor:
+    """
+    Fleet-wide rolling CDI monitor in POSIX shared memory.
+
+    The block holds one ring buffer of ``window_size`` values per
+    worker slot, each with its own write counter. A worker only
+    writes to its own slot (single writer, no locks): the value is
+    stored first, then the counter is bumped. Any attached process
+    can read every slot and compute the global ``summary()`` over
+    the union of the workers' windows, with no IPC round-trips.
+
+    Usage
+    -----
+    monitor = SharedCDIMonitor(n_slots=8, window_size=1000)   # parent
+    # in worker k (or pass the monitor to the worker; it pickles by name)
+    worker = SharedCDIMonitor.attach(monitor.name, slot=k)
+    worker.update(cdi)
+    # anywhere
+    monitor.summary()
+
+    The creating process should call ``unlink()`` at shutdown.
+    """
+
+    def __init__(
+        self,
+        n_slots: int,
+        window_size: int = 1000,
+        name: str | None = None,
+        slot: int | None = None,
+    ):
+        assert n_slots >= 1
+        assert window_size >= 1
+
+        size = 8 * (_HEADER + n_slots + n_slots * window_size)
+        self._shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        self._owner = True
+
+        np.ndarray((_HEADER,), dtype=np.int64, buffer=self._shm.buf)[:] = (
+            n_slots,
+            window_size,
+        )
+        self._map()
+        self._counts[:] = 0
+        self.slot = self._check_slot(slot)
+
+    @classmethod
+    def attach(cls, name: str, slot: int | None = None):
+        """
+        Attach to a monitor created in another process.
+        ``slot`` is required to ``update``; readers may omit it.
+        """
+        monitor = cls.__new__(cls)
+        monitor.__setstate__({"name": name, "slot": None})
+        try:
+            monitor.slot = monitor._check_slot(slot)
+        except ValueError:
+            monitor.close()
+            raise
+        return monitor
+
+    def _map(self):
+        buf = self._shm.buf
+        self._header = np.ndarray((_HEADER,), dtype=np.int64, buffer=buf)
+        n_slots, window_size = (int(v) for v in self._header)
+
+        self._counts = np.ndarray(
+            (n_slots,),
+            dtype=np.int64,
+            buffer=buf,
+            offset=8 * _HEADER,
+        )
+        self._values = np.ndarray(
+            (n_slots, window_size),
+            dtype=np.float64,
+            buffer=buf,
+            offset=8 * (_HEADER + n_slots),
+        )
+
+    def _check_slot(self, slot):
+        if slot is not None and not 0 <= slot < self.n_slots:
+            raise ValueError(f"slot must be in [0, {self.n_slots}), got {slot}")
+        return slot
+
+    # Monitors pickle by name, so they can be handed to worker processes
+    def __getstate__(self):
+        return {"name": self.name, "slot": self.slot}
+
+    def __setstate__(self, state):
+        self._shm = _attach(state["name"])
+        self._owner = False
+        self._map()
+        self.slot = state["slot"]
+
+    @property
+    def name(self):
+        return self._shm.name
+
+    @property
+    def n_slots(self):
+        return self._values.shape[0]
+
+    @property
+    def window_size(self):
+        return self._values.shape[1]
+
+    # -------- writes (own slot only) --------
+
+    def update(self, cdi_value: float):
+        if self.slot is None:
+            raise RuntimeError("Attach with a slot to update the shared monitor")
+
+        n = self._counts[self.slot]
+        self._values[self.slot, n % self.window_size] = float(cdi_value)
+        # publish after the value is in place
+        self._counts[self.slot] = n + 1
+
+    def update_many(self, values):
+        if self.slot is None:
+            raise RuntimeError("Attach with a slot to update the shared monitor")
+
+        values = np.asarray(values, dtype=np.float64).ravel()
+        n = self._counts[self.slot]
+
+        # only the last window_size values survive; earlier ones
+        # still advance the counter
+        tail = values[-self.window_size:]
+        start = n + values.size - tail.size
+        idx = (start + np.arange(tail.size)) % self.window_size
+        self._values[self.slot, idx] = tail
+        self._counts[self.slot] = n + values.size
+
+    # -------- reads (any process) --------
+
+    def slot_values(self, slot: int):
+        """
+        Current window of one slot (copy, unordered).
+        """
+        n = int(self._counts[slot])
+        return self._values[slot, :min(n, self.window_size)].copy()
+
+    def values(self):
+        return np.concatenate(
+            [self.slot_values(s) for s in range(self.n_slots)]
+        )
+
+    def seen(self):
+        """
+        Total number of updates per slot since creation.
+        """
+        return self._counts.copy()
+
+    def summary(self, slot: int | None = None):
+        """
+        Same keys as CDIMonitor.summary(), over all slots' windows
+        (or a single ``slot``).
+        """
+        if slot is not None:
+            return window_summary(self.slot_values(slot))
+        return window_summary(self.values())
+
+    # -------- lifecycle --------
+
+    def close(self):
+        # drop views before releasing the mapping
+        self._header = self._counts = self._values = None
+        self._shm.close()
+
+    def unlink(self):
+        """
+        Close and destroy the block (creator only).
+        """
+        if not self._owner:
+            raise RuntimeError("Only the creating process may unlink")
+        self.close()
+        self._shm.unlink()
@@ -0,0 +1,180 @@
+# cdi_guardrail/simulator.py
+
+import numpy as np
+
+
+def _default_grid(sorted_scores, n_grid):
+    grid = np.unique(np.quantile(sorted_scores, np.linspace(0.5, 0.999, n_grid)))
+    # CDIPolicy thresholds live in the open interval (0, 1)
+    return grid[(grid > 0.0) & (grid < 1.0)]
+
+
+def simulate_policies(
+    cdi_scores,
+    warn_thresholds=None,
+    reject_thresholds=None,
+    outcomes=None,
+    n_grid: int = 100,
+):
+    """
+    What-if evaluation of a grid of (warn, reject) threshold pairs.
+
+    Scores are sorted once; the number of scores at or above each
+    threshold (CDIPolicy decides ``>=``) comes from ``searchsorted``,
+    and outcome counts from a cumulative sum over the sorted order,
+    so the whole grid costs O(n log n + (W + R) log n).
+
+    Parameters
+    ----------
+    cdi_scores : array-like [N]
+        Historical CDI scores.
+    warn_thresholds, reject_thresholds : array-like | None
+        Candidate thresholds (default: ``n_grid`` score quantiles
+        between the 50th and 99.9th percentile).
+    outcomes : array-like[bool] [N] | None
+        True where the request turned out bad (the event a guard
+        should flag).
+    n_grid : int
+        Size of the default threshold grids.
+
+    Returns
+    -------
+    dict[str, np.ndarray]
+        ``warn_threshold`` [W], ``reject_threshold`` [R], and [W, R]
+        grids ``valid`` (0 < warn < reject < 1, as CDIPolicy
+        requires), ``accept_rate``,
+        ``warn_rate``, ``reject_rate``, ``flag_rate`` (warn or
+        reject). With outcomes also ``flag_precision``,
+        ``flag_recall``, ``reject_precision``, ``reject_recall``.
+        Rates of invalid pairs are NaN.
+    """
+    scores = np.asarray(cdi_scores, dtype=np.float64).ravel()
+    order = np.argsort(scores, kind="stable")
+    scores = scores[order]
+    n = scores.size
+    if n == 0:
+        raise ValueError("Cannot simulate policies on empty history")
+
+    warn = np.asarray(
+        _default_grid(scores, n_grid) if warn_thresholds is None else warn_thresholds,
+        dtype=np.float64,
+    ).ravel()
+    reject = np.asarray(
+        _default_grid(scores, n_grid) if reject_thresholds is None else reject_thresholds,
+        dtype=np.float64,
+    ).ravel()
+
+    # first sorted index with score >= t
+    warn_idx = np.searchsorted(scores, warn, side="left")
+    reject_idx = np.searchsorted(scores, reject, side="left")
+
+    warn_ge = (n - warn_idx)[:, None].astype(np.float64)
+    reject_ge = (n - reject_idx)[None, :].astype(np.float64)
+
+    valid = (
+        (warn[:, None] < reject[None, :])
+        & (warn[:, None] > 0.0)
+        & (reject[None, :] < 1.0)
+    )
+    nan = np.where(valid, 1.0, np.nan)
+
+    result = {
+        "warn_threshold": warn,
+        "reject_threshold": reject,
+        "valid": valid,
+        "accept_rate": (1.0 - warn_ge / n) * nan,
+        "warn_rate": (warn_ge - reject_ge) / n * nan,
+        "reject_rate": reject_ge / n * nan,
+        "flag_rate": warn_ge / n * nan,
+    }
+
+    if outcomes is not None:
+        bad = np.asarray(outcomes, dtype=bool).ravel()[order]
+        if bad.size != n:
+            raise ValueError("outcomes must match cdi_scores in length")
+
+        # bad outcomes at sorted index >= i
+        bad_ge = np.concatenate([np.cumsum(bad[::-1])[::-1], [0]])
+        total_bad = max(int(bad.sum()), 1)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            flagged_bad = bad_ge[warn_idx][:, None].astype(np.float64)
+            rejected_bad = bad_ge[reject_idx][None, :].astype(np.float64)
+
+            result["flag_precision"] = flagged_bad / warn_ge * nan
+            result["flag_recall"] = flagged_bad / total_bad * nan
+            result["reject_precision"] = rejected_bad / reject_ge * nan
+            result["reject_recall"] = rejected_bad / total_bad * nan
+
+    return result
+
+
+def select_thresholds(
+    simulation: dict,
+    objective: str | None = None,
+    max_reject_rate: float | None = None,
+    max_flag_rate: float | None = None,
+    min_precision: float | None = None,
+):
+    """
+    Best (warn, reject) pair of a simulate_policies grid under constraints.
+
+    Parameters
+    ----------
+    simulation : dict
+        Output of simulate_policies.
+    objective : str | None
+        Grid to maximize (default: "flag_recall" with outcomes,
+        otherwise "flag_rate", i.e. the most review traffic the
+        rate limits allow).
+    max_reject_rate, max_flag_rate : float | None
+        Upper limits on the reject rate and the warn-or-reject rate.
+    min_precision : float | None
+        Lower limit on ``flag_precision`` (requires outcomes).
+
+    Returns
+    -------
+    dict
+        ``warn_threshold``, ``reject_threshold`` and every simulated
+        metric at that pair.
+    """
+    has_outcomes = "flag_recall" in simulation
+    objective = objective or ("flag_recall" if has_outcomes else "flag_rate")
+
+    feasible = simulation["valid"].copy()
+    if max_reject_rate is not None:
+        feasible &= simulation["reject_rate"] <= max_reject_rate
+    if max_flag_rate is not None:
+        feasible &= simulation["flag_rate"] <= max_flag_rate
+    if min_precision is not None:
+        if not has_outcomes:
+            raise ValueError("min_precision requires outcomes")
+        feasible &= simulation["flag_precision"] >= min_precision
+
+    # e.g. precision where a pair flags nothing
+    feasible &= np.isfinite(simulation[objective])
+
+    if not feasible.any():
+        raise ValueError("No threshold pair satisfies the constraints")
+
+    # ties go to the smallest flag rate, then the smallest reject rate
+    score = np.where(feasible, simulation[objective], -np.inf)
+    candidates = np.flatnonzero(score == np.nanmax(score))
+    best = min(
+        candidates,
+        key=lambda i: (
+            simulation["flag_rate"].flat[i],
+            simulation["reject_rate"].flat[i],
+        ),
+    )
+    i, j = np.unravel_index(best, feasible.shape)
+
+    selected = {
+        "warn_threshold": float(simulation["warn_threshold"][i]),
+        "reject_threshold": float(simulation["reject_threshold"][j]),
+    }
+    for key, grid in simulation.items():
+        if isinstance(grid, np.ndarray) and grid.ndim == 2 and key != "valid":
+            selected[key] = float(grid[i, j])
+
+    return selected
@@ -0,0 +1,193 @@
+# cdi_guardrail/sketch.py
+
+import numpy as np
+
+
+class CDISketch:
+    """
+    Compact, mergeable summary of a CDI value stream.
+
+    Values are counted in ``n_bins`` fixed-width bins over
+    [lo, hi] (values outside are clipped into the edge bins),
+    alongside exact count, sum, sum of squares, min and max.
+    Memory is O(n_bins) regardless of traffic, and two sketches
+    with the same binning merge by addition.
+
+    Quantiles are interpolated within bins, so they are accurate
+    to one bin width ((hi - lo) / n_bins).
+    """
+
+    def __init__(self, n_bins: int = 200, lo: float = 0.0, hi: float = 1.0):
+        assert n_bins >= 1
+        assert lo < hi
+
+        self.n_bins = n_bins
+        self.lo = lo
+        self.hi = hi
+
+        self.counts = np.zeros(n_bins, dtype=np.int64)
+        self.count = 0
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+
+    @property
+    def edges(self):
+        return np.linspace(self.lo, self.hi, self.n_bins + 1)
+
+    def bin_index(self, values):
+        """
+        Bin index of each value (clipped into [0, n_bins - 1]).
+        """
+        values = np.asarray(values, dtype=np.float64)
+        scaled = (values - self.lo) * (self.n_bins / (self.hi - self.lo))
+        return np.clip(scaled, 0, self.n_bins - 1).astype(np.int64)
+
+    # -------- updates --------
+
+    def update(self, value: float):
+        value = float(value)
+        self.counts[self.bin_index(value)] += 1
+        self.count += 1
+        self.total += value
+        self.total_sq += value * value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def update_many(self, values):
+        values = np.asarray(values, dtype=np.float64).ravel()
+        if values.size == 0:
+            return
+
+        self._accumulate(
+            np.bincount(self.bin_index(values), minlength=self.n_bins),
+            values.size,
+            float(values.sum()),
+            float(np.dot(values, values)),
+            float(values.min()),
+            float(values.max()),
+        )
+
+    def _accumulate(self, counts, count, total, total_sq, vmin, vmax):
+        self.counts += counts
+        self.count += int(count)
+        self.total += total
+        self.total_sq += total_sq
+        self.min = min(self.min, vmin)
+        self.max = max(self.max, vmax)
+
+    def _check_compatible(self, other):
+        if (self.n_bins, self.lo, self.hi) != (other.n_bins, other.lo, other.hi):
+            raise ValueError("Cannot combine sketches with different binning")
+
+    def merge(self, other: "CDISketch"):
+        """
+        Add ``other`` into this sketch (in place). Returns self.
+        """
+        self._check_compatible(other)
+        self._accumulate(
+            other.counts,
+            other.count,
+            other.total,
+            other.total_sq,
+            other.min,
+            other.max,
+        )
+        return self
+
+    def copy(self):
+        out = CDISketch(self.n_bins, self.lo, self.hi)
+        return out.merge(self)
+
+    # -------- statistics --------
+
+    @property
+    def mean(self):
+        return self.total / self.count
+
+    @property
+    def std(self):
+        var = self.total_sq / self.count - self.mean ** 2
+        return float(np.sqrt(max(var, 0.0)))
+
+    def quantile(self, q):
+        """
+        Approximate quantile(s), q in [0, 1].
+        """
+        if self.count == 0:
+            raise ValueError("Cannot compute quantile of an empty sketch")
+
+        q = np.asarray(q, dtype=np.float64)
+        cum = np.cumsum(self.counts)
+        rank = q * self.count
+
+        idx = np.clip(np.searchsorted(cum, rank, side="left"), 0, self.n_bins - 1)
+        before = cum[idx] - self.counts[idx]
+        within = (rank - before) / np.maximum(self.counts[idx], 1)
+
+        width = (self.hi - self.lo) / self.n_bins
+        value = self.lo + (idx + within) * width
+        value = np.clip(value, self.min, self.max)
+
+        return float(value) if value.ndim == 0 else value
+
+    def histogram(self, n_bins: int | None = None):
+        """
+        Bin counts, optionally coarsened to ``n_bins`` equal bins
+        (must divide the sketch's own bin count).
+        """
+        if n_bins is None or n_bins == self.n_bins:
+            return self.counts.copy()
+
+        if self.n_bins % n_bins != 0:
+            raise ValueError(
+                f"Cannot coarsen {self.n_bins} sketch bins into {n_bins}"
+            )
+
+        return self.counts.reshape(n_bins, -1).sum(axis=1)
+
+    def summary(self):
+        """
+        Same keys as CDIMonitor.summary().
+        """
+        if self.count == 0:
+            return {}
+
+        p50, p90, p95, p99 = self.quantile([0.50, 0.90, 0.95, 0.99])
+
+        return {
+            "count": self.count,
+            "mean": float(self.mean),
+            "std": self.std,
+            "p50": float(p50),
+            "p90": float(p90),
+            "p95": float(p95),
+            "p99": float(p99),
+        }
+
+    # -------- snapshot --------
+
+    def to_state(self):
+        meta = {
+            "n_bins": self.n_bins,
+            "lo": self.lo,
+            "hi": self.hi,
+            "count": self.count,
+            "total": self.total,
+            "total_sq": self.total_sq,
+            "min": self.min,
+            "max": self.max,
+        }
+        return meta, {"counts": self.counts.copy()}
+
+    @classmethod
+    def from_state(cls, meta, arrays):
+        sketch = cls(meta["n_bins"], meta["lo"], meta["hi"])
+        sketch.counts = np.array(arrays["counts"], dtype=np.int64)
+        sketch.count = meta["count"]
+        sketch.total = meta["total"]
+        sketch.total_sq = meta["total_sq"]
+        sketch.min = meta["min"]
+        sketch.max = meta["max"]
+        return sketch
@@ -0,0 +1,144 @@
+# cdi_guardrail/snapshot.py
+
+import threading
+
+from ._binary import read_arrays, write_arrays
+from .calibrator import CDICalibrator
+from .changepoint import CUSUM, PageHinkley
+from .monitor import CDIMonitor, SegmentedCDIMonitor, TimeWindowCDIMonitor
+from .policy import CDIPolicy
+from .reference import ReferenceProfile
+from .sketch import CDISketch
+
+
+SNAPSHOT_TYPES = {
+    cls.__name__: cls
+    for cls in (
+        CDIMonitor,
+        SegmentedCDIMonitor,
+        TimeWindowCDIMonitor,
+        CDICalibrator,
+        CDIPolicy,
+        CDISketch,
+        PageHinkley,
+        CUSUM,
+        ReferenceProfile,
+    )
+}
+
+
+def save_snapshot(path: str, objects: dict):
+    """
+    Write named monitoring objects to one binary snapshot file.
+
+    Parameters
+    ----------
+    path : str
+        Destination; replaced atomically.
+    objects : dict[str, object]
+        e.g. {"monitor": CDIMonitor, "policy": CDIPolicy, ...}.
+        Supported types are listed in SNAPSHOT_TYPES.
+    """
+    index = {}
+    arrays = {}
+
+    for name, obj in objects.items():
+        type_name = type(obj).__name__
+        if type_name not in SNAPSHOT_TYPES:
+            raise TypeError(f"Cannot snapshot object of type {type_name}")
+
+        meta, obj_arrays = obj.to_state()
+        index[name] = {
+            "type": type_name,
+            "meta": meta,
+            "arrays": list(obj_arrays),
+        }
+        for key, value in obj_arrays.items():
+            arrays[f"{name}/{key}"] = value
+
+    write_arrays(path, {"kind": "cdi_snapshot", "objects": index}, arrays)
+
+
+def load_snapshot(path: str, mmap: bool = True):
+    """
+    Restore the objects written by save_snapshot.
+
+    Arrays are memory-mapped; objects that mutate their state
+    (monitors, sketches) copy it, read-only ones (ReferenceProfile)
+    keep the map.
+
+    Returns
+    -------
+    dict[str, object]
+    """
+    meta, arrays = read_arrays(path, mmap=mmap)
+    if meta.get("kind") != "cdi_snapshot":
+        raise ValueError(f"Not a CDI snapshot: {path}")
+
+    restored = {}
+    for name, spec in meta["objects"].items():
+        cls = SNAPSHOT_TYPES[spec["type"]]
+        obj_arrays = {key: arrays[f"{name}/{key}"] for key in spec["arrays"]}
+        restored[name] = cls.from_state(spec["meta"], obj_arrays)
+
+    return restored
+
+
+class SnapshotWriter:
+    """
+    Periodically snapshots monitoring objects from a background thread.
+
+    Usage
+    -----
+    writer = SnapshotWriter("/var/lib/cdi/state.snap",
+                            {"monitor": monitor, "policy": guard.policy})
+    writer.start()
+    ...
+    writer.stop()   # writes a final snapshot
+
+    At startup, ``load_snapshot(path)`` restores warm state.
+    """
+
+    def __init__(self, path: str, objects: dict, interval_s: float = 30.0):
+        assert interval_s > 0
+        self.path = path
+        self.objects = objects
+        self.interval_s = interval_s
+
+        self.writes = 0
+        self.last_error = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def write_now(self):
+        try:
+            save_snapshot(self.path, self.objects)
+            self.writes += 1
+            self.last_error = None
+        except Exception as exc:  # keep the writer alive; surface via last_error
+            self.last_error = exc
+
+    def _run(self):
+        while not self._stop.wait(self.interval_s):
+            self.write_now()
+
+    def start(self):
+        if self._thread is not None:
+            return
+
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run,
+            name="cdi-snapshot-writer",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self, final_write: bool = True):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+        if final_write:
+            self.write_now()
@@ -2,6 +2,13 @@
 
 import numpy as np
 
+from .reference import ReferenceProfile
+from .sketch import CDISketch
+
+
+# MAD -> standard deviation under normality
+MAD_SCALE = 1.4826
+
 
 def bootstrap_ci(
     values,
@@ -71,22 +78,488 @@ def zscore(
     ----------
     value : float
         Current CDI value.
-    reference_values : array-like
-        Baseline CDI distribution.
+    reference_values : array-like, ReferenceProfile, ReferenceStats or RunningStats
+        Baseline CDI distribution. Profiles and stats objects supply
+        precomputed moments (O(1) per call).
 
     Returns
     -------
     float
         Z-score (standard deviations from mean).
     """
-    ref = np.asarray(reference_values)
-    if ref.size < 2:
-        raise ValueError("Reference distribution too small")
+    if isinstance(reference_values, (ReferenceProfile, ReferenceStats, RunningStats)):
+        if reference_values.count < 2:
+            raise ValueError("Reference distribution too small")
+        mean = reference_values.mean
+        std = reference_values.std
+    else:
+        ref = np.asarray(reference_values)
+        if ref.size < 2:
+            raise ValueError("Reference distribution too small")
 
-    mean = ref.mean()
-    std = ref.std()
+        mean = ref.mean()
+        std = ref.std()
 
     if std == 0.0:
         return 0.0
 
     return float((value - mean) / std)
+
+
+def _sketch_median_mad(sketch: CDISketch):
+    """
+    Median and median absolute deviation from a sketch's bins
+    (accurate to one bin width).
+    """
+    median = sketch.quantile(0.5)
+    width = (sketch.hi - sketch.lo) / sketch.n_bins
+    centers = sketch.lo + (np.arange(sketch.n_bins) + 0.5) * width
+
+    dev = np.abs(centers - median)
+    order = np.argsort(dev, kind="stable")
+    cum = np.cumsum(sketch.counts[order])
+    mad = dev[order][np.searchsorted(cum, sketch.count / 2.0)]
+
+    return float(median), float(mad)
+
+
+class ReferenceStats:
+    """
+    Frozen reference moments for O(1) z-scores.
+
+    Holds count, mean and (population) std, and optionally the
+    median and MAD for robust z-scores:
+
+        z        = (x - mean) / std
+        z_robust = (x - median) / (MAD_SCALE * MAD)
+
+    Build with ``from_values`` (exact), ``from_sketch`` (binned) or
+    ``RunningStats.freeze()``.
+    """
+
+    def __init__(
+        self,
+        count: int,
+        mean: float,
+        std: float,
+        median: float | None = None,
+        mad: float | None = None,
+    ):
+        self.count = int(count)
+        self.mean = float(mean)
+        self.std = float(std)
+        self.median = None if median is None else float(median)
+        self.mad = None if mad is None else float(mad)
+
+    @classmethod
+    def from_values(cls, values, robust: bool = True):
+        values = np.asarray(values, dtype=np.float64).ravel()
+        if values.size < 2:
+            raise ValueError("Reference distribution too small")
+
+        median = mad = None
+        if robust:
+            median = np.median(values)
+            mad = np.median(np.abs(values - median))
+
+        return cls(values.size, values.mean(), values.std(), median, mad)
+
+    @classmethod
+    def from_sketch(cls, sketch: CDISketch):
+        if sketch.count < 2:
+            raise ValueError("Reference distribution too small")
+
+        median, mad = _sketch_median_mad(sketch)
+        return cls(sketch.count, sketch.mean, sketch.std, median, mad)
+
+    def _center_scale(self, robust):
+        if not robust:
+            return self.mean, self.std
+        if self.median is None:
+            raise ValueError("Reference has no robust statistics")
+        return self.median, MAD_SCALE * self.mad
+
+    def zscore(self, value: float, robust: bool = False) -> float:
+        center, scale = self._center_scale(robust)
+        if scale == 0.0:
+            return 0.0
+        return float((value - center) / scale)
+
+    def zscore_batch(self, values, robust: bool = False) -> np.ndarray:
+        center, scale = self._center_scale(robust)
+        values = np.asarray(values, dtype=np.float64)
+        if scale == 0.0:
+            return np.zeros_like(values)
+        return (values - center) / scale
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "std": self.std,
+            "median": self.median,
+            "mad": self.mad,
+        }
+
+
+class RunningStats:
+    """
+    Streaming mean / variance (Welford), mergeable across workers.
+
+    ``update`` is O(1); ``update_many`` folds a whole array in with
+    Chan's parallel update. If a ``sketch`` is attached it is fed the
+    same values, so ``freeze()`` can also provide median / MAD.
+    """
+
+    def __init__(self, sketch: CDISketch | None = None):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.sketch = sketch
+
+    def update(self, value: float):
+        value = float(value)
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+
+        if self.sketch is not None:
+            self.sketch.update(value)
+
+    def update_many(self, values):
+        values = np.asarray(values, dtype=np.float64).ravel()
+        if values.size == 0:
+            return
+
+        mean = values.mean()
+        self._combine(values.size, mean, float(np.sum((values - mean) ** 2)))
+
+        if self.sketch is not None:
+            self.sketch.update_many(values)
+
+    def _combine(self, count, mean, m2):
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self._m2 += m2 + delta * delta * self.count * count / total
+        self.count = total
+
+    def merge(self, other: "RunningStats"):
+        """
+        Add ``other`` into these stats (in place). Returns self.
+        """
+        if other.count:
+            self._combine(other.count, other.mean, other._m2)
+            if self.sketch is not None and other.sketch is not None:
+                self.sketch.merge(other.sketch)
+        return self
+
+    @property
+    def var(self):
+        return self._m2 / self.count if self.count else 0.0
+
+    @property
+    def std(self):
+        return float(np.sqrt(self.var))
+
+    def freeze(self) -> ReferenceStats:
+        """
+        Snapshot as an immutable reference.
+        """
+        if self.count < 2:
+            raise ValueError("Reference distribution too small")
+
+        median = mad = None
+        if self.sketch is not None and self.sketch.count:
+            median, mad = _sketch_median_mad(self.sketch)
+
+        return ReferenceStats(self.count, self.mean, self.std, median, mad)
+
+    def zscore(self, value: float) -> float:
+        std = self.std
+        return 0.0 if std == 0.0 else float((value - self.mean) / std)
+
+    def zscore_batch(self, values) -> np.ndarray:
+        values = np.asarray(values, dtype=np.float64)
+        std = self.std
+        if std == 0.0:
+            return np.zeros_like(values)
+        return (values - self.mean) / std
+
+
+def _quantiles(values, q):
+    """
+    np.quantile (linear interpolation) via one partition: O(n)
+    instead of a sort, which matters for the per-query replica scan.
+    """
+    pos = np.asarray(q) * (values.size - 1)
+    lo = np.floor(pos).astype(np.int64)
+    hi = np.minimum(lo + 1, values.size - 1)
+    part = np.partition(values, np.unique(np.concatenate([lo, hi])))
+    return part[lo] + (pos - lo) * (part[hi] - part[lo])
+
+
+class PoissonBootstrap:
+    """
+    Streaming Poisson bootstrap of the CDI mean and p95.
+
+    Each of ``n_replicas`` replicas sees every value with an
+    independent Poisson(1) weight, which approximates resampling
+    with replacement without storing the data. A replica keeps a
+    weighted sum and a weighted ``n_bins`` histogram over [lo, hi],
+    so memory is O(n_replicas * n_bins). A scalar update touches one
+    histogram column, O(n_replicas), with its Poisson weights taken
+    from a block drawn in advance.
+
+    Each replica also tracks the bin holding its p95 and the weight
+    below it. ``interval()`` only walks those bins by as far as the
+    p95 has moved since the last call, instead of scanning the whole
+    histogram.
+
+    With ``window`` set, replica accumulators decay by
+    (1 - 1 / window) per value, so the bands follow a rolling window
+    of about that many values (e.g. a CDIMonitor's window_size). The
+    decay is lazy: new weights are inflated by one global factor, and
+    the accumulators are only rescaled when that factor grows large.
+    Means and quantile ranks are ratios, so the factor cancels out.
+
+    Parameters
+    ----------
+    n_replicas : int
+        Bootstrap replicas (K).
+    n_bins : int
+        Histogram resolution for the p95; accurate to one bin width.
+    window : int | None
+        Effective window length of the exponential decay, > 1
+        (None: the whole stream).
+    seed : int | None
+        Seed for the Poisson weights.
+    """
+
+    QUANTILE = 0.95
+    # scalar updates take their Poisson weights from pre-drawn blocks
+    _DRAW_BLOCK = 256
+    # renormalize before inflated weights leave float64 comfort range
+    _MAX_INFLATE = 1e100
+
+    def __init__(
+        self,
+        n_replicas: int = 100,
+        n_bins: int = 200,
+        window: int | None = None,
+        seed: int | None = None,
+        lo: float = 0.0,
+        hi: float = 1.0,
+    ):
+        assert n_replicas >= 2
+        assert window is None or window > 1
+        assert lo < hi
+
+        self.n_replicas = n_replicas
+        self.n_bins = n_bins
+        self.window = window
+        self.lo = lo
+        self.hi = hi
+
+        self.seed = seed
+        self._rng = np.random.default_rng(seed)
+        self._rows = np.arange(n_replicas)
+
+        # accumulators, in units inflated by self._inflate
+        self._weights = np.zeros(n_replicas)
+        self._sums = np.zeros(n_replicas)
+        self._hist = np.zeros((n_replicas, n_bins))
+        self._inflate = 1.0
+        # per-replica p95 bin and the weight in bins below it
+        self._p_idx = np.zeros(n_replicas, dtype=np.int64)
+        self._p_below = np.zeros(n_replicas)
+        self._draws = np.zeros((0, n_replicas))
+        self._next_draw = 0
+        self.count = 0
+
+    @property
+    def _bin_scale(self):
+        return self.n_bins / (self.hi - self.lo)
+
+    def _bin(self, values):
+        return np.clip(
+            ((values - self.lo) * self._bin_scale).astype(np.int64),
+            0,
+            self.n_bins - 1,
+        )
+
+    def _renormalize(self):
+        for acc in (self._weights, self._sums, self._hist):
+            acc /= self._inflate
+        self._inflate = 1.0
+        # also clears rounding drift of the incremental p95 state
+        cum = np.cumsum(self._hist, axis=1)
+        self._p_below = cum[self._rows, self._p_idx] - self._hist[self._rows, self._p_idx]
+
+    def update(self, value: float):
+        value = float(value)
+        if self.window is not None:
+            self._inflate /= 1.0 - 1.0 / self.window
+            if self._inflate > self._MAX_INFLATE:
+                self._renormalize()
+
+        if self._next_draw == self._draws.shape[0]:
+            self._draws = self._rng.poisson(
+                1.0, size=(self._DRAW_BLOCK, self.n_replicas)
+            ).astype(np.float64)
+            self._next_draw = 0
+        w = self._draws[self._next_draw] * self._inflate
+        self._next_draw += 1
+        b = min(max(int((value - self.lo) * self._bin_scale), 0), self.n_bins - 1)
+
+        self._weights += w
+        self._sums += w * value
+        self._hist[:, b] += w
+        self._p_below += w * (b < self._p_idx)
+        self.count += 1
+
+    def update_many(self, values):
+        """
+        Fold a batch in: one [K, n] Poisson draw and one bincount.
+        """
+        values = np.asarray(values, dtype=np.float64).ravel()
+        if values.size == 0:
+            return
+
+        if self.window is None:
+            self._accumulate(values, 1.0)
+            return
+
+        # split so the inflation within a chunk stays bounded
+        growth = -np.log1p(-1.0 / self.window)
+        chunk = max(1, int(np.log(self._MAX_INFLATE) / growth))
+        for start in range(0, values.size, chunk):
+            part = values[start:start + chunk]
+            if self._inflate * np.exp(growth * part.size) > self._MAX_INFLATE:
+                self._renormalize()
+            # the i-th value of the part is i + 1 steps younger
+            age = np.exp(growth * np.arange(1, part.size + 1))
+            self._accumulate(part, age)
+            self._inflate *= age[-1]
+
+    def _accumulate(self, values, age):
+        n = values.size
+        w = self._rng.poisson(1.0, size=(self.n_replicas, n)) * (self._inflate * age)
+
+        bins = self._bin(values)
+        flat = (self._rows[:, None] * self.n_bins + bins).ravel()
+
+        self._weights += w.sum(axis=1)
+        self._sums += w @ values
+        self._hist += np.bincount(
+            flat,
+            weights=w.ravel(),
+            minlength=self.n_replicas * self.n_bins,
+        ).reshape(self.n_replicas, self.n_bins)
+        self._p_below += (w * (bins[None, :] < self._p_idx[:, None])).sum(axis=1)
+        self.count += n
+
+    def _replica_p95(self):
+        rank = self.QUANTILE * self._weights
+        rows = self._rows
+        idx = self._p_idx
+        below = self._p_below
+        last = self.n_bins - 1
+
+        # move each replica to the first bin whose cumulative weight
+        # reaches its rank; mass shifts slowly, so few steps are needed
+        while True:
+            here = self._hist[rows, idx]
+            up = (below + here < rank) & (idx < last)
+            down = (below >= rank) & (idx > 0)
+            if not (up.any() or down.any()):
+                break
+            previous = self._hist[rows, np.maximum(idx - 1, 0)]
+            below = below + np.where(up, here, 0.0) - np.where(down, previous, 0.0)
+            idx = idx + up - down
+
+        self._p_idx = idx
+        self._p_below = below
+
+        within = (rank - below) / np.maximum(here, 1e-12 * self._inflate)
+        width = (self.hi - self.lo) / self.n_bins
+        return self.lo + (idx + np.clip(within, 0.0, 1.0)) * width
+
+    def replicas(self):
+        """
+        Per-replica mean and p95 estimates (replicas with no weight
+        are dropped).
+        """
+        alive = self._weights > 0
+        means = self._sums[alive] / self._weights[alive]
+        p95 = self._replica_p95()[alive]
+        return means, p95
+
+    def interval(self, confidence: float = 0.95):
+        """
+        Percentile bootstrap bounds on the mean and p95.
+
+        Returns
+        -------
+        dict
+            {"mean_lower", "mean_upper", "p95_lower", "p95_upper"}
+            (empty until a value has been seen)
+        """
+        means, p95 = self.replicas()
+        if means.size < 2:
+            return {}
+
+        alpha = 1.0 - confidence
+        q = (alpha / 2.0, 1.0 - alpha / 2.0)
+        mean_lower, mean_upper = _quantiles(means, q)
+        p95_lower, p95_upper = _quantiles(p95, q)
+
+        return {
+            "mean_lower": float(mean_lower),
+            "mean_upper": float(mean_upper),
+            "p95_lower": float(p95_lower),
+            "p95_upper": float(p95_upper),
+        }
+
+    # -------- snapshot --------
+
+    def to_state(self):
+        meta = {
+            "n_replicas": self.n_replicas,
+            "n_bins": self.n_bins,
+            "window": self.window,
+            "seed": self.seed,
+            "lo": self.lo,
+            "hi": self.hi,
+            "count": self.count,
+            "inflate": self._inflate,
+            "rng_state": self._rng.bit_generator.state,
+        }
+        arrays = {
+            "weights": self._weights.copy(),
+            "sums": self._sums.copy(),
+            "hist": self._hist.copy(),
+            "p95_bin": self._p_idx.copy(),
+            "p95_below": self._p_below.copy(),
+            "draws": self._draws[self._next_draw:].copy(),
+        }
+        return meta, arrays
+
+    @classmethod
+    def from_state(cls, meta, arrays):
+        meta = dict(meta)
+        count = meta.pop("count")
+        inflate = meta.pop("inflate")
+        rng_state = meta.pop("rng_state")
+        boot = cls(**meta)
+        boot._weights = np.array(arrays["weights"], dtype=np.float64)
+        boot._sums = np.array(arrays["sums"], dtype=np.float64)
+        boot._hist = np.array(arrays["hist"], dtype=np.float64)
+        boot._p_idx = np.array(arrays["p95_bin"], dtype=np.int64)
+        boot._p_below = np.array(arrays["p95_below"], dtype=np.float64)
+        boot._draws = np.array(arrays["draws"], dtype=np.float64)
+        boot._inflate = inflate
+        boot._rng.bit_generator.state = rng_state
+        boot.count = count
+        return boot
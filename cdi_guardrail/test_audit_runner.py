@@ -0,0 +1,126 @@
+# cdi_guardrail/test_audit_runner.py
+
+import json
+import os
+
+import numpy as np
+import torch
+import torch.nn as nn
+from torch.utils.data import TensorDataset
+
+from cdi_guardrail.audit import AuditRunner
+
+
+def make_model():
+    torch.manual_seed(0)
+    return nn.Sequential(nn.Linear(8, 16), nn.ReLU(), nn.Linear(16, 3)).eval()
+
+
+def _dataset(n=50):
+    g = torch.Generator().manual_seed(0)
+    return TensorDataset(
+        torch.randn(n, 8, generator=g),
+        torch.randint(0, 3, (n,), generator=g),
+    )
+
+
+def test_audit_runner_in_process(tmp_path):
+    runner = AuditRunner(
+        make_model,
+        _dataset(),
+        str(tmp_path),
+        num_workers=0,
+        shard_size=16,
+    )
+
+    report = runner.run()
+
+    assert report["n_audited"] == 50
+    assert set(report["boundary_vector"]) == {"calibration", "stability"}
+    assert report["boundary_vector"]["calibration"]["count"] == 50
+    assert os.path.exists(tmp_path / "report.json")
+    assert len(list(tmp_path.glob("shard_*.npz"))) == 4
+
+    results = runner.load_results()
+    assert np.array_equal(results["index"], np.arange(50))
+
+
+def test_audit_runner_resumes_from_checkpoint(tmp_path):
+    runner = AuditRunner(
+        make_model,
+        _dataset(),
+        str(tmp_path),
+        num_workers=0,
+        shard_size=16,
+        components=["calibration"],
+    )
+    runner.run()
+
+    # Simulate an interrupted run: one shard lost
+    os.remove(tmp_path / "shard_000002.npz")
+    before = os.path.getmtime(tmp_path / "shard_000000.npz")
+
+    assert [s[0] for s in runner.pending_shards()] == [2]
+
+    report = runner.run()
+
+    assert report["n_audited"] == 50
+    assert os.path.getmtime(tmp_path / "shard_000000.npz") == before
+
+
+def test_audit_runner_process_pool_matches_in_process(tmp_path):
+    kwargs = dict(shard_size=10, components=["calibration"])
+
+    serial = AuditRunner(
+        make_model, _dataset(), str(tmp_path / "serial"),
+        num_workers=0, **kwargs,
+    ).run()
+    pooled = AuditRunner(
+        make_model, _dataset(), str(tmp_path / "pool"),
+        num_workers=2, torch_threads=1, **kwargs,
+    ).run()
+
+    assert pooled["n_audited"] == serial["n_audited"]
+    assert np.isclose(
+        pooled["boundary_vector"]["calibration"]["mean"],
+        serial["boundary_vector"]["calibration"]["mean"],
+    )
+
+    with open(tmp_path / "pool" / "report.json") as f:
+        assert json.load(f) == pooled
+
+
+class _UnpicklableDataset(TensorDataset):
+    def __reduce__(self):
+        raise TypeError("the whole dataset must not be sent to workers")
+
+
+def test_process_pool_ships_only_shard_samples(tmp_path):
+    dataset = _dataset()
+    unpicklable = _UnpicklableDataset(*dataset.tensors)
+
+    report = AuditRunner(
+        make_model, unpicklable, str(tmp_path),
+        num_workers=2, shard_size=10, components=["calibration"],
+    ).run()
+
+    assert report["n_audited"] == 50
+
+
+def test_dataset_factory_is_opened_by_workers(tmp_path):
+    kwargs = dict(shard_size=10, components=["calibration"])
+
+    serial = AuditRunner(
+        make_model, _dataset(), str(tmp_path / "serial"),
+        num_workers=0, **kwargs,
+    ).run()
+    pooled = AuditRunner(
+        make_model, _dataset, str(tmp_path / "pool"),
+        num_workers=2, **kwargs,
+    ).run()
+
+    assert pooled["n_samples"] == serial["n_samples"] == 50
+    assert np.isclose(
+        pooled["boundary_vector"]["calibration"]["mean"],
+        serial["boundary_vector"]["calibration"]["mean"],
+    )
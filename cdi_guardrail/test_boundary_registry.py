@@ -0,0 +1,110 @@
+# cdi_guardrail/test_boundary_registry.py
+
+import pytest
+import torch
+import torch.nn as nn
+
+from cdi_guardrail.boundary_vector import (
+    BOUNDARY_COMPONENTS,
+    compute_boundary_vector,
+    reduce_boundary_vector,
+    register_boundary_component,
+)
+from cdi_guardrail.wrapper import CDIGuard
+
+
+class CountingModel(nn.Module):
+    def __init__(self):
+        super().__init__()
+        torch.manual_seed(0)
+        self.net = nn.Sequential(nn.Linear(16, 32), nn.ReLU(), nn.Linear(32, 5))
+        self.calls = 0
+
+    def forward(self, x):
+        self.calls += 1
+        return self.net(x)
+
+
+def _guard():
+    model = CountingModel().eval()
+    return model, CDIGuard(model, activation_layers=["net.1"], fast=True)
+
+
+def test_only_requested_components_are_computed():
+    model, guard = _guard()
+    x = torch.randn(4, 16)
+    y = torch.randint(0, 5, (4,))
+
+    out = guard.forward_detailed(x, y, components=["calibration"])
+
+    assert list(out["boundary_vector"]) == ["calibration"]
+    assert out["skipped_components"] == []
+    # logits only: the single clean forward
+    assert model.calls == 1
+
+
+def test_stability_reuses_clean_forward():
+    model, guard = _guard()
+    x = torch.randn(4, 16)
+    y = torch.randint(0, 5, (4,))
+
+    guard.forward_detailed(x, y, stability_samples=3)
+
+    # 1 clean forward shared by all components + 3 perturbed
+    assert model.calls == 4
+
+
+def test_short_circuit_skips_expensive_components():
+    model, guard = _guard()
+    x = torch.randn(4, 16)
+    y = torch.randint(0, 5, (4,))
+
+    out = guard.forward_detailed(x, y, short_circuit_threshold=0.0)
+
+    assert list(out["boundary_vector"]) == ["calibration"]
+    assert out["skipped_components"] == ["stability"]
+    assert model.calls == 1
+
+
+def test_custom_component_and_subset_reduction():
+    calls = []
+
+    def entropy(ctx):
+        calls.append(ctx.probs())
+        p = ctx.probs()
+        return -(p * p.clamp_min(1e-12).log()).sum(dim=1).mean()
+
+    register_boundary_component("test_entropy", entropy, cost=0.5)
+    try:
+        model = CountingModel().eval()
+        x = torch.randn(4, 16)
+        y = torch.randint(0, 5, (4,))
+        logits = model(x)
+
+        bv = compute_boundary_vector(
+            model=model,
+            x=x,
+            logits=logits,
+            labels=y,
+            components=["stability", "test_entropy", "calibration"],
+        )
+
+        # cheapest first
+        assert list(bv) == ["calibration", "test_entropy", "stability"]
+        assert len(calls) == 1
+
+        sub = reduce_boundary_vector(bv, components=["calibration"])
+        assert torch.allclose(sub, bv["calibration"])
+    finally:
+        BOUNDARY_COMPONENTS.pop("test_entropy")
+
+
+def test_unknown_component_raises():
+    model, guard = _guard()
+
+    with pytest.raises(ValueError):
+        guard.forward_detailed(
+            torch.randn(2, 16),
+            torch.tensor([0, 1]),
+            components=["nope"],
+        )
@@ -0,0 +1,95 @@
+# cdi_guardrail/test_changepoint.py
+
+import numpy as np
+import pytest
+from prometheus_client import generate_latest
+
+from cdi_guardrail import CDILogger, CDIMonitor, CUSUM, PageHinkley, PrometheusCDILogger
+
+
+class RecordingLogger(CDILogger):
+    def __init__(self):
+        super().__init__(service_name="test")
+        self.records = []
+
+    def emit(self, record: dict):
+        self.records.append(record)
+
+
+def _stream(seed=0, n_stable=2000, n_shift=500):
+    rng = np.random.default_rng(seed)
+    stable = np.clip(rng.normal(0.75, 0.05, size=n_stable), 0, 1)
+    shifted = np.clip(rng.normal(0.85, 0.05, size=n_shift), 0, 1)
+    return stable, shifted
+
+
+def _first_alarm(detector, values):
+    for i, v in enumerate(values):
+        if detector.update(v):
+            return i
+    return None
+
+
+def test_page_hinkley_no_false_alarm_then_fast_detection():
+    stable, shifted = _stream()
+    detector = PageHinkley(delta=0.02, threshold=1.0)
+
+    assert _first_alarm(detector, stable) is None
+
+    delay = _first_alarm(detector, shifted)
+    assert delay is not None and delay < 50
+    assert detector.last_event["direction"] == "up"
+
+
+def test_page_hinkley_down_detector_reports_down_when_both_sides_cross():
+    # rise then fall: both statistics are above threshold at the first
+    # allowed alarm, but a down-only detector must report the fall
+    detector = PageHinkley(delta=0.02, threshold=1.0, min_samples=60, direction="down")
+    values = [0.2] * 20 + [0.8] * 20 + [0.2] * 20
+
+    assert any(detector.update(v) for v in values)
+    assert detector.last_event["direction"] == "down"
+    assert detector.last_event["statistic"] == pytest.approx(4.42, abs=0.01)
+
+
+def test_cusum_no_false_alarm_then_fast_detection():
+    stable, shifted = _stream(seed=1)
+    detector = CUSUM(k=0.5, h=10.0, warmup=200)
+
+    assert _first_alarm(detector, stable) is None
+
+    delay = _first_alarm(detector, shifted)
+    assert delay is not None and delay < 50
+    assert detector.last_event["direction"] == "up"
+
+
+def test_cusum_detects_downward_shift_with_known_baseline():
+    rng = np.random.default_rng(2)
+    detector = CUSUM(target_mean=0.75, target_std=0.05, h=5.0)
+
+    delay = _first_alarm(detector, rng.normal(0.65, 0.05, size=200))
+
+    assert delay is not None and delay < 20
+    assert detector.last_event["direction"] == "down"
+
+
+def test_monitor_routes_change_points_to_loggers():
+    stable, shifted = _stream(seed=3)
+    logger = RecordingLogger()
+    prom = PrometheusCDILogger(namespace="cptest")
+
+    monitor = CDIMonitor(
+        window_size=500,
+        detectors=[PageHinkley(delta=0.02, threshold=1.0)],
+        loggers=[logger, prom],
+    )
+
+    for v in np.concatenate([stable, shifted]):
+        monitor.update(v)
+
+    assert monitor.change_points >= 1
+    assert logger.records[0]["event"] == "cdi_change_point"
+    assert logger.records[0]["detector"] == "page_hinkley"
+
+    text = generate_latest().decode("utf-8")
+    assert 'cptest_change_point_total{detector="page_hinkley",direction="up"}' in text
@@ -0,0 +1,74 @@
+# cdi_guardrail/test_checkpointed_pressure.py
+
+import pytest
+import torch
+import torch.nn as nn
+
+from cdi_guardrail import CDIGuard
+
+
+class Block(nn.Module):
+    def __init__(self, dim):
+        super().__init__()
+        self.fc = nn.Linear(dim, dim)
+        self.act = nn.Tanh()
+        self.calls = 0
+
+    def forward(self, x):
+        self.calls += 1
+        return self.act(self.fc(x)) + x
+
+
+def _make_model():
+    torch.manual_seed(0)
+    return nn.Sequential(
+        nn.Linear(12, 24),
+        Block(24),
+        Block(24),
+        nn.Linear(24, 5),
+    ).eval()
+
+
+def _batch(n=10):
+    torch.manual_seed(1)
+    return torch.randn(n, 12), torch.randint(0, 5, (n,))
+
+
+LAYERS = ["0", "1", "2.act"]
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"max_chunk_size": 1},
+        {"max_chunk_size": 3},
+        {"checkpoint_modules": ["1", "2"]},
+        {"checkpoint_modules": ["2"], "max_chunk_size": 4},
+    ],
+)
+def test_bounded_full_mode_matches_full_mode(kwargs):
+    model = _make_model()
+    x, y = _batch()
+
+    reference = CDIGuard(model, activation_layers=LAYERS)
+    bounded = CDIGuard(model, activation_layers=LAYERS, **kwargs)
+
+    pred_ref, cdi_ref, decision_ref = reference.forward_with_cdi(x, y)
+    pred, cdi, decision = bounded.forward_with_cdi(x, y)
+
+    assert torch.equal(pred, pred_ref)
+    assert cdi == pytest.approx(cdi_ref, rel=1e-5)
+    assert decision == decision_ref
+
+
+def test_checkpointed_modules_recompute_and_are_restored():
+    model = _make_model()
+    x, y = _batch()
+    guard = CDIGuard(model, activation_layers=LAYERS, checkpoint_modules=["2"])
+
+    guard.forward_with_cdi(x, y)
+
+    # forward + recomputation in backward
+    assert model[2].calls == 2
+    assert model[1].calls == 1
+    assert "forward" not in model[2].__dict__
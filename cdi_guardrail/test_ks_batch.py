@@ -0,0 +1,54 @@
+# cdi_guardrail/test_ks_batch.py
+
+import numpy as np
+from scipy.stats import ks_2samp
+
+from cdi_guardrail import ReferenceProfile, ks_drift_batch
+
+
+def _reference(seed=0, size=5000):
+    rng = np.random.default_rng(seed)
+    return np.clip(rng.normal(0.75, 0.05, size=size), 0.0, 1.0)
+
+
+def _windows(seed=1, n_windows=30, size=400):
+    rng = np.random.default_rng(seed)
+    locs = np.linspace(0.72, 0.82, n_windows)[:, None]
+    return np.clip(rng.normal(locs, 0.05, size=(n_windows, size)), 0.0, 1.0)
+
+
+def test_batch_matches_scipy_per_window():
+    reference = _reference()
+    windows = _windows()
+
+    out = ks_drift_batch(reference, windows)
+
+    for i, w in enumerate(windows):
+        expected = ks_2samp(reference, w, method="asymp")
+        assert np.isclose(out["statistic"][i], expected.statistic)
+        assert np.isclose(out["p_value"][i], expected.pvalue)
+        assert out["drift"][i] == (expected.pvalue < 0.05)
+
+
+def test_batch_handles_ties_and_ragged_windows():
+    rng = np.random.default_rng(2)
+    reference = rng.integers(0, 20, size=1000) / 20.0
+    windows = [rng.integers(0, 25, size=n) / 25.0 for n in (50, 300, 7)]
+
+    out = ks_drift_batch(ReferenceProfile.from_scores(reference), windows)
+
+    for i, w in enumerate(windows):
+        expected = ks_2samp(reference, w, method="asymp")
+        assert np.isclose(out["statistic"][i], expected.statistic)
+        assert np.isclose(out["p_value"][i], expected.pvalue)
+
+
+def test_batch_process_pool_matches_serial():
+    reference = _reference(3)
+    windows = _windows(4, n_windows=9)
+
+    serial = ks_drift_batch(reference, windows)
+    pooled = ks_drift_batch(reference, windows, n_jobs=3)
+
+    assert np.array_equal(serial["statistic"], pooled["statistic"])
+    assert np.array_equal(serial["p_value"], pooled["p_value"])
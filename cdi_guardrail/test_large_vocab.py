@@ -0,0 +1,67 @@
+# cdi_guardrail/test_large_vocab.py
+
+import torch
+import torch.nn.functional as F
+
+from cdi_guardrail.boundary import expected_calibration_error, max_probability
+from cdi_guardrail.pressure_fast import representation_pressure
+
+
+def _reference_pressure(logits, features, labels):
+    idx = torch.arange(logits.size(0))
+    masked = logits.clone()
+    masked[idx, labels] = torch.finfo(masked.dtype).min
+    margin = logits[idx, labels].float() - masked.max(dim=1).values.float()
+    grad = torch.autograd.grad(-margin.mean(), features)[0]
+    return grad.norm()
+
+
+def _head(n_classes, batch=4, dim=32, seed=0):
+    torch.manual_seed(seed)
+    features = torch.randn(batch, dim, requires_grad=True)
+    weight = torch.randn(n_classes, dim) / dim ** 0.5
+    labels = torch.randint(0, n_classes, (batch,))
+    return features, features @ weight.T, labels
+
+
+def test_topk_pressure_matches_masked_reference():
+    for n_classes in (2, 10, 50_000):
+        features, logits, labels = _head(n_classes)
+        # make one label the arg-max so both top-k branches are used
+        labels[0] = logits[0].argmax()
+
+        expected = _reference_pressure(logits, features, labels)
+        features2, logits2, _ = _head(n_classes)
+        got = representation_pressure(logits2, features2, labels)
+
+        assert torch.allclose(got, expected, rtol=1e-5)
+
+
+def test_logsumexp_confidence_matches_softmax():
+    torch.manual_seed(0)
+    logits = torch.randn(8, 100_000) * 4.0
+    labels = torch.randint(0, 100_000, (8,))
+
+    conf, pred = max_probability(logits)
+    ref_conf, ref_pred = F.softmax(logits, dim=1).max(dim=1)
+
+    assert torch.equal(pred, ref_pred)
+    assert torch.allclose(conf, ref_conf, rtol=1e-5)
+
+    probs = F.softmax(logits, dim=1)
+    assert torch.allclose(
+        expected_calibration_error(logits, labels),
+        expected_calibration_error(logits, labels, probs=probs),
+        atol=1e-6,
+    )
+
+
+def test_bf16_logits():
+    torch.manual_seed(0)
+    logits = (torch.randn(4, 1000) * 3.0).bfloat16()
+
+    conf, _ = max_probability(logits)
+    ref_conf, _ = F.softmax(logits.float(), dim=1).max(dim=1)
+
+    assert conf.dtype == torch.float32
+    assert torch.allclose(conf, ref_conf, rtol=1e-5)
@@ -0,0 +1,131 @@
+# cdi_guardrail/test_layer_pressure.py
+
+import pytest
+import torch
+import torch.nn as nn
+from prometheus_client import generate_latest
+
+from cdi_guardrail import CDIGuard, CDILogger, PrometheusCDILogger, pressure
+
+
+class RecordingLogger(CDILogger):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+def _make_model():
+    torch.manual_seed(0)
+    return nn.Sequential(
+        nn.Linear(12, 24),
+        nn.ReLU(),
+        nn.Linear(24, 24),
+        nn.ReLU(),
+        nn.Linear(24, 5),
+    ).eval()
+
+
+def _batch():
+    torch.manual_seed(1)
+    return torch.randn(6, 12), torch.randint(0, 5, (6,))
+
+
+LAYERS = ["0", "2", "4"]
+
+
+def _reference_layer_norms(model, x, y):
+    acts = {}
+
+    def make_hook(name):
+        def hook(module, inp, out):
+            out.retain_grad()
+            acts[name] = out
+
+        return hook
+
+    handles = [model[int(n)].register_forward_hook(make_hook(n)) for n in LAYERS]
+    loss = nn.functional.cross_entropy(model(x), y)
+    loss.backward()
+    for h in handles:
+        h.remove()
+    model.zero_grad()
+    return {n: acts[n].grad.norm().item() for n in LAYERS}
+
+
+def test_layer_pressure_from_same_backward():
+    model = _make_model()
+    x, y = _batch()
+    guard = CDIGuard(model, activation_layers=LAYERS)
+
+    guard.forward_with_cdi(x, y)
+    expected = _reference_layer_norms(model, x, y)
+
+    assert guard.layer_names == LAYERS
+    assert torch.is_tensor(guard.layer_pressure)
+    assert guard.layer_pressure.shape == (len(LAYERS),)
+    assert not guard.layer_pressure.requires_grad
+
+    assert list(guard.last_layer_pressure) == LAYERS
+    for name in LAYERS:
+        assert guard.last_layer_pressure[name] == pytest.approx(expected[name], rel=1e-5)
+
+    guard.forward_with_cdi(x, y, fast=True)
+    assert guard.last_layer_pressure is None
+    assert guard.layer_pressure is None
+
+
+def test_chunked_layer_pressure_matches():
+    model = _make_model()
+    x, y = _batch()
+
+    full = CDIGuard(model, activation_layers=LAYERS)
+    chunked = CDIGuard(model, activation_layers=LAYERS, max_chunk_size=4)
+    full.forward_with_cdi(x, y)
+    chunked.forward_with_cdi(x, y)
+
+    for name in LAYERS:
+        assert chunked.last_layer_pressure[name] == pytest.approx(
+            full.last_layer_pressure[name], rel=1e-5
+        )
+
+
+def test_foreach_norm_without_dtype_argument(monkeypatch):
+    model = _make_model()
+    x, y = _batch()
+    _, expected, _ = CDIGuard(model, activation_layers=LAYERS).forward_with_cdi(x, y)
+
+    foreach_norm = torch._foreach_norm
+
+    def old_foreach_norm(tensors, ord=2, **kwargs):
+        if kwargs:
+            raise TypeError("_foreach_norm() got an unexpected keyword argument 'dtype'")
+        return foreach_norm(tensors, ord)
+
+    monkeypatch.setattr(torch, "_foreach_norm", old_foreach_norm)
+    monkeypatch.setattr(pressure, "_FOREACH_NORM_DTYPE", True)
+
+    guard = CDIGuard(model, activation_layers=LAYERS)
+    _, cdi, _ = guard.forward_with_cdi(x, y)
+
+    assert pressure._FOREACH_NORM_DTYPE is False
+    assert cdi == pytest.approx(expected, rel=1e-6)
+
+
+def test_layer_pressure_export():
+    model = _make_model()
+    x, y = _batch()
+    guard = CDIGuard(model, activation_layers=LAYERS)
+    guard.forward_with_cdi(x, y)
+
+    logger = RecordingLogger()
+    logger.log_layer_pressure(guard.last_layer_pressure)
+    assert logger.records[0]["event"] == "cdi_layer_pressure"
+    assert set(logger.records[0]["layers"]) == set(LAYERS)
+
+    prom = PrometheusCDILogger(namespace="layertest")
+    prom.log_layer_pressure(guard.last_layer_pressure)
+    text = generate_latest().decode("utf-8")
+    assert 'layertest_layer_pressure{layer="2"}' in text
@@ -0,0 +1,74 @@
+# cdi_guardrail/test_lazy_import.py
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import cdi_guardrail
+
+
+PACKAGE_ROOT = Path(cdi_guardrail.__file__).resolve().parents[1]
+
+
+def _run(code):
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        p for p in (str(PACKAGE_ROOT), env.get("PYTHONPATH")) if p
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        check=True,
+        capture_output=True,
+        text=True,
+        cwd=PACKAGE_ROOT,
+        env=env,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def test_numpy_only_consumers_skip_heavy_imports():
+    result = _run(
+        "import json, sys\n"
+        "import numpy as np\n"
+        "import cdi_guardrail\n"
+        "from cdi_guardrail import (CDIMonitor, CDIPolicy, CDICalibrator,\n"
+        "    SegmentedCDIMonitor, ReferenceProfile, population_stability_index,\n"
+        "    population_stability_index_batch, PageHinkley)\n"
+        "from cdi_guardrail.statistics import zscore, bootstrap_ci\n"
+        "m = CDIMonitor(detectors=[PageHinkley()])\n"
+        "for v in np.linspace(0.6, 0.8, 200):\n"
+        "    m.update(v)\n"
+        "m.summary()\n"
+        "population_stability_index(np.linspace(0, 1, 50), np.linspace(0.2, 1, 50))\n"
+        "zscore(0.7, np.linspace(0, 1, 50))\n"
+        "CDIPolicy(0.5, 0.9).decide(0.7)\n"
+        "print(json.dumps({\n"
+        "    'loaded': [n for n in ('torch', 'scipy', 'prometheus_client')\n"
+        "               if n in sys.modules]}))\n"
+    )
+
+    assert result["loaded"] == []
+
+
+def test_heavy_attributes_still_resolve():
+    result = _run(
+        "import json, sys\n"
+        "from cdi_guardrail import CDIGuard, ks_drift\n"
+        "ks_drift([0.1, 0.2, 0.3], [0.4, 0.5, 0.6])\n"
+        "print(json.dumps({'torch': 'torch' in sys.modules,\n"
+        "                  'scipy_after': 'scipy' in sys.modules}))\n"
+    )
+
+    assert result["torch"] is True
+    assert result["scipy_after"] is True
+
+
+def test_dir_and_unknown_attribute():
+    assert set(cdi_guardrail.__all__) <= set(dir(cdi_guardrail))
+
+    with pytest.raises(AttributeError):
+        cdi_guardrail.not_a_thing
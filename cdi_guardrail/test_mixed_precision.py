@@ -0,0 +1,113 @@
+# cdi_guardrail/test_mixed_precision.py
+
+import numpy as np
+import torch
+import torch.nn as nn
+from scipy.stats import spearmanr
+
+from cdi_guardrail.pressure_fast import representation_pressure
+from cdi_guardrail.wrapper import CDIGuard
+
+
+def _make_model():
+    torch.manual_seed(0)
+    return nn.Sequential(
+        nn.Linear(32, 64),
+        nn.ReLU(),
+        nn.Linear(64, 64),
+        nn.ReLU(),
+        nn.Linear(64, 10),
+    ).eval()
+
+
+def _collect(guard, xs, ys):
+    return np.array([
+        guard.forward_with_cdi(x, y)[1]
+        for x, y in zip(xs, ys)
+    ])
+
+
+def _inputs(n=40):
+    torch.manual_seed(1)
+    xs = [torch.randn(1, 32) * 3.0 for _ in range(n)]
+    ys = [torch.randint(0, 10, (1,)) for _ in range(n)]
+    return xs, ys
+
+
+def test_bf16_fast_ranking_matches_fp32():
+    """
+    Fast-mode CDI under bf16 autocast must preserve
+    the fp32 ranking within tolerance.
+    """
+    model = _make_model()
+    xs, ys = _inputs()
+
+    ref = CDIGuard(model, activation_layers=["3"], fast=True)
+    amp = CDIGuard(
+        model,
+        activation_layers=["3"],
+        fast=True,
+        autocast_dtype=torch.bfloat16,
+    )
+
+    s_ref = _collect(ref, xs, ys)
+    s_amp = _collect(amp, xs, ys)
+
+    rho, _ = spearmanr(s_ref, s_amp)
+
+    assert np.all(np.isfinite(s_amp))
+    assert rho > 0.9
+    assert np.abs(s_ref - s_amp).max() < 0.05
+
+
+def test_bf16_full_ranking_matches_fp32():
+    model = _make_model()
+    xs, ys = _inputs()
+
+    ref = CDIGuard(model, activation_layers=["1", "3"], fast=False)
+    amp = CDIGuard(
+        model,
+        activation_layers=["1", "3"],
+        fast=False,
+        autocast_dtype=torch.bfloat16,
+    )
+
+    s_ref = _collect(ref, xs, ys)
+    s_amp = _collect(amp, xs, ys)
+
+    rho, _ = spearmanr(s_ref, s_amp)
+
+    assert np.all(np.isfinite(s_amp))
+    assert rho > 0.9
+    assert np.abs(s_ref - s_amp).max() < 0.05
+
+
+def test_fp16_representation_pressure_is_finite():
+    """
+    Label masking must not overflow half precision.
+    """
+    features = torch.randn(4, 8, dtype=torch.float16, requires_grad=True)
+    weight = torch.randn(8, 5, dtype=torch.float16) * 100.0
+    logits = features @ weight
+    labels = torch.tensor([0, 1, 2, 3])
+
+    p = representation_pressure(logits, features, labels)
+
+    assert p.dtype == torch.float32
+    assert torch.isfinite(p)
+
+
+def test_bf16_forward_detailed():
+    model = _make_model()
+    guard = CDIGuard(
+        model,
+        activation_layers=["3"],
+        fast=True,
+        autocast_dtype=torch.bfloat16,
+    )
+
+    out = guard.forward_detailed(torch.randn(8, 32), torch.randint(0, 10, (8,)))
+
+    for v in out["boundary_vector"].values():
+        assert v.dtype == torch.float32
+        assert torch.isfinite(v)
@@ -0,0 +1,96 @@
+# cdi_guardrail/test_noise_bank.py
+
+import torch
+import torch.nn as nn
+from torch.utils.data import TensorDataset
+
+from cdi_guardrail.audit import AuditRunner
+from cdi_guardrail.noise_bank import NoiseBank
+from cdi_guardrail.wrapper import CDIGuard
+
+
+def make_model():
+    torch.manual_seed(0)
+    return nn.Sequential(nn.Linear(8, 16), nn.ReLU(), nn.Linear(16, 3)).eval()
+
+
+def _dataset(n=20):
+    g = torch.Generator().manual_seed(0)
+    return TensorDataset(
+        torch.randn(n, 8, generator=g),
+        torch.randint(0, 3, (n,), generator=g),
+    )
+
+
+def test_noise_bank_is_seeded_and_cached():
+    a = NoiseBank(n_samples=4, seed=7)
+    b = NoiseBank(n_samples=4, seed=7)
+
+    na = a.get((3, 5))
+    assert torch.equal(na, b.get((3, 5)))
+    assert na.shape == (4, 3, 5)
+
+    assert a.get((3, 5)) is na
+    assert a.hits == 1 and a.misses == 1
+
+    assert not torch.equal(na, NoiseBank(n_samples=4, seed=8).get((3, 5)))
+
+
+def test_noise_bank_evicts_least_recently_used():
+    # one float32 [1, 10] entry is 40 bytes
+    bank = NoiseBank(n_samples=1, max_bytes=100)
+
+    bank.get((10,))
+    bank.get((11,))
+    bank.get((10,))
+    bank.get((12,))
+
+    assert bank.evictions == 1
+    assert bank.nbytes <= 100
+    assert bank.summary()["entries"] == 2
+    # (11,) was least recently used
+    bank.get((10,))
+    assert bank.misses == 3
+
+
+def test_forward_detailed_is_reproducible_with_noise_bank():
+    torch.manual_seed(0)
+    model = nn.Sequential(nn.Linear(8, 16), nn.Tanh(), nn.Linear(16, 4)).eval()
+    guard = CDIGuard(model)
+
+    x = torch.randn(6, 8)
+    y = torch.randint(0, 4, (6,))
+
+    kwargs = dict(stability_eps=0.1, stability_samples=3)
+
+    out_a = guard.forward_detailed(
+        x, y, noise_bank=NoiseBank(n_samples=3, seed=123), **kwargs
+    )
+    torch.manual_seed(999)
+    out_b = guard.forward_detailed(
+        x, y, noise_bank=NoiseBank(n_samples=3, seed=123), **kwargs
+    )
+
+    assert out_a["noise_seed"] == 123
+    assert torch.equal(
+        out_a["boundary_vector"]["stability"],
+        out_b["boundary_vector"]["stability"],
+    )
+
+
+def test_audit_runner_records_noise_seed(tmp_path):
+    reports = [
+        AuditRunner(
+            make_model,
+            _dataset(),
+            str(tmp_path / str(i)),
+            num_workers=0,
+            shard_size=8,
+            noise_seed=5,
+            detailed_kwargs={"stability_eps": 0.1},
+        ).run()
+        for i in range(2)
+    ]
+
+    assert reports[0]["noise_seed"] == 5
+    assert reports[0] == reports[1]
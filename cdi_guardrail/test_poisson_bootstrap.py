@@ -0,0 +1,139 @@
+# cdi_guardrail/test_poisson_bootstrap.py
+
+import numpy as np
+import pytest
+from prometheus_client import generate_latest
+
+from cdi_guardrail import (
+    CDIMonitor,
+    PoissonBootstrap,
+    PrometheusCDILogger,
+    load_snapshot,
+    save_snapshot,
+)
+from cdi_guardrail.statistics import bootstrap_ci
+
+
+def _values(seed=0, size=4000, loc=0.7):
+    rng = np.random.default_rng(seed)
+    return np.clip(rng.normal(loc, 0.08, size=size), 0.0, 1.0)
+
+
+def test_bounds_match_offline_bootstrap():
+    values = _values()
+    boot = PoissonBootstrap(n_replicas=400, seed=0)
+    for chunk in np.array_split(values, 7):
+        boot.update_many(chunk)
+
+    bounds = boot.interval()
+    offline = bootstrap_ci(values, n_bootstrap=400, random_state=0)
+    half_width = (offline["upper"] - offline["lower"]) / 2
+
+    assert bounds["mean_lower"] < values.mean() < bounds["mean_upper"]
+    assert bounds["mean_lower"] == pytest.approx(offline["lower"], abs=half_width / 2)
+    assert bounds["mean_upper"] == pytest.approx(offline["upper"], abs=half_width / 2)
+
+    p95 = np.percentile(values, 95)
+    assert bounds["p95_lower"] - 0.01 < p95 < bounds["p95_upper"] + 0.01
+
+
+def test_windowed_bootstrap_follows_shift():
+    boot = PoissonBootstrap(n_replicas=100, window=500, seed=1)
+    boot.update_many(_values(1, 5000, loc=0.5))
+    boot.update_many(_values(2, 5000, loc=0.8))
+
+    bounds = boot.interval()
+    assert 0.75 < bounds["mean_lower"] < bounds["mean_upper"] < 0.85
+
+
+def test_monitor_summary_and_export(tmp_path):
+    monitor = CDIMonitor(
+        window_size=1000,
+        bootstrap=PoissonBootstrap(window=1000, seed=0),
+    )
+    values = _values(3, 3000)
+    monitor.update_many(values[:2000])
+    for v in values[2000:2100]:
+        monitor.update(v)
+
+    summary = monitor.summary()
+    assert summary["count"] == 1000
+    assert summary["mean_lower"] < summary["mean"] < summary["mean_upper"]
+
+    prom = PrometheusCDILogger(namespace="boottest")
+    prom.log_monitor_summary(summary)
+    text = generate_latest().decode("utf-8")
+    assert "boottest_cdi_mean_lower" in text
+    assert "boottest_cdi_p95_upper" in text
+
+    path = str(tmp_path / "state.snap")
+    save_snapshot(path, {"monitor": monitor})
+    restored = load_snapshot(path)["monitor"]
+    assert restored.summary() == summary
+
+
+def _mixed_updates(boot, seed):
+    values = _values(seed, 3000, loc=0.4)
+    boot.update_many(values[:1000])
+    for v in values[1000:1500]:
+        boot.update(v)
+    boot.interval()
+    boot.update_many(_values(seed + 1, 1500, loc=0.8))
+    for v in values[1500:1700]:
+        boot.update(v)
+
+
+def test_lazy_decay_matches_frequent_renormalization():
+    lazy = PoissonBootstrap(window=300, seed=5)
+    eager = PoissonBootstrap(window=300, seed=5)
+    # renormalize every few hundred values; batches still fit one chunk
+    eager._MAX_INFLATE = 1e3
+
+    _mixed_updates(lazy, 5)
+    _mixed_updates(eager, 5)
+
+    assert eager._inflate < lazy._inflate
+    for key, value in lazy.interval().items():
+        assert eager.interval()[key] == pytest.approx(value, rel=1e-9)
+
+
+def test_incremental_p95_matches_full_scan():
+    boot = PoissonBootstrap(window=500, seed=6)
+    _mixed_updates(boot, 6)
+    _, p95 = boot.replicas()
+
+    # reference: first bin whose cumulative weight reaches 95%
+    hist = boot._hist
+    cum = np.cumsum(hist, axis=1)
+    rank = 0.95 * boot._weights
+    idx = np.minimum((cum < rank[:, None]).sum(axis=1), boot.n_bins - 1)
+    rows = np.arange(boot.n_replicas)
+    here = hist[rows, idx]
+    within = np.clip((rank - (cum[rows, idx] - here)) / here, 0.0, 1.0)
+    expected = (idx + within) / boot.n_bins
+
+    assert np.array_equal(boot._p_idx, idx)
+    assert np.allclose(p95, expected, rtol=1e-9)
+
+
+def test_restored_bootstrap_continues_the_poisson_stream(tmp_path):
+    monitor = CDIMonitor(
+        window_size=500,
+        bootstrap=PoissonBootstrap(window=500, seed=7),
+    )
+    values = _values(7, 1100)
+    monitor.update_many(values[:1000])
+    for v in values[1000:]:
+        monitor.update(v)
+
+    path = str(tmp_path / "state.snap")
+    save_snapshot(path, {"monitor": monitor})
+    restored = load_snapshot(path)["monitor"]
+
+    tail = _values(9, 700, loc=0.6)
+    for m in (monitor, restored):
+        m.update_many(tail[:300])
+        for v in tail[300:]:
+            m.update(v)
+
+    assert restored.summary() == monitor.summary()
@@ -0,0 +1,108 @@
+# cdi_guardrail/test_policy_simulator.py
+
+import numpy as np
+import pytest
+
+from cdi_guardrail import CDIPolicy, select_thresholds, simulate_policies
+
+
+def _history(n=5000, seed=0):
+    rng = np.random.default_rng(seed)
+    bad = rng.random(n) < 0.1
+    scores = np.clip(
+        np.where(bad, rng.normal(0.8, 0.08, n), rng.normal(0.5, 0.1, n)),
+        0.0,
+        1.0,
+    )
+    return scores, bad
+
+
+def test_grid_matches_policy_decisions():
+    scores, bad = _history()
+    warn = np.array([0.4, 0.6, 0.7])
+    reject = np.array([0.65, 0.8, 0.9])
+
+    sim = simulate_policies(scores, warn, reject, outcomes=bad)
+
+    for i, w in enumerate(warn):
+        for j, r in enumerate(reject):
+            if not w < r:
+                assert not sim["valid"][i, j]
+                assert np.isnan(sim["reject_rate"][i, j])
+                continue
+
+            policy = CDIPolicy(w, r)
+            decisions = np.array([policy.decide(s) for s in scores])
+            flagged = decisions != "accept"
+
+            assert sim["accept_rate"][i, j] == pytest.approx(np.mean(~flagged))
+            assert sim["warn_rate"][i, j] == pytest.approx(np.mean(decisions == "warn"))
+            assert sim["reject_rate"][i, j] == pytest.approx(np.mean(decisions == "reject"))
+            assert sim["flag_precision"][i, j] == pytest.approx(bad[flagged].mean())
+            assert sim["flag_recall"][i, j] == pytest.approx(flagged[bad].mean())
+            assert sim["reject_recall"][i, j] == pytest.approx(
+                (decisions == "reject")[bad].mean()
+            )
+
+
+def test_select_under_rate_constraints():
+    scores, bad = _history()
+    sim = simulate_policies(scores, outcomes=bad, n_grid=200)
+
+    best = select_thresholds(sim, max_reject_rate=0.02, max_flag_rate=0.15)
+
+    assert best["warn_threshold"] < best["reject_threshold"]
+    assert best["reject_rate"] <= 0.02
+    assert best["flag_rate"] <= 0.15
+    # the flagged tail is mostly bad traffic
+    assert best["flag_recall"] > 0.8
+
+    with pytest.raises(ValueError):
+        select_thresholds(sim, max_flag_rate=0.0)
+
+
+def test_without_outcomes():
+    scores, _ = _history()
+    sim = simulate_policies(scores)
+
+    assert "flag_precision" not in sim
+    best = select_thresholds(sim, max_flag_rate=0.1)
+    assert best["flag_rate"] <= 0.1
+    with pytest.raises(ValueError):
+        select_thresholds(sim, min_precision=0.5)
+
+
+def test_select_skips_pairs_without_flags():
+    scores, bad = _history()
+    scores = np.minimum(scores, 0.9)
+    # thresholds above every score flag nothing: precision is NaN there
+    warn = np.array([0.6, 0.95, 0.96])
+    reject = np.array([0.8, 0.97, 0.98])
+
+    sim = simulate_policies(scores, warn, reject, outcomes=bad)
+    assert np.isnan(sim["reject_precision"]).any()
+
+    selected = select_thresholds(sim, objective="reject_precision")
+    assert np.isfinite(selected["reject_precision"])
+    CDIPolicy(selected["warn_threshold"], selected["reject_threshold"])
+
+
+def test_thresholds_stay_inside_unit_interval():
+    scores, bad = _history()
+    sim = simulate_policies(
+        scores,
+        warn_thresholds=[0.0, 0.5, 0.7],
+        reject_thresholds=[0.8, 1.0, 2.0],
+        outcomes=bad,
+    )
+
+    assert not sim["valid"][0].any()
+    assert not sim["valid"][:, 1:].any()
+
+    selected = select_thresholds(sim)
+    assert 0.0 < selected["warn_threshold"] < selected["reject_threshold"] < 1.0
+
+    # saturated scores: default grid quantiles at 1.0 are dropped
+    saturated = np.concatenate([scores, np.ones(scores.size // 2)])
+    grid = simulate_policies(saturated, n_grid=20)
+    assert grid["reject_threshold"].max() < 1.0
@@ -0,0 +1,103 @@
+# cdi_guardrail/test_psi_binning.py
+
+import numpy as np
+import pytest
+
+from cdi_guardrail import (
+    ReferenceProfile,
+    population_stability_index,
+    population_stability_index_batch,
+)
+
+
+def _scores(seed, loc=0.75, scale=0.01, size=2000):
+    rng = np.random.default_rng(seed)
+    return np.clip(rng.normal(loc, scale, size=size), 0.0, 1.0)
+
+
+def test_uniform_binning_unchanged():
+    ref, cur = _scores(0, scale=0.2), _scores(1, loc=0.6, scale=0.2)
+
+    bins = np.linspace(0, 1, 11)
+    ref_pct = np.histogram(ref, bins)[0] / ref.size
+    cur_pct = np.histogram(cur, bins)[0] / cur.size
+    eps = 1e-6
+    expected = np.sum((cur_pct - ref_pct) * np.log((cur_pct + eps) / (ref_pct + eps)))
+
+    assert np.isclose(population_stability_index(ref, cur), expected)
+
+
+def test_quantile_binning_populates_all_bins():
+    ref = _scores(2)
+    profile = ReferenceProfile.from_scores(ref, n_bins=10, binning="quantile")
+
+    assert profile.hist.size == 10
+    assert profile.hist.min() >= ref.size // 10 - 1
+
+    # uniform bins put the whole narrow band into one or two bins
+    uniform = ReferenceProfile.from_scores(ref, n_bins=10)
+    assert np.count_nonzero(uniform.hist) <= 2
+
+
+def test_quantile_binning_detects_small_shift_uniform_misses():
+    ref = _scores(3)
+    shifted = _scores(4, loc=0.755)
+
+    psi_uniform = population_stability_index(ref, shifted)
+    psi_quantile = population_stability_index(ref, shifted, binning="quantile")
+
+    assert psi_uniform < 0.05
+    assert psi_quantile > 0.1
+
+
+def test_profile_reuses_quantile_edges():
+    ref = _scores(5)
+    profile = ReferenceProfile.from_scores(ref, binning="quantile")
+    cur = _scores(6, loc=0.752)
+
+    assert np.isclose(
+        population_stability_index(profile, cur),
+        population_stability_index(ref, cur, binning="quantile"),
+    )
+
+
+def test_batch_matches_per_window():
+    ref = _scores(7)
+    profile = ReferenceProfile.from_scores(ref, binning="quantile")
+
+    rng = np.random.default_rng(8)
+    windows = np.clip(
+        rng.normal(np.linspace(0.74, 0.77, 24)[:, None], 0.01, size=(24, 500)),
+        0.0,
+        1.0,
+    )
+
+    batch = population_stability_index_batch(profile, windows)
+
+    assert batch.shape == (24,)
+    for w, value in zip(windows, batch):
+        assert np.isclose(value, population_stability_index(profile, w))
+
+    uniform = population_stability_index_batch(ref, windows, binning="uniform")
+    for w, value in zip(windows, uniform):
+        assert np.isclose(value, population_stability_index(ref, w))
+
+
+def test_batch_ignores_nan_padding():
+    ref = _scores(9)
+    short = _scores(10, size=300)
+    windows = np.full((2, 500), np.nan)
+    windows[0] = _scores(11, size=500)
+    windows[1, :300] = short
+
+    batch = population_stability_index_batch(ref, windows, binning="quantile")
+
+    assert np.isclose(
+        batch[1],
+        population_stability_index(ref, short, binning="quantile"),
+    )
+
+
+def test_batch_requires_2d():
+    with pytest.raises(ValueError):
+        population_stability_index_batch(_scores(12), _scores(13))
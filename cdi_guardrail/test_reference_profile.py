@@ -0,0 +1,77 @@
+# cdi_guardrail/test_reference_profile.py
+
+import numpy as np
+from scipy.stats import ks_2samp
+
+from cdi_guardrail import CDISketch, ReferenceProfile, ks_drift, population_stability_index
+from cdi_guardrail.statistics import zscore
+
+
+def _scores(seed, loc=0.75, size=3000):
+    rng = np.random.default_rng(seed)
+    return np.clip(rng.normal(loc, 0.05, size=size), 0.0, 1.0)
+
+
+def test_profile_matches_array_paths():
+    reference = _scores(0)
+    profile = ReferenceProfile.from_scores(reference)
+
+    for current in (_scores(1), _scores(2, loc=0.8, size=500), reference[:10]):
+        expected = ks_2samp(reference, current, method="asymp")
+        got = ks_drift(profile, current)
+
+        assert np.isclose(got["statistic"], expected.statistic)
+        assert np.isclose(got["p_value"], expected.pvalue)
+
+        assert np.isclose(
+            population_stability_index(profile, current),
+            population_stability_index(reference, current),
+        )
+
+    assert np.isclose(zscore(0.9, profile), zscore(0.9, reference))
+
+
+def test_profile_with_ties_matches_scipy():
+    rng = np.random.default_rng(3)
+    reference = rng.integers(0, 10, size=400) / 10.0
+    current = rng.integers(2, 12, size=300) / 12.0
+
+    got = ks_drift(ReferenceProfile.from_scores(reference), current)
+
+    assert np.isclose(got["statistic"], ks_2samp(reference, current).statistic)
+
+
+def test_profile_psi_with_other_bin_count():
+    reference = _scores(4)
+    current = _scores(5, loc=0.8)
+    profile = ReferenceProfile.from_scores(reference, n_bins=10)
+
+    assert np.isclose(
+        population_stability_index(profile, current, n_bins=20),
+        population_stability_index(reference, current, n_bins=20),
+    )
+
+
+def test_profile_against_sketch():
+    reference = _scores(6)
+    sketch = CDISketch()
+    sketch.update_many(_scores(7, loc=0.85))
+
+    assert ks_drift(ReferenceProfile.from_scores(reference), sketch)["drift"] is True
+
+
+def test_profile_save_and_mmap_load(tmp_path):
+    profile = ReferenceProfile.from_scores(_scores(8))
+    path = str(tmp_path / "reference.cdiref")
+
+    profile.save(path)
+    loaded = ReferenceProfile.load(path)
+
+    assert isinstance(loaded.sorted_values, np.memmap)
+    assert np.array_equal(loaded.sorted_values, profile.sorted_values)
+    assert np.array_equal(loaded.hist, profile.hist)
+    assert loaded.mean == profile.mean
+    assert loaded.std == profile.std
+
+    current = _scores(9)
+    assert ks_drift(loaded, current) == ks_drift(profile, current)
@@ -0,0 +1,81 @@
+# cdi_guardrail/test_result_cache.py
+
+import torch
+import torch.nn as nn
+
+from cdi_guardrail import CachedCDIGuard, CDIGuard, CDIPolicy
+
+
+def _make_guard():
+    torch.manual_seed(0)
+    model = nn.Sequential(
+        nn.Linear(8, 16),
+        nn.ReLU(),
+        nn.Linear(16, 3),
+    ).eval()
+    return CDIGuard(model, activation_layers=["1"])
+
+
+def _input(seed):
+    torch.manual_seed(seed)
+    return torch.randn(1, 8), torch.randint(0, 3, (1,))
+
+
+def test_repeated_inputs_hit():
+    guard = _make_guard()
+    cached = CachedCDIGuard(guard)
+    x, y = _input(0)
+
+    first = cached.forward_with_cdi(x, y)
+    second = cached.forward_with_cdi(x.clone(), y.clone())
+
+    assert second[1] == first[1] == guard.forward_with_cdi(x, y)[1]
+    assert second[2] == first[2]
+    assert cached.summary()["hits"] == 1
+    assert cached.summary()["misses"] == 1
+
+    # same bytes, different label -> different entry
+    cached.forward_with_cdi(x, (y + 1) % 3)
+    assert cached.summary()["misses"] == 2
+
+
+def test_lru_eviction_and_ttl():
+    cached = CachedCDIGuard(_make_guard(), max_entries=2)
+    inputs = [_input(s) for s in range(3)]
+
+    for x, y in inputs:
+        cached.forward_with_cdi(x, y)
+    assert cached.summary()["evictions"] == 1
+    assert cached.summary()["entries"] == 2
+
+    cached.forward_with_cdi(*inputs[0])
+    assert cached.summary()["misses"] == 4
+
+    expiring = CachedCDIGuard(_make_guard(), ttl_s=1e-9)
+    expiring.forward_with_cdi(*inputs[0])
+    expiring.forward_with_cdi(*inputs[0])
+    assert expiring.summary()["expirations"] == 1
+    assert expiring.summary()["hits"] == 0
+
+
+def test_invalidates_on_policy_and_weight_changes():
+    guard = _make_guard()
+    cached = CachedCDIGuard(guard)
+    x, y = _input(0)
+
+    cached.forward_with_cdi(x, y)
+    guard.policy = CDIPolicy(0.01, 0.02)
+    assert cached.forward_with_cdi(x, y)[2] == "reject"
+    assert cached.summary()["invalidations"] == 1
+
+    before = cached.forward_with_cdi(x, y)[1]
+    with torch.no_grad():
+        guard.model[2].weight.mul_(3.0)
+    after = cached.forward_with_cdi(x, y)[1]
+
+    assert after != before
+    assert cached.summary()["invalidations"] == 2
+
+    cached.version = "v2"
+    cached.forward_with_cdi(x, y)
+    assert cached.summary()["invalidations"] == 3
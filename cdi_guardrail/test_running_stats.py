@@ -0,0 +1,81 @@
+# cdi_guardrail/test_running_stats.py
+
+import numpy as np
+import pytest
+
+from cdi_guardrail import CDISketch, ReferenceStats, RunningStats
+from cdi_guardrail.statistics import MAD_SCALE, zscore
+
+
+def _values(seed=0, size=20_000):
+    rng = np.random.default_rng(seed)
+    return np.clip(rng.normal(0.7, 0.08, size=size), 0.0, 1.0)
+
+
+def test_welford_matches_numpy():
+    values = _values()
+
+    single = RunningStats()
+    for v in values[:500]:
+        single.update(v)
+    single.update_many(values[500:])
+
+    assert single.count == values.size
+    assert single.mean == pytest.approx(values.mean(), rel=1e-12)
+    assert single.std == pytest.approx(values.std(), rel=1e-10)
+
+    # merging per-worker stats equals one stream
+    a, b = RunningStats(), RunningStats()
+    a.update_many(values[:7000])
+    b.update_many(values[7000:])
+    merged = a.merge(b)
+    assert merged.mean == pytest.approx(values.mean(), rel=1e-12)
+    assert merged.std == pytest.approx(values.std(), rel=1e-10)
+
+
+def test_zscore_batch_matches_scalar_zscore():
+    values = _values()
+    current = np.array([0.3, 0.7, 0.95])
+
+    stats = RunningStats()
+    stats.update_many(values)
+    frozen = stats.freeze()
+
+    expected = [zscore(v, values) for v in current]
+    assert np.allclose(stats.zscore_batch(current), expected)
+    assert np.allclose(frozen.zscore_batch(current), expected)
+    assert frozen.zscore(current[0]) == pytest.approx(expected[0])
+    assert zscore(current[0], frozen) == pytest.approx(expected[0])
+
+    # frozen reference does not follow later updates
+    stats.update_many(current)
+    assert frozen.count == values.size
+
+
+def test_robust_zscore_from_sketch():
+    values = _values()
+    values[:200] = 0.0  # outliers barely move median / MAD
+
+    exact = ReferenceStats.from_values(values)
+    binned = ReferenceStats.from_sketch(_sketch_of(values))
+
+    assert binned.median == pytest.approx(exact.median, abs=1 / 1000)
+    assert binned.mad == pytest.approx(exact.mad, abs=1 / 1000)
+
+    z = exact.zscore_batch([0.9], robust=True)[0]
+    assert z == pytest.approx((0.9 - exact.median) / (MAD_SCALE * exact.mad))
+
+    stats = RunningStats(sketch=CDISketch(n_bins=1000))
+    stats.update_many(values)
+    assert stats.freeze().median == pytest.approx(binned.median)
+
+    with pytest.raises(ValueError):
+        RunningStats().freeze()
+    with pytest.raises(ValueError):
+        ReferenceStats.from_values(values, robust=False).zscore(0.5, robust=True)
+
+
+def _sketch_of(values):
+    sketch = CDISketch(n_bins=1000)
+    sketch.update_many(values)
+    return sketch
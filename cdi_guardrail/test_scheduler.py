@@ -0,0 +1,128 @@
+# cdi_guardrail/test_scheduler.py
+
+import pytest
+import torch
+import torch.nn as nn
+
+from cdi_guardrail import CDIGuard, CDIPolicy, TieredCDIScorer
+
+
+def _make_model():
+    torch.manual_seed(0)
+    return nn.Sequential(
+        nn.Linear(16, 32),
+        nn.ReLU(),
+        nn.Linear(32, 32),
+        nn.ReLU(),
+        nn.Linear(32, 4),
+    ).eval()
+
+
+def _inputs(n=30):
+    torch.manual_seed(1)
+    return [(torch.randn(1, 16) * 2.0, torch.randint(0, 4, (1,))) for _ in range(n)]
+
+
+def _guard():
+    return CDIGuard(_make_model(), activation_layers=["1", "3"])
+
+
+def test_far_from_thresholds_stays_fast():
+    guard = _guard()
+    scorer = TieredCDIScorer(
+        guard,
+        fast_policy=CDIPolicy(0.98, 0.99),
+        margin=0.0,
+        audit_rate=0.0,
+    )
+
+    for x, y in _inputs():
+        result = scorer.score(x, y)
+        assert result["tier"] == "fast"
+        assert result["cdi"] == pytest.approx(
+            guard.forward_with_cdi(x, y, fast=True)[1]
+        )
+
+    assert scorer.summary()["escalated"] == 0
+
+
+def test_near_threshold_escalates_to_full_mode():
+    guard = _guard()
+    # band covers [0, 1]: every request is near a threshold
+    scorer = TieredCDIScorer(guard, margin=1.0, audit_rate=0.0, detailed=True)
+
+    x, y = _inputs(1)[0]
+    result = scorer.score(x, y)
+
+    assert result["tier"] == "full"
+    assert result["escalation"] == "near_threshold"
+    assert result["cdi"] == pytest.approx(
+        guard.forward_with_cdi(x, y, fast=False)[1]
+    )
+    assert result["decision"] == guard.policy.decide(result["cdi"])
+    assert "calibration" in result["detailed"]["boundary_vector"]
+
+
+def test_escalation_reuses_fast_forward():
+    guard = _guard()
+    calls = []
+    guard.model.register_forward_hook(lambda *args: calls.append(1))
+    scorer = TieredCDIScorer(guard, margin=1.0, audit_rate=0.0)
+
+    x, y = _inputs(1)[0]
+    result = scorer.score(x, y)
+
+    assert result["tier"] == "full"
+    assert len(calls) == 1
+    assert list(guard.last_layer_pressure) == ["1", "3"]
+
+
+def test_fast_only_requests_release_the_graph():
+    guard = _guard()
+    scorer = TieredCDIScorer(
+        guard,
+        fast_policy=CDIPolicy(0.98, 0.99),
+        margin=0.0,
+        audit_rate=0.0,
+    )
+
+    x, y = _inputs(1)[0]
+    assert scorer.score(x, y)["tier"] == "fast"
+    assert guard.activations == {}
+
+
+def test_memory_bounded_guard_escalates_with_chunked_pass():
+    model = _make_model()
+    bounded = CDIGuard(model, activation_layers=["1", "3"], max_chunk_size=2)
+    scorer = TieredCDIScorer(bounded, margin=1.0, audit_rate=0.0)
+
+    torch.manual_seed(3)
+    x, y = torch.randn(5, 16), torch.randint(0, 4, (5,))
+    result = scorer.score(x, y)
+
+    reference = CDIGuard(model, activation_layers=["1", "3"])
+    assert result["cdi"] == pytest.approx(
+        reference.forward_with_cdi(x, y, fast=False)[1], rel=1e-5
+    )
+
+
+def test_audit_sample_rate():
+    scorer = TieredCDIScorer(
+        _guard(),
+        fast_policy=CDIPolicy(0.98, 0.99),
+        margin=0.0,
+        audit_rate=0.5,
+        seed=0,
+    )
+
+    for x, y in _inputs(60):
+        scorer.forward_with_cdi(x, y)
+
+    summary = scorer.summary()
+    assert summary["escalated_near_threshold"] == 0
+    assert 15 <= summary["escalated_audit"] <= 45
+
+
+def test_requires_activation_layers():
+    with pytest.raises(ValueError):
+        TieredCDIScorer(CDIGuard(_make_model()))
@@ -0,0 +1,176 @@
+# cdi_guardrail/test_segmented_monitor.py
+
+import numpy as np
+from prometheus_client import generate_latest
+
+from cdi_guardrail import (
+    CDIMonitor,
+    CDISketch,
+    PrometheusCDILogger,
+    SegmentedCDIMonitor,
+    ks_drift,
+    population_stability_index,
+)
+from cdi_guardrail.monitor import OVERFLOW_SEGMENT
+
+
+def test_sketch_summary_matches_monitor():
+    rng = np.random.default_rng(0)
+    values = np.clip(rng.normal(0.75, 0.05, size=5000), 0.0, 1.0)
+
+    monitor = CDIMonitor(window_size=5000)
+    for v in values:
+        monitor.update(v)
+
+    sketch = CDISketch(n_bins=1000)
+    sketch.update_many(values)
+
+    exact = monitor.summary()
+    approx = sketch.summary()
+
+    assert approx["count"] == exact["count"]
+    assert np.isclose(approx["mean"], exact["mean"])
+    assert np.isclose(approx["std"], exact["std"])
+    for k in ("p50", "p90", "p95", "p99"):
+        assert abs(approx[k] - exact[k]) < 2e-3
+
+
+def test_sketch_merge_equals_combined_update():
+    rng = np.random.default_rng(1)
+    a, b = rng.uniform(size=300), rng.uniform(size=500)
+
+    left, right, both = CDISketch(), CDISketch(), CDISketch()
+    left.update_many(a)
+    right.update_many(b)
+    both.update_many(np.concatenate([a, b]))
+
+    merged = left.copy().merge(right)
+
+    assert np.array_equal(merged.counts, both.counts)
+    for k, v in both.summary().items():
+        assert np.isclose(merged.summary()[k], v)
+
+
+def test_update_many_matches_scalar_updates():
+    rng = np.random.default_rng(2)
+    values = rng.uniform(size=1000)
+    segments = rng.integers(0, 5, size=1000)
+
+    vec = SegmentedCDIMonitor()
+    vec.update_many(values, segments)
+
+    seq = SegmentedCDIMonitor()
+    for v, s in zip(values, segments):
+        seq.update(v, int(s))
+
+    assert vec.summary() == seq.summary()
+    assert set(vec.summary()) == {0, 1, 2, 3, 4}
+
+
+def test_segment_cap_keeps_heavy_segments():
+    rng = np.random.default_rng(3)
+    monitor = SegmentedCDIMonitor(max_segments=5)
+
+    heavy = np.repeat(["a", "b", "c"], 200)
+    tail = np.array([f"rare{i}" for i in range(50)])
+
+    monitor.update_many(rng.uniform(size=heavy.size), heavy)
+    for i, segment in enumerate(tail):
+        monitor.update(rng.uniform(), segment)
+        # heavy traffic keeps flowing between one-off segments
+        monitor.update(rng.uniform(), "abc"[i % 3])
+
+    summary = monitor.summary()
+
+    assert len(monitor.sketches) <= 5
+    assert OVERFLOW_SEGMENT in summary
+    total = sum(s["count"] for s in summary.values())
+    assert total == heavy.size + 2 * tail.size
+    # each heavy segment holds > N / max_segments, so none is evicted
+    assert {"a", "b", "c"} <= set(monitor.sketches)
+    assert summary["a"]["count"] == 200 + 17
+
+
+def test_one_off_segments_do_not_evict_heavy_hitters():
+    rng = np.random.default_rng(5)
+    monitor = SegmentedCDIMonitor(max_segments=8)
+
+    # three segments at 15% each (> 1/8 of traffic), the rest one-offs
+    n = 4000
+    segments = np.array([f"rare{i}" for i in range(n)], dtype=object)
+    heavy = rng.choice(n, size=int(0.45 * n), replace=False)
+    segments[heavy] = rng.choice(["a", "b", "c"], size=heavy.size)
+
+    for segment in segments:
+        monitor.update(0.5, segment)
+
+    assert {"a", "b", "c"} <= set(monitor.sketches)
+    for segment in "abc":
+        assert monitor.traffic[segment] >= np.sum(segments == segment)
+
+
+def test_newcomer_inherits_evicted_traffic():
+    monitor = SegmentedCDIMonitor(max_segments=2)
+
+    monitor.update_many([0.5] * 3, ["a"] * 3)
+    monitor.update(0.5, "x")
+    monitor.update(0.5, "y")
+
+    assert monitor.traffic == {"a": 3, "y": 2}
+    assert monitor.summary()["y"]["count"] == 1
+    assert monitor.summary()[OVERFLOW_SEGMENT]["count"] == 1
+
+
+def test_segment_drift_detects_single_segment_shift():
+    rng = np.random.default_rng(4)
+    reference = np.clip(rng.normal(0.75, 0.05, size=2000), 0, 1)
+
+    monitor = SegmentedCDIMonitor()
+    monitor.update_many(np.clip(rng.normal(0.75, 0.05, size=2000), 0, 1), np.zeros(2000, int))
+    monitor.update_many(np.clip(rng.normal(0.92, 0.03, size=200), 0, 1), np.ones(200, int))
+
+    report = monitor.drift(reference)
+
+    assert report[0]["ks"]["drift"] is False
+    assert report[0]["psi"] < 0.1
+    assert report[1]["ks"]["drift"] is True
+    assert report[1]["psi"] > 0.2
+
+    # Global view dilutes the shifted segment
+    sketch_all = CDISketch().merge(monitor.sketches[0]).merge(monitor.sketches[1])
+    assert population_stability_index(reference, sketch_all) < report[1]["psi"]
+    assert ks_drift(reference, sketch_all)["statistic"] < report[1]["ks"]["statistic"]
+
+
+def test_prometheus_segment_gauges_drop_evicted_segments():
+    logger = PrometheusCDILogger(namespace="segtest")
+
+    logger.log_segment_summary({"a": {"mean": 0.7, "p95": 0.9, "count": 10}})
+    logger.log_segment_summary({"b": {"mean": 0.6, "p95": 0.8, "count": 5}})
+
+    text = generate_latest().decode("utf-8")
+
+    assert 'segtest_segment_cdi_mean{segment="b"}' in text
+    assert 'segtest_segment_cdi_mean{segment="a"}' not in text
+
+
+def test_prometheus_segment_gauges_skip_segments_never_exported():
+    logger = PrometheusCDILogger(namespace="segtest2")
+
+    # older prometheus_client releases raise KeyError on unknown labels
+    def strict_remove(gauge):
+        def remove(*labels):
+            del gauge._metrics[labels]
+        return remove
+
+    for gauge in (logger.segment_cdi_mean, logger.segment_cdi_p95, logger.segment_count):
+        gauge.remove = strict_remove(gauge)
+
+    # an empty summary is not exported, so it has no series to remove
+    logger.log_segment_summary({"a": {}, "b": {"mean": 0.6, "p95": 0.8, "count": 5}})
+    logger.log_segment_summary({"c": {"mean": 0.5, "p95": 0.7, "count": 3}})
+
+    text = generate_latest().decode("utf-8")
+
+    assert 'segtest2_segment_cdi_mean{segment="c"}' in text
+    assert 'segtest2_segment_cdi_mean{segment="b"}' not in text
@@ -0,0 +1,134 @@
+# cdi_guardrail/test_sequence_cdi.py
+
+import math
+
+import torch
+import torch.nn as nn
+
+from cdi_guardrail import CDIGuard, sequence_cdi
+from cdi_guardrail.boundary import expected_calibration_error
+from cdi_guardrail.pressure_fast import representation_pressure
+from cdi_guardrail.scorer import compute_cdi
+
+
+class Tagger(nn.Module):
+    def __init__(self, dim=16, n_classes=7):
+        super().__init__()
+        torch.manual_seed(0)
+        self.encoder = nn.GRU(dim, dim, batch_first=True)
+        self.head = nn.Linear(dim, n_classes)
+
+    def forward(self, x):
+        return self.head(self.encoder(x)[0])
+
+
+class LinearTagger(Tagger):
+    """Linear encoder: autocast hands the head bf16 features."""
+
+    def __init__(self, dim=16, n_classes=7):
+        super().__init__(dim, n_classes)
+        self.encoder = nn.Sequential(nn.Linear(dim, dim), nn.Tanh())
+
+    def forward(self, x):
+        return self.head(self.encoder(x))
+
+
+def _batch(B=3, T=11, dim=16, n_classes=7):
+    torch.manual_seed(1)
+    x = torch.randn(B, T, dim)
+    y = torch.randint(0, n_classes, (B, T))
+    y[1, 6:] = -100  # padded
+    return x, y
+
+
+def _features(model, x):
+    with torch.no_grad():
+        return model.encoder(x)[0]
+
+
+def test_matches_flat_fast_path():
+    model = Tagger().eval()
+    x, y = _batch()
+    feats = _features(model, x)
+
+    out = sequence_cdi(feats, model.head, y)
+
+    for b in range(y.shape[0]):
+        valid = y[b] != -100
+        h = feats[b, valid].clone().requires_grad_(True)
+        logits = model.head(h)
+        expected = compute_cdi(
+            representation_pressure(logits, h, y[b, valid]),
+            expected_calibration_error(logits.detach(), y[b, valid]),
+        )
+        assert torch.allclose(out["sequence_cdi"][b], expected, rtol=1e-4)
+
+        # token 0 as a one-row batch
+        h0 = feats[b, :1].clone().requires_grad_(True)
+        logits0 = model.head(h0)
+        token0 = compute_cdi(
+            representation_pressure(logits0, h0, y[b, :1]),
+            expected_calibration_error(logits0.detach(), y[b, :1]),
+        )
+        assert torch.allclose(out["token_cdi"][b, 0], token0, rtol=1e-4)
+
+
+def test_chunking_and_padding_invariance():
+    model = Tagger().eval()
+    x, y = _batch()
+    feats = _features(model, x)
+
+    full = sequence_cdi(feats, model.head, y)
+    chunked = sequence_cdi(feats, model.head, y, chunk_size=3)
+
+    assert torch.allclose(full["sequence_cdi"], chunked["sequence_cdi"])
+    assert torch.allclose(
+        full["token_cdi"], chunked["token_cdi"], equal_nan=True
+    )
+    assert torch.isnan(full["token_cdi"][1, 6:]).all()
+
+    # padded features do not leak into the sequence score
+    feats2 = feats.clone()
+    feats2[1, 6:] = 100.0
+    padded = sequence_cdi(feats2, model.head, y, chunk_size=4)
+    assert torch.allclose(full["sequence_cdi"], padded["sequence_cdi"])
+
+
+def test_guard_sequence_path():
+    model = Tagger().eval()
+    guard = CDIGuard(model)
+    x, y = _batch()
+
+    out = guard.forward_sequence_cdi(x, y, head="head", chunk_size=4)
+
+    assert out["prediction"].shape == y.shape
+    assert torch.equal(out["prediction"], model(x).argmax(dim=2))
+    assert len(out["decision"]) == 3
+    assert all(not math.isnan(c) for c in out["sequence_cdi"].tolist())
+
+
+def test_guard_sequence_path_under_autocast():
+    model = LinearTagger().eval()
+    guard = CDIGuard(model, autocast_dtype=torch.bfloat16)
+    x, y = _batch()
+
+    out = guard.forward_sequence_cdi(x, y, head="head", chunk_size=4)
+    reference = CDIGuard(model).forward_sequence_cdi(x, y, head="head")
+
+    assert out["sequence_cdi"].dtype == torch.float32
+    assert torch.allclose(
+        out["sequence_cdi"], reference["sequence_cdi"], atol=0.05
+    )
+
+
+def test_empty_sequence_has_no_decision():
+    model = Tagger().eval()
+    guard = CDIGuard(model)
+    x, y = _batch()
+    y[2] = -100
+
+    out = guard.forward_sequence_cdi(x, y, head="head")
+
+    assert math.isnan(out["sequence_cdi"][2].item())
+    assert out["decision"][2] is None
+    assert all(d is not None for d in out["decision"][:2])
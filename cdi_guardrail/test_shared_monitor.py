@@ -0,0 +1,84 @@
+# cdi_guardrail/test_shared_monitor.py
+
+import multiprocessing
+
+import numpy as np
+import pytest
+
+from cdi_guardrail import CDIMonitor, SharedCDIMonitor
+
+
+def _worker(monitor, values):
+    for v in values:
+        monitor.update(v)
+    monitor.close()
+
+
+def _values(seed, size):
+    rng = np.random.default_rng(seed)
+    return np.clip(rng.normal(0.7, 0.1, size=size), 0.0, 1.0)
+
+
+def test_slot_matches_cdi_monitor():
+    values = _values(0, 250)
+    shared = SharedCDIMonitor(n_slots=1, window_size=100, slot=0)
+    local = CDIMonitor(window_size=100)
+
+    try:
+        for v in values[:180]:
+            shared.update(v)
+            local.update(v)
+        shared.update_many(values[180:])
+        for v in values[180:]:
+            local.update(v)
+
+        assert np.allclose(
+            np.sort(shared.slot_values(0)),
+            np.sort(np.asarray(local.buffer)),
+        )
+        assert shared.summary()["p95"] == pytest.approx(local.summary()["p95"])
+        assert shared.seen()[0] == 250
+    finally:
+        shared.unlink()
+
+
+def test_global_summary_across_processes():
+    monitor = SharedCDIMonitor(n_slots=3, window_size=500)
+    chunks = [_values(seed, 300) for seed in range(3)]
+
+    try:
+        ctx = multiprocessing.get_context("spawn")
+        procs = []
+        for slot, chunk in enumerate(chunks):
+            worker = SharedCDIMonitor.attach(monitor.name, slot=slot)
+            procs.append(ctx.Process(target=_worker, args=(worker, chunk)))
+            worker.close()
+        for p in procs:
+            p.start()
+        for p in procs:
+            p.join(timeout=60)
+            assert p.exitcode == 0
+
+        reader = SharedCDIMonitor.attach(monitor.name)
+        expected = np.concatenate(chunks)
+        summary = reader.summary()
+
+        assert summary["count"] == expected.size
+        assert summary["mean"] == pytest.approx(expected.mean())
+        assert summary["p99"] == pytest.approx(np.percentile(expected, 99))
+        assert reader.summary(slot=1)["count"] == 300
+        reader.close()
+    finally:
+        monitor.unlink()
+
+
+def test_update_requires_slot():
+    monitor = SharedCDIMonitor(n_slots=2, window_size=10)
+    try:
+        with pytest.raises(RuntimeError):
+            monitor.update(0.5)
+        with pytest.raises(ValueError):
+            SharedCDIMonitor.attach(monitor.name, slot=2)
+        assert monitor.summary() == {}
+    finally:
+        monitor.unlink()
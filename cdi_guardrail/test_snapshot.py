@@ -0,0 +1,97 @@
+# cdi_guardrail/test_snapshot.py
+
+import time
+
+import numpy as np
+
+from cdi_guardrail import (
+    CDICalibrator,
+    CDIMonitor,
+    CDIPolicy,
+    PageHinkley,
+    ReferenceProfile,
+    SegmentedCDIMonitor,
+    SnapshotWriter,
+    load_snapshot,
+    save_snapshot,
+)
+
+
+def _values(seed=0, size=1500):
+    rng = np.random.default_rng(seed)
+    return np.clip(rng.normal(0.75, 0.05, size=size), 0.0, 1.0)
+
+
+def test_snapshot_round_trip(tmp_path):
+    values = _values()
+
+    monitor = CDIMonitor(window_size=1000, detectors=[PageHinkley()])
+    for v in values:
+        monitor.update(v)
+
+    segmented = SegmentedCDIMonitor(max_segments=3)
+    segmented.update_many(values, np.arange(values.size) % 5)
+
+    calibrator = CDICalibrator()
+    calibrator.fit(values)
+    policy = CDIPolicy(calibrator.warn_threshold, calibrator.reject_threshold)
+    profile = ReferenceProfile.from_scores(values, binning="quantile")
+
+    path = str(tmp_path / "state.snap")
+    save_snapshot(path, {
+        "monitor": monitor,
+        "segmented": segmented,
+        "calibrator": calibrator,
+        "policy": policy,
+        "reference": profile,
+    })
+
+    restored = load_snapshot(path)
+
+    assert restored["monitor"].summary() == monitor.summary()
+    assert restored["monitor"].window_size == 1000
+    assert vars(restored["monitor"].detectors[0]) == vars(monitor.detectors[0])
+
+    assert restored["segmented"].summary() == segmented.summary()
+    assert restored["segmented"].traffic == segmented.traffic
+
+    assert restored["calibrator"].summary() == calibrator.summary()
+    assert restored["policy"].decide(0.99) == policy.decide(0.99)
+    assert restored["policy"].warn_threshold == policy.warn_threshold
+
+    assert isinstance(restored["reference"].sorted_values, np.memmap)
+    assert np.array_equal(restored["reference"].edges, profile.edges)
+
+
+def test_restored_monitor_keeps_updating(tmp_path):
+    monitor = CDIMonitor(window_size=100)
+    for v in _values(1, 100):
+        monitor.update(v)
+
+    path = str(tmp_path / "state.snap")
+    save_snapshot(path, {"monitor": monitor})
+    restored = load_snapshot(path)["monitor"]
+
+    monitor.update(0.5)
+    restored.update(0.5)
+
+    assert restored.summary() == monitor.summary()
+    assert len(restored.buffer) == 100
+
+
+def test_snapshot_writer_background_and_final_write(tmp_path):
+    monitor = CDIMonitor()
+    path = str(tmp_path / "state.snap")
+
+    writer = SnapshotWriter(path, {"monitor": monitor}, interval_s=0.05)
+    writer.start()
+
+    for v in _values(2, 200):
+        monitor.update(v)
+        time.sleep(0.001)
+
+    writer.stop()
+
+    assert writer.writes >= 2
+    assert writer.last_error is None
+    assert load_snapshot(path)["monitor"].summary() == monitor.summary()
@@ -0,0 +1,76 @@
+# cdi_guardrail/test_stability_jvp.py
+
+import sys
+
+import pytest
+import torch
+import torch.nn as nn
+
+from cdi_guardrail import CDIGuard, NoiseBank
+from cdi_guardrail.boundary_stability import (
+    linearized_stability_gap,
+    prediction_stability_gap,
+)
+
+
+def _make_model(dtype=torch.float32):
+    torch.manual_seed(0)
+    return nn.Sequential(
+        nn.Linear(16, 32),
+        nn.Tanh(),
+        nn.Linear(32, 5),
+    ).to(dtype).eval()
+
+
+def test_matches_sampling_estimate_as_eps_vanishes():
+    model = _make_model(torch.float64)
+    torch.manual_seed(1)
+    x = torch.randn(8, 16, dtype=torch.float64)
+    bank = NoiseBank(n_samples=4, seed=3)
+
+    # probabilities are float32, so finite differences bottom out near 1e-3
+    errors = []
+    for eps in (1e-1, 1e-2, 1e-3):
+        sampled = prediction_stability_gap(
+            model, x, eps=eps, n_samples=4, noise_bank=bank
+        )
+        linear = linearized_stability_gap(
+            model, x, eps=eps, n_samples=4, noise_bank=bank
+        )
+        errors.append(abs(sampled.item() - linear.item()) / linear.item())
+
+    assert errors[-1] < 1e-3
+    assert all(a > b for a, b in zip(errors, errors[1:]))
+
+
+def test_scales_linearly_with_eps():
+    model = _make_model()
+    x = torch.randn(4, 16)
+    bank = NoiseBank(n_samples=2, seed=0)
+
+    small = linearized_stability_gap(model, x, eps=1e-3, n_samples=2, noise_bank=bank)
+    large = linearized_stability_gap(model, x, eps=1e-2, n_samples=2, noise_bank=bank)
+
+    assert large.item() == pytest.approx(10 * small.item(), rel=1e-5)
+
+
+def test_registered_as_boundary_component():
+    guard = CDIGuard(_make_model(), activation_layers=["1"], fast=True)
+    x = torch.randn(4, 16)
+    y = torch.randint(0, 5, (4,))
+
+    out = guard.forward_detailed(
+        x,
+        y,
+        components=["calibration", "stability_jvp"],
+        stability_samples=3,
+    )
+
+    assert set(out["boundary_vector"]) == {"calibration", "stability_jvp"}
+    assert out["boundary_vector"]["stability_jvp"].item() >= 0.0
+
+
+def test_missing_torch_func_raises_import_error(monkeypatch):
+    monkeypatch.setitem(sys.modules, "torch.func", None)
+    with pytest.raises(ImportError, match="torch>=2.0"):
+        linearized_stability_gap(_make_model(), torch.randn(2, 16))
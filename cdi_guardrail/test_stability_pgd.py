@@ -0,0 +1,73 @@
+# cdi_guardrail/test_stability_pgd.py
+
+import torch
+import torch.nn as nn
+
+from cdi_guardrail import CDIGuard, NoiseBank
+from cdi_guardrail.boundary_stability import (
+    prediction_stability_gap,
+    worst_case_stability_gap,
+)
+
+
+class CountingModel(nn.Module):
+    def __init__(self):
+        super().__init__()
+        torch.manual_seed(0)
+        self.net = nn.Sequential(nn.Linear(16, 32), nn.Tanh(), nn.Linear(32, 5))
+        self.calls = 0
+
+    def forward(self, x):
+        self.calls += 1
+        return self.net(x)
+
+
+def test_pgd_beats_many_random_samples():
+    model = CountingModel().eval()
+    torch.manual_seed(1)
+    x = torch.randn(16, 16)
+    eps = 0.05
+
+    random_gap = prediction_stability_gap(
+        model, x, eps=eps, noise="uniform", n_samples=64
+    )
+    model.calls = 0
+    pgd_gap = worst_case_stability_gap(model, x, eps=eps, steps=3)
+
+    # clean forward + 3 steps + final forward
+    assert model.calls == 5
+    assert pgd_gap.item() > random_gap.item()
+
+
+def test_stays_in_ball_and_is_reproducible():
+    model = CountingModel().eval()
+    x = torch.randn(4, 16)
+    bank = NoiseBank(seed=7, noise="uniform")
+
+    a = worst_case_stability_gap(model, x, eps=1e-2, noise_bank=bank)
+    b = worst_case_stability_gap(model, x, eps=1e-2, noise_bank=bank)
+    assert torch.equal(a, b)
+
+    # a larger ball admits larger gaps
+    large = worst_case_stability_gap(model, x, eps=1.0, noise_bank=bank)
+    assert large.item() > a.item()
+    assert all(p.grad is None for p in model.parameters())
+
+
+def test_registered_as_boundary_component():
+    model = CountingModel().eval()
+    guard = CDIGuard(model, activation_layers=["net.1"], fast=True)
+    x = torch.randn(4, 16)
+    y = torch.randint(0, 5, (4,))
+
+    model.calls = 0
+    out = guard.forward_detailed(
+        x,
+        y,
+        components=["stability_pgd", "calibration"],
+        component_options={"pgd_steps": 2},
+    )
+
+    assert list(out["boundary_vector"]) == ["calibration", "stability_pgd"]
+    # shared clean forward + 2 steps + final forward
+    assert model.calls == 4
@@ -0,0 +1,123 @@
+# cdi_guardrail/test_time_window_monitor.py
+
+import numpy as np
+import pytest
+
+from cdi_guardrail import TimeWindowCDIMonitor, load_snapshot, save_snapshot
+from cdi_guardrail.sketch import CDISketch
+
+
+class FakeClock:
+    def __init__(self, t=0.0):
+        self.t = t
+
+    def __call__(self):
+        return self.t
+
+
+def test_sliding_window_expires_old_panes():
+    clock = FakeClock()
+    monitor = TimeWindowCDIMonitor(window_s=60.0, pane_s=10.0, clock=clock)
+
+    for second in range(120):
+        clock.t = float(second)
+        monitor.update(0.2 if second < 60 else 0.8)
+
+    summary = monitor.summary()
+    assert summary["count"] == 60
+    assert summary["mean"] == pytest.approx(0.8, abs=0.01)
+    assert len(monitor.panes) == 6
+
+    # a quiet period still expires panes when the window is read
+    assert monitor.summary(now=175.0) == {}
+    assert not monitor.panes
+
+
+def test_summary_matches_raw_values_in_window():
+    rng = np.random.default_rng(0)
+    clock = FakeClock()
+    monitor = TimeWindowCDIMonitor(window_s=30.0, pane_s=5.0, clock=clock)
+
+    times = np.sort(rng.uniform(0, 100, size=2000))
+    values = rng.beta(2, 5, size=times.size)
+    for t, v in zip(times, values):
+        clock.t = t
+        monitor.update(v)
+
+    # live window covers the six panes starting at 70s
+    live = values[times >= 70.0]
+    expected = CDISketch(200)
+    expected.update_many(live)
+
+    assert monitor.summary() == pytest.approx(expected.summary())
+
+
+def test_tumbling_window_resets_at_boundary():
+    clock = FakeClock()
+    monitor = TimeWindowCDIMonitor(
+        window_s=60.0,
+        pane_s=10.0,
+        mode="tumbling",
+        clock=clock,
+    )
+
+    clock.t = 55.0
+    monitor.update_many([0.1, 0.2, 0.3])
+    assert monitor.summary()["count"] == 3
+
+    clock.t = 61.0
+    monitor.update(0.9)
+    summary = monitor.summary()
+    assert summary["count"] == 1
+    assert summary["mean"] == pytest.approx(0.9, abs=0.01)
+
+
+def test_late_values_land_in_their_pane_or_are_dropped():
+    clock = FakeClock(100.0)
+    monitor = TimeWindowCDIMonitor(window_s=60.0, pane_s=10.0, clock=clock)
+
+    monitor.update(0.5, timestamp=100.0)
+    monitor.update(0.5, timestamp=75.0)   # late but live: new pane inserted
+    monitor.update(0.5, timestamp=30.0)   # outside the window
+    monitor.update_many([0.5, 0.5], timestamp=10.0)
+
+    assert [index for index, _ in monitor.panes] == [7, 10]
+    assert monitor.summary()["count"] == 2
+    assert monitor.late == 3
+
+
+def test_invalid_configuration():
+    with pytest.raises(ValueError):
+        TimeWindowCDIMonitor(window_s=25.0, pane_s=10.0)
+    with pytest.raises(ValueError):
+        TimeWindowCDIMonitor(mode="hopping")
+
+
+def test_drift_against_reference():
+    rng = np.random.default_rng(1)
+    clock = FakeClock(0.0)
+    monitor = TimeWindowCDIMonitor(window_s=60.0, pane_s=10.0, clock=clock)
+    monitor.update_many(np.clip(rng.normal(0.7, 0.05, size=2000), 0, 1))
+
+    reference = np.clip(rng.normal(0.3, 0.05, size=2000), 0, 1)
+    drift = monitor.drift(reference)
+
+    assert drift["ks"]["drift"]
+    assert drift["psi"] > 0.25
+
+
+def test_snapshot_round_trip(tmp_path):
+    clock = FakeClock()
+    monitor = TimeWindowCDIMonitor(window_s=60.0, pane_s=10.0, clock=clock)
+    for second in range(0, 90, 3):
+        clock.t = float(second)
+        monitor.update(second / 100.0)
+
+    path = tmp_path / "window.cdisnap"
+    save_snapshot(path, {"window": monitor})
+    restored = load_snapshot(path)["window"]
+    restored.clock = clock
+
+    assert restored.summary() == monitor.summary()
+    assert [i for i, _ in restored.panes] == [i for i, _ in monitor.panes]
+    assert restored.late == monitor.late
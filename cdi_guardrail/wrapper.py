@@ -1,13 +1,26 @@
 # cdi_guardrail/wrapper.py
 
+import contextlib
+import functools
+import math
+
 import torch
 import torch.nn.functional as F
+from torch.utils.checkpoint import checkpoint
 
-from .boundary_vector import compute_boundary_vector, reduce_boundary_vector
-from .pressure import activation_and_param_pressure
+from .boundary_vector import (
+    DEFAULT_COMPONENTS,
+    compute_boundary_vector,
+    reduce_boundary_vector,
+)
+from .pressure import (
+    activation_and_param_pressure,
+    chunked_activation_and_param_pressure,
+)
 from .pressure_fast import representation_pressure
 from .boundary import expected_calibration_error
 from .scorer import compute_cdi
+from .sequence import sequence_cdi
 from .policy import CDIPolicy
 
 
@@ -20,6 +33,27 @@ class CDIGuard:
 
     Level 2:
         - forward_detailed : forensic boundary decomposition (audit path)
+
+    Mixed precision:
+        Passing ``autocast_dtype`` (e.g. ``torch.bfloat16``) runs the
+        model forward under ``torch.autocast``. Logits are promoted to
+        float32 before loss, pressure and boundary computation.
+
+    Per-layer pressure:
+        After a full-mode ``forward_with_cdi``, ``layer_pressure`` holds
+        the stacked activation-gradient norms of the hooked layers
+        (a device tensor, in ``layer_names`` order) from the same
+        backward; ``last_layer_pressure`` maps names to floats on
+        access. Both are None after fast mode.
+
+    Memory-bounded full mode:
+        ``checkpoint_modules`` (names from ``model.named_modules()``)
+        are run under activation checkpointing, and batches larger
+        than ``max_chunk_size`` are split into chunks, each with its
+        own forward and a non-retained backward. Chunk contributions
+        are combined into exactly the whole-batch full-mode pressure
+        (see chunked_activation_and_param_pressure). Models must not
+        mix samples within a batch (e.g. BatchNorm in train mode).
     """
 
     def __init__(
@@ -28,7 +62,11 @@ class CDIGuard:
         policy: CDIPolicy | None = None,
         activation_layers: list[str] | None = None,
         fast: bool = False,
+        autocast_dtype: torch.dtype | None = None,
+        checkpoint_modules: list[str] | None = None,
+        max_chunk_size: int | None = None,
     ):
+        assert max_chunk_size is None or max_chunk_size >= 1
         self.model = model
         self.model.eval()
 
@@ -39,8 +77,15 @@ class CDIGuard:
         )
 
         self.fast = fast
+        self.autocast_dtype = autocast_dtype
+        self.checkpoint_modules = list(checkpoint_modules or [])
+        self.max_chunk_size = max_chunk_size
         self.activations = {}
+        self.layer_names = None
+        self.layer_pressure = None
         self.hooks = []
+        # off while checkpointed modules recompute during backward
+        self._recording = True
 
         if activation_layers is not None:
             self._register_hooks(activation_layers)
@@ -55,6 +100,8 @@ class CDIGuard:
 
     def _make_hook(self, name):
         def hook(module, inp, out):
+            if not self._recording:
+                return
             # Only retain gradients if autograd is enabled
             if torch.is_grad_enabled() and out.requires_grad:
                 out.retain_grad()
@@ -62,58 +109,251 @@ class CDIGuard:
 
         return hook
 
+    def _autocast(self, x):
+        if self.autocast_dtype is None:
+            return contextlib.nullcontext()
+
+        return torch.autocast(
+            device_type=x.device.type,
+            dtype=self.autocast_dtype,
+        )
+
+    @contextlib.contextmanager
+    def _checkpointing(self):
+        modules = dict(self.model.named_modules())
+        patched = []
+        try:
+            for name in self.checkpoint_modules:
+                module = modules[name]
+                patched.append((module, module.__dict__.get("forward")))
+                module.forward = functools.partial(
+                    checkpoint,
+                    module.forward,
+                    use_reentrant=False,
+                )
+            yield
+        finally:
+            for module, own_forward in reversed(patched):
+                if own_forward is None:
+                    del module.forward
+                else:
+                    module.forward = own_forward
+
+    @property
+    def memory_bounded(self):
+        return bool(self.checkpoint_modules) or self.max_chunk_size is not None
+
+    def _chunk_losses(self, x, y):
+        """
+        Yields (chunk loss, chunk activations, chunk logits); chunk
+        losses sum to the batch mean cross-entropy.
+        """
+        n = x.shape[0]
+        size = self.max_chunk_size or n
+
+        for start in range(0, n, size):
+            self.activations.clear()
+            self._recording = True
+            with self._autocast(x):
+                logits = self.model(x[start:start + size])
+            self._recording = False
+
+            logits = logits.float()
+            loss = F.cross_entropy(
+                logits,
+                y[start:start + size],
+                reduction="sum",
+            ) / n
+            yield loss, self.activations, logits.detach()
+
+    def _bounded_full_pressure(self, x, y):
+        """
+        Full-mode pressure under checkpointing / batch chunking.
+
+        Returns (logits, pressure).
+        """
+        logits = []
+
+        def chunks():
+            for loss, activations, chunk_logits in self._chunk_losses(x, y):
+                logits.append(chunk_logits)
+                yield loss, activations
+
+        try:
+            with self._checkpointing():
+                pressure, layers = chunked_activation_and_param_pressure(
+                    chunks(),
+                    self.model,
+                    per_layer=True,
+                )
+        finally:
+            self._recording = True
+
+        self._set_layer_pressure(layers)
+        return torch.cat(logits), pressure
+
+    def _set_layer_pressure(self, layers):
+        # kept on device: no host sync on the scoring path
+        self.layer_names = list(self.activations.keys())
+        self.layer_pressure = layers
+
+    @property
+    def last_layer_pressure(self):
+        if self.layer_pressure is None:
+            return None
+        return dict(zip(self.layer_names, self.layer_pressure.tolist()))
+
     @torch.no_grad()
     def predict(self, x):
-        logits = self.model(x)
+        with self._autocast(x):
+            logits = self.model(x)
         return logits.argmax(dim=1)
 
-    # ==========================================================
-    # LEVEL 1 — Production / Hot Path (UNCHANGED)
-    # ==========================================================
-    def forward_with_cdi(self, x, y):
+    def _forward(self, x):
         """
-        Forward pass + CDI computation.
-
-        Returns:
-        - prediction
-        - CDI value
-        - decision ('accept' | 'warn' | 'reject')
+        Model forward with activations captured; float32 logits.
         """
         self.activations.clear()
+        self.layer_names = self.layer_pressure = None
+        with self._autocast(x):
+            logits = self.model(x)
+        return logits.float()
 
-        logits = self.model(x)
-        loss = F.cross_entropy(logits, y)
-
-        if self.fast:
+    def _pressure(self, logits, y, fast: bool, retain_graph: bool = False):
+        """
+        Internal pressure on the graph of the last ``_forward``.
+        Full mode keeps the graph (its backward retains it).
+        """
+        if fast:
             # use last activation only
             last_feature = list(self.activations.values())[-1]
-            internal_pressure = representation_pressure(
+            return representation_pressure(
                 logits,
                 last_feature,
                 y,
-            )
-        else:
-            internal_pressure = activation_and_param_pressure(
-                loss,
-                self.activations,
-                self.model,
+                retain_graph=retain_graph,
             )
 
-        boundary = expected_calibration_error(
+        loss = F.cross_entropy(logits, y)
+        internal_pressure, layers = activation_and_param_pressure(
+            loss,
+            self.activations,
+            self.model,
+            per_layer=True,
+        )
+        self._set_layer_pressure(layers)
+        return internal_pressure
+
+    @staticmethod
+    def _boundary(logits, y):
+        return expected_calibration_error(
             logits.detach(),
             y.detach(),
         )
 
+    def _cdi_and_decision(self, logits, y, internal_pressure, boundary=None):
+        """
+        CDI and policy decision; ``boundary`` may be precomputed.
+        """
+        if boundary is None:
+            boundary = self._boundary(logits, y)
+
         cdi = compute_cdi(
             internal_pressure,
             boundary,
         ).item()
 
-        decision = self.policy.decide(cdi)
+        return cdi, self.policy.decide(cdi)
+
+    # ==========================================================
+    # LEVEL 1 — Production / Hot Path
+    # ==========================================================
+    def forward_with_cdi(self, x, y, *, fast: bool | None = None):
+        """
+        Forward pass + CDI computation.
+
+        ``fast`` overrides the guard's pressure mode for this call
+        (None: use ``self.fast``).
+
+        Returns:
+        - prediction
+        - CDI value
+        - decision ('accept' | 'warn' | 'reject')
+        """
+        if fast is None:
+            fast = self.fast
+
+        if not fast and self.memory_bounded:
+            # chunk forwards double as the prediction forward
+            self.layer_names = self.layer_pressure = None
+            logits, internal_pressure = self._bounded_full_pressure(x, y)
+        else:
+            logits = self._forward(x)
+            internal_pressure = self._pressure(logits, y, fast)
+
         pred = logits.argmax(dim=1)
+        cdi, decision = self._cdi_and_decision(logits, y, internal_pressure)
 
         return pred, cdi, decision
 
+    def forward_sequence_cdi(
+        self,
+        x,
+        y,
+        *,
+        head: str,
+        mask: torch.Tensor | None = None,
+        chunk_size: int | None = None,
+    ):
+        """
+        Token- and sequence-level CDI for [B, T, C] outputs.
+
+        The model runs once without autograd; the input of the
+        position-wise output module ``head`` (a name from
+        ``model.named_modules()``) is captured and rescored in time
+        chunks by sequence_cdi (fast-mode pressure).
+
+        Returns
+        -------
+        dict:
+            {
+              "prediction": torch.Tensor [B, T],
+              "token_cdi": torch.Tensor [B, T]   (NaN at padding),
+              "sequence_cdi": torch.Tensor [B]   (NaN for empty sequences),
+              "decision": list[str | None]       (None for empty sequences),
+            }
+        """
+        head_module = dict(self.model.named_modules())[head]
+        captured = {}
+
+        def capture(module, inp):
+            captured["features"] = inp[0]
+
+        handle = head_module.register_forward_pre_hook(capture)
+        try:
+            with torch.no_grad(), self._autocast(x):
+                self.model(x)
+        finally:
+            handle.remove()
+
+        # rescore under the same autocast as the captured features
+        with self._autocast(x):
+            result = sequence_cdi(
+                captured["features"],
+                head_module,
+                y,
+                mask=mask,
+                chunk_size=chunk_size,
+            )
+
+        # sequences without valid tokens have no score to decide on
+        result["decision"] = [
+            None if math.isnan(c) else self.policy.decide(c)
+            for c in result["sequence_cdi"].tolist()
+        ]
+
+        return result
+
     # ==========================================================
     # LEVEL 2 — Forensic / Audit Path (NEW, OPT-IN)
     # ==========================================================
@@ -125,6 +365,10 @@ class CDIGuard:
         boundary_reduction: str = "l2",
         stability_eps: float = 1e-3,
         stability_samples: int = 1,
+        components: list[str] | None = None,
+        short_circuit_threshold: float | None = None,
+        noise_bank=None,
+        component_options: dict | None = None,
     ):
         """
         Level-2 forensic audit path.
@@ -132,37 +376,66 @@ class CDIGuard:
         Provides decomposed boundary evidence without
         affecting CDI-v0 behavior or performance.
 
+        Only the requested ``components`` are computed (default:
+        calibration and stability), cheapest first. With
+        ``short_circuit_threshold`` set, the remaining components are
+        skipped once the reduced scalar already reaches the threshold.
+
+        With a ``noise_bank`` (see NoiseBank), perturbations are seeded
+        and reused, and the seed is returned as ``"noise_seed"``.
+
+        ``component_options`` are passed to the boundary components
+        (e.g. ``{"pgd_steps": 5}`` for "stability_pgd").
+
         Returns
         -------
         dict:
             {
               "prediction": torch.Tensor,
               "boundary_vector": dict[str, torch.Tensor],
-              "boundary_scalar": torch.Tensor
+              "boundary_scalar": torch.Tensor,
+              "skipped_components": list[str],
+              "noise_seed": int  (only with noise_bank)
             }
         """
         self.activations.clear()
 
-        with torch.no_grad():
-            logits = self.model(x)
-            pred = logits.argmax(dim=1)
-
-        boundary_vector = compute_boundary_vector(
-            model=self.model,
-            x=x,
-            logits=logits,
-            labels=y,
-            stability_eps=stability_eps,
-            stability_samples=stability_samples,
-        )
+        with self._autocast(x):
+            with torch.no_grad():
+                logits = self.model(x).float()
+                pred = logits.argmax(dim=1)
+
+            boundary_vector = compute_boundary_vector(
+                model=self.model,
+                x=x,
+                logits=logits,
+                labels=y,
+                stability_eps=stability_eps,
+                stability_samples=stability_samples,
+                components=components,
+                threshold=short_circuit_threshold,
+                reduction=boundary_reduction,
+                noise_bank=noise_bank,
+                **(component_options or {}),
+            )
 
         boundary_scalar = reduce_boundary_vector(
             boundary_vector,
             reduction=boundary_reduction,
         )
 
-        return {
+        requested = DEFAULT_COMPONENTS if components is None else components
+
+        result = {
             "prediction": pred,
             "boundary_vector": boundary_vector,
             "boundary_scalar": boundary_scalar,
+            "skipped_components": [
+                n for n in requested if n not in boundary_vector
+            ],
         }
+
+        if noise_bank is not None:
+            result["noise_seed"] = noise_bank.seed
+
+        return result